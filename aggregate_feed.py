@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Souhrnný feed ze všech zdrojů
+- Položky zdrojů (seřazené od nejnovějších) se slučují proudově přes k-way merge (heapq.merge)
+- Cache zdrojů se čtou po položkách (iter_cache) a čtení skončí po max_items položkách,
+  takže paměť i čas jsou omezené limitem feedu, ne velikostí cache
+- Feed se přegeneruje po dokončení běhu kteréhokoli zdroje (callback after_run)
+"""
+
+import argparse
+import heapq
+from datetime import datetime, timezone
+from itertools import islice
+
+from feed_archive import write_bytes
+from file_locks import file_lock
+from item_changes import add_updated
+
+
+def item_timestamp(item):
+    """Vrátí datum položky jako epoch (naivní data bereme jako UTC, stejně jako RSS)"""
+    date = datetime.fromisoformat(item["date"])
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+class AggregatedFeed:
+
+    def __init__(
+        self,
+        generators,
+        rss_file="all_feed.xml",
+        atom_file="all_feed.atom.xml",
+        max_items=100,
+        title="Všechny zdroje - H7O, Kosmas.cz a další",
+        link="https://www.h7o.cz/clanky",
+    ):
+        # Seznam se nekopíruje - generate_all ho naplní až po vytvoření výstupů
+        self.generators = generators
+        self.rss_file = rss_file
+        self.atom_file = atom_file
+        self.max_items = max_items
+        self.title = title
+        self.link = link
+
+    def top_items(self, items):
+        """
+        Vrací nejvýše max_items nejnovějších položek zdroje jako (epoch, položka)
+
+        Cache zdrojů se ukládá seřazená (merge_items), takže stačí vzít
+        začátek proudu - zbytek cache se nečte. Seřazení začátku se ověří
+        levným porovnáním ISO řetězců (v rámci zdroje mají stejný formát);
+        ručně upravenou cache seřadíme v rámci těchto max_items položek.
+        """
+        head = list(islice(items, self.max_items))
+        if any(head[i]["date"] < head[i + 1]["date"] for i in range(len(head) - 1)):
+            head.sort(key=lambda item: item["date"], reverse=True)
+        return [(item_timestamp(item), item) for item in head]
+
+    def merged_items(self, current=None):
+        """
+        Sloučí položky všech zdrojů podle data (nejnovější první)
+
+        Args:
+            current: (generator, items) právě dokončeného běhu - jeho položky
+                se použijí přímo z paměti místo čtení cache
+
+        Yields:
+            (generator, položka), nejvýše max_items
+        """
+        def stream(index, generator):
+            if current is not None and generator.source_id == current[0].source_id:
+                items = current[1]
+            else:
+                items = generator.iter_cache()
+            # Zdroj se začne číst, až si o jeho první položku řekne heapq.merge
+            for key, item in self.top_items(items):
+                yield key, index, item
+
+        streams = [stream(index, generator) for index, generator in enumerate(self.generators)]
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+        for _, index, item in islice(merged, self.max_items):
+            yield self.generators[index], item
+
+    def generate(self, current=None):
+        """
+        Vygeneruje souhrnný RSS a Atom feed
+
+        Souhrnný feed mohou současně přegenerovat běhy různých zdrojů; čtení
+        cache a zápis feedu proto probíhá pod zámkem, aby poslední zápis
+        obsahoval všechny již uložené cache.
+        """
+        with file_lock(self.rss_file or self.atom_file):
+            self._generate(current)
+
+    def _generate(self, current):
+        from feedgen.feed import FeedGenerator
+
+        fg = FeedGenerator()
+        fg.id(self.link)
+        fg.title(self.title)
+        fg.link(href=self.link, rel='alternate')
+        fg.description('Souhrnný RSS kanál ze všech zdrojů')
+        fg.language('cs')
+
+        entries = list(self.merged_items(current))
+
+        # feedgen vkládá položky na začátek, proto přidáváme od nejstarší
+        for generator, item in reversed(entries):
+            fe = fg.add_entry()
+            fe.id(item['url'])
+            fe.title(item['title'])
+            fe.link(href=item['url'])
+            fe.description(item.get('description') or item['title'])
+            fe.guid(item['url'], permalink=True)
+            fe.source(url=generator.base_url, title=generator.source_name)
+            fe.category(term=generator.source_id, label=generator.source_name)
+
+            pub_date = datetime.fromisoformat(item['date'])
+            if pub_date.tzinfo is None:
+                pub_date = pub_date.replace(tzinfo=timezone.utc)
+            fe.pubDate(pub_date)
+            fe.updated(datetime.fromisoformat(item['updated']) if item.get('updated') else pub_date)
+
+        if self.rss_file:
+            # V RSS feedgen čas úpravy vynechá, doplníme atom:updated
+            write_bytes(self.rss_file, add_updated(fg.rss_str(pretty=True), [item for _, item in entries]))
+            print(f"Souhrnný RSS feed vytvořen: {self.rss_file}")
+        if self.atom_file:
+            fg.atom_file(self.atom_file, pretty=True)
+            print(f"Souhrnný Atom feed vytvořen: {self.atom_file}")
+        print(f"Celkem položek v souhrnném feedu: {len(entries)}")
+
+    def on_source_run(self, generator, items):
+        """Callback pro after_run generátorů - přegeneruje souhrnný feed"""
+        self.generate(current=(generator, items))
+
+
+def default_generators():
+    """Vrátí generátory všech povolených zdrojů z konfigurace (včetně H7O a Kosmasu)"""
+    from source_engine import SourceRSSGenerator, load_source_configs
+
+    return [SourceRSSGenerator(config) for config in load_source_configs(enabled_only=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Souhrnný feed ze všech zdrojů (z cache)")
+    parser.add_argument("--max-items", type=int, default=100, help="Maximální počet položek")
+    args = parser.parse_args()
+
+    AggregatedFeed(default_generators(), max_items=args.max_items).generate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Asynchronní jádro generátorů (asyncio)
+- Všechny zdroje sdílejí jednu smyčku událostí a jeden pool spojení
+- Stahování stránek a procházení s předčasným zastavením jsou korutiny; rozhodnutí
+  o stránce (check_page) a parsování (parse_page) sdílejí se synchronní cestou
+- Zpracování (sloučení, zápis cache a feedu, navazující výstupy) provede beze změny
+  run() generátoru s předanými položkami (generator.collected) - v jediném vlákně,
+  takže se zápisy různých zdrojů nepřekrývají
+- HTTP stahuje aiohttp (volitelná závislost, pip install "h7o-rss-generator[async]");
+  bez něj --async skončí chybou. Kazety (--record/--replay) a jiné blokující
+  transporty se volají z omezeného počtu vláken
+- Souběžně běží zdroje mezi sebou; stránky jednoho zdroje se procházejí postupně
+  (kvůli předčasnému zastavení se nestahuje za stránku, kde procházení skončí)
+- Rychlá kontrola (--quick-check) a sondování dat stránek (--backfill probe) zůstávají
+  na synchronní cestě run() generátoru
+- run_all()/run_sync() jsou synchronní obaly pro main() a generate_all.py
+"""
+
+import asyncio
+import functools
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from http_transport import MAX_CONNECTIONS, RequestsTransport, Response, TransportError
+from run_guard import finish_guarded, run_failed, start_guarded
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+AIOHTTP_MISSING = 'Režim --async vyžaduje aiohttp: pip install "h7o-rss-generator[async]"'
+
+
+class AiohttpTransport:
+    """Asynchronní stahování přes aiohttp - jedna session (pool spojení) pro všechny zdroje"""
+
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._session = None
+
+    async def get(self, url, timeout=10):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._session = aiohttp.ClientSession(connector=connector)
+        try:
+            async with self._session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                content = await response.read()
+                if response.status >= 400:
+                    raise TransportError(f"HTTP {response.status}: {url}")
+                return Response(url, response.status, content, response.charset, dict(response.headers))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransportError(str(e) or f"Vypršel timeout ({timeout} s): {url}") from e
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class ThreadedAsyncTransport:
+    """Blokující transport (requests, kazeta) volaný z omezeného počtu vláken"""
+
+    def __init__(self, inner=None, max_connections=MAX_CONNECTIONS):
+        self.inner = inner if inner is not None else RequestsTransport()
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix="fetch")
+
+    async def get(self, url, timeout=10):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self.inner.get, url, timeout=timeout))
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def async_transport(transport=None, max_connections=MAX_CONNECTIONS):
+    """
+    Asynchronní protějšek transportu generátoru
+
+    Výchozí requests se nahradí asynchronním stahováním přes aiohttp (bez něj
+    RuntimeError); kazety (RecordingTransport, ReplayTransport) a jiné transporty
+    se obalí vlákny.
+    """
+    if needs_aiohttp(transport):
+        if aiohttp is None:
+            raise RuntimeError(AIOHTTP_MISSING)
+        return AiohttpTransport(max_connections)
+    return ThreadedAsyncTransport(transport, max_connections)
+
+
+def needs_aiohttp(transport):
+    """Stahuje transport ze sítě přes requests? (v režimu --async ho nahradí aiohttp)"""
+    return transport is None or type(transport) is RequestsTransport
+
+
+def require_aiohttp(generators):
+    """Před spuštěním --async ověří, že je aiohttp k dispozici; jinak ukončí proces"""
+    if aiohttp is None and any(needs_aiohttp(generator.transport) for generator in generators):
+        sys.exit(AIOHTTP_MISSING)
+
+
+async def to_thread(func, *args):
+    """asyncio.to_thread pro Python 3.8 (výchozí pool vláken smyčky)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+async def fetch_raw_async(generator, transport, page_num=1):
+    """Asynchronní fetch_raw: stáhne stránku a vrátí surová data (bytes, kódování) nebo None"""
+    if page_num not in generator.prefetched:
+        # Po vypršení časového rozpočtu už nestahujeme (běh doběhne z cache)
+        if generator.deadline is not None and generator.deadline.expired():
+            print(f"Vypršel časový limit zdroje, stránku {page_num} nestahuji.")
+            return None
+
+        timeout = generator.deadline.timeout(10) if generator.deadline is not None else 10
+        try:
+            response = await transport.get(generator.page_url(page_num), timeout=timeout)
+        except TransportError as e:
+            print(f"Chyba při stahování stránky {page_num}: {e}")
+            generator.fetch_failures += 1
+            return None
+        generator.prefetched[page_num] = (
+            response.content, response.encoding, response.etag, response.last_modified
+        )
+    # Počítadla, validátory první stránky a snímek zapíše fetch_raw (z předaných dat, bez sítě)
+    return generator.fetch_raw(page_num)
+
+
+async def fetch_page_async(generator, transport, page_num=1, base_timestamp=None):
+    """
+    Asynchronní fetch_page: stáhne a parsuje stránku
+
+    Returns:
+        (položky, existuje další stránka) nebo None při chybě stahování
+    """
+    raw = await fetch_raw_async(generator, transport, page_num)
+    if raw is None:
+        return None
+    # Parsování ve vlákně, aby smyčka mezitím obsluhovala spojení ostatních zdrojů
+    return await to_thread(generator.parse_page, *raw, page_num, base_timestamp)
+
+
+async def crawl_async(generator, transport, max_pages, cached_urls):
+    """
+    Prochází stránky, dokud check_page generátoru neřekne stop
+
+    Returns:
+        Nové položky ze všech prošlých stránek
+    """
+    base_timestamp = datetime.now(timezone.utc)
+    cutoff_date = generator.cutoff_date()
+    collected = []
+    for page_num in range(1, max_pages + 1):
+        page = await fetch_page_async(generator, transport, page_num, base_timestamp)
+        items, has_next = page if page is not None else (None, False)
+        new_items, stop = generator.check_page(page_num, items, has_next, cached_urls, cutoff_date)
+        collected.extend(new_items)
+        if stop:
+            break
+    else:
+        print(f"Dosaženo maximálního počtu stránek ({max_pages}).")
+    return collected
+
+
+async def collect_async(generator, transport):
+    """
+    Stáhne stránky zdroje a předá položky run() generátoru (generator.collected)
+
+    První běh prochází stránky s předčasným zastavením, další běhy stahují jen
+    první stránku - stejně jako synchronní run().
+    """
+    cached_items = await to_thread(generator.load_cache)
+    if cached_items and generator.quick_check:
+        # Rychlá kontrola v run() stáhne první stránku sama (podmíněným požadavkem)
+        return
+    if not cached_items and generator.backfill == "probe":
+        # Sondování dat stránek zůstává synchronní se svými vlákny
+        return
+
+    if cached_items:
+        page = await fetch_page_async(generator, transport, 1, datetime.now(timezone.utc))
+        generator.collected = page[0] if page is not None else []
+    else:
+        # Prázdná cache - procházíme až po hranici stáří nebo max_pages
+        print(f"Asynchronně stahuji {generator.source_name} (nejvýše {generator.max_pages} stránek)...")
+        generator.collected = await crawl_async(generator, transport, generator.max_pages, set())
+
+
+async def run_async(generator, transport, commit_executor=None):
+    """Asynchronní run(): stahování na smyčce, zpracování v run() generátoru"""
+    try:
+        await collect_async(generator, transport)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(commit_executor, generator.run)
+    finally:
+        generator.collected = None
+    return "ok"
+
+
+async def guarded_run_async(generator, transport, commit_executor=None,
+                            breakers=None, source_budget=None, total_deadline=None):
+    """Asynchronní obdoba run_guard.guarded_run (jistič a časový rozpočet)"""
+    if not start_guarded(generator, breakers, source_budget, total_deadline):
+        return "skipped"
+
+    try:
+        await run_async(generator, transport, commit_executor)
+    except Exception as e:
+        print(f"❌ Zdroj {generator.source_name} selhal: {e}")
+        failed = True
+    else:
+        failed = run_failed(generator)
+    finally:
+        generator.deadline = None
+
+    return finish_guarded(generator, breakers, failed)
+
+
+async def run_all_async(generators, run=run_async, max_connections=MAX_CONNECTIONS):
+    """
+    Spustí všechny zdroje souběžně na jedné smyčce událostí
+
+    Args:
+        run: Korutina run(generator, transport, commit_executor) -> výsledek
+        max_connections: Nejvyšší počet souběžných požadavků
+
+    Returns:
+        Název zdroje -> výsledek
+    """
+    # Zdroje se stejným transportem (např. jedna kazeta) sdílejí i asynchronní transport
+    transports = {}
+    for generator in generators:
+        key = id(generator.transport)
+        if key not in transports:
+            transports[key] = async_transport(generator.transport, max_connections)
+    commit_executor = ThreadPoolExecutor(1, thread_name_prefix="commit")
+    try:
+        results = await asyncio.gather(*(
+            run(generator, transports[id(generator.transport)], commit_executor)
+            for generator in generators
+        ), return_exceptions=True)
+    finally:
+        for transport in transports.values():
+            await transport.close()
+        commit_executor.shutdown()
+
+    summary = {}
+    for generator, result in zip(generators, results):
+        if isinstance(result, BaseException):
+            print(f"❌ Zdroj {generator.source_name} selhal: {result}")
+            result = "failed"
+        summary[generator.source_name] = result
+    return summary
+
+
+def run_all(generators, run=run_async, max_connections=MAX_CONNECTIONS):
+    """Synchronní obal run_all_async pro main() a generate_all.py"""
+    require_aiohttp(generators)
+    return asyncio.run(run_all_async(generators, run, max_connections))
+
+
+def run_sync(generator, max_connections=MAX_CONNECTIONS):
+    """Synchronní obal asynchronního běhu jednoho zdroje; chyba zdroje se propaguje"""
+    require_aiohttp([generator])
+
+    async def run_one():
+        transport = async_transport(generator.transport, max_connections)
+        commit_executor = ThreadPoolExecutor(1, thread_name_prefix="commit")
+        try:
+            return await run_async(generator, transport, commit_executor)
+        finally:
+            await transport.close()
+            commit_executor.shutdown()
+
+    return asyncio.run(run_one())
+
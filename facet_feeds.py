@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dílčí feedy podle kategorií a autorů
+- Invertovaný index (faseta -> pozice položek) staví generátor už při sloučení cache
+  (index_facets ve stejném průchodu) a předá ho výstupům spolu s položkami běhu;
+  bez něj se postaví jedním průchodem položek
+- Pro každou fasetu vznikne feed, např. feeds/h7o_feed_recenze.xml nebo feeds/kosmas_feed_autor_jan-novak.xml
+- Přegenerují se jen fasety, jejichž členství nebo obsah položek se od minulého běhu změnil
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime, timezone
+
+from file_locks import file_lock
+
+
+FEEDS_DIR = "feeds"
+STATE_FILE = "facets_state.json"
+
+
+def slugify(value):
+    """Převede hodnotu fasety na název souboru (bez diakritiky, malými písmeny)"""
+    normalized = unicodedata.normalize("NFKD", value)
+    ascii_value = normalized.encode("ascii", "ignore").decode("ascii").lower()
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_value).strip("-")
+    # Hodnota bez znaků latinky - použijeme krátký hash
+    return slug or hashlib.sha1(value.encode("utf-8")).hexdigest()[:10]
+
+
+def index_facets(items, facet_fields, index):
+    """
+    Propouští proud položek a zároveň plní invertovaný index
+
+    Args:
+        items: Položky seřazené od nejnovějších
+        facet_fields: {název pole: prefix v názvu souboru}; pole může být
+            řetězec (category) nebo seznam (authors)
+        index: Plněný slovník {(pole, hodnota): [pozice položky, ...]}
+    """
+    for position, item in enumerate(items):
+        for field in facet_fields:
+            values = item.get(field)
+            if not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                value = value.strip()
+                if value:
+                    index.setdefault((field, value), []).append(position)
+        yield item
+
+
+def build_facet_index(items, facet_fields):
+    """
+    Postaví invertovaný index jedním průchodem položek
+
+    Returns:
+        {(pole, hodnota): [index položky, ...]} - indexy v pořadí položek
+    """
+    index = {}
+    for _ in index_facets(items, facet_fields, index):
+        pass
+    return index
+
+
+class FacetFeeds:
+
+    def __init__(self, feeds_dir=FEEDS_DIR, max_items=50):
+        self.feeds_dir = feeds_dir
+        self.max_items = max_items
+        self.state_file = os.path.join(feeds_dir, STATE_FILE)
+
+    def load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def save_state(self, state):
+        os.makedirs(self.feeds_dir, exist_ok=True)
+        tmp_path = f"{self.state_file}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def feed_filename(self, generator, field, value):
+        """Název souboru dílčího feedu, např. h7o_feed_recenze.xml"""
+        base = os.path.splitext(os.path.basename(generator.rss_file))[0]
+        prefix = generator.facet_fields[field]
+        parts = [base] + ([prefix] if prefix else []) + [slugify(value)]
+        return "_".join(parts) + ".xml"
+
+    def write_feed(self, generator, field, value, items, path):
+        """Zapíše RSS jedné fasety"""
+        from feedgen.feed import FeedGenerator
+
+        fg = FeedGenerator()
+        fg.title(f"{generator.source_name} - {value}")
+        fg.link(href=generator.base_url, rel='alternate')
+        fg.description(f"RSS kanál zdroje {generator.source_name} ({field}: {value})")
+        fg.language('cs')
+
+        for item in reversed(items):
+            fe = fg.add_entry()
+            fe.title(item['title'])
+            fe.link(href=item['url'])
+            fe.description(item.get('description') or item['title'])
+            fe.guid(item['url'], permalink=True)
+
+            pub_date = datetime.fromisoformat(item['date'])
+            if pub_date.tzinfo is None:
+                pub_date = pub_date.replace(tzinfo=timezone.utc)
+            fe.pubDate(pub_date)
+
+        fg.rss_file(path, pretty=True)
+
+    def update(self, generator, items, index=None):
+        """
+        Přegeneruje dílčí feedy zdroje, jejichž členství se změnilo
+
+        Args:
+            items: Položky zdroje
+            index: Invertovaný index položek z merge_items (položky jsou pak
+                už seřazené od nejnovějších); None = postaví se zde
+
+        Returns:
+            Seznam přegenerovaných souborů
+        """
+        if not generator.facet_fields:
+            return []
+
+        if index is None:
+            items = sorted(items, key=lambda x: x["date"], reverse=True)
+            index = build_facet_index(items, generator.facet_fields)
+
+        os.makedirs(self.feeds_dir, exist_ok=True)
+        # Stav čteme i zapisujeme pod zámkem - jiný zdroj ho může souběžně měnit
+        # a odstranění zaniklých faset se musí řídit aktuální verzí
+        with file_lock(self.state_file):
+            state = self.load_state()
+            previous = state.get(generator.source_id, {})
+            current = {}
+            written = []
+
+            for (field, value), positions in index.items():
+                filename = self.feed_filename(generator, field, value)
+                # Různé hodnoty se stejným slugem - platí první výskyt
+                if filename in current:
+                    continue
+                members = [items[i] for i in positions[:self.max_items]]
+                # Podpis zahrnuje i hash obsahu, aby se projevily upravené položky
+                signature = hashlib.sha1(
+                    "\n".join(f"{item['url']} {item.get('hash', '')}" for item in members).encode("utf-8")
+                ).hexdigest()
+                current[filename] = signature
+
+                path = os.path.join(self.feeds_dir, filename)
+                if previous.get(filename) == signature and os.path.exists(path):
+                    continue
+                self.write_feed(generator, field, value, members, path)
+                written.append(filename)
+
+            # Fasety, které zmizely, odstraníme
+            for filename in set(previous) - set(current):
+                path = os.path.join(self.feeds_dir, filename)
+                if os.path.exists(path):
+                    os.remove(path)
+
+            state[generator.source_id] = current
+            self.save_state(state)
+        print(
+            f"Dílčí feedy {generator.source_id}: {len(current)} faset, přegenerováno {len(written)}."
+        )
+        return written
+
+    def on_source_run(self, generator, items):
+        """Callback pro after_run generátorů - použije index postavený při sloučení"""
+        # Položky běhu (output_sinks.RenderedItems) nesou index ze svého sloučení
+        return self.update(generator, items, getattr(items, "facet_index", None))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dílčí feedy podle kategorií a autorů (z cache)")
+    parser.add_argument("--feeds-dir", default=FEEDS_DIR, help="Adresář pro dílčí feedy")
+    parser.add_argument("--max-items", type=int, default=50, help="Maximální počet položek feedu")
+    args = parser.parse_args()
+
+    from aggregate_feed import default_generators
+
+    facets = FacetFeeds(feeds_dir=args.feeds_dir, max_items=args.max_items)
+    for generator in default_generators():
+        facets.update(generator, generator.load_cache())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Stránkované a archivované feedy podle RFC 5005
+- archive/<zdroj>/current.xml: malý aktuální feed (current_size až current_size + page_size - 1 položek)
+- archive/<zdroj>/page-0001.xml, ...: archivní stránky po page_size položkách, od nejstarší
+- Odebíraný feed zdroje (např. h7o_feed.xml) obsahuje jen stejné aktuální okno
+  a odkazuje rel="prev-archive" na nejnovější archivní stránku (subscription)
+- Stránky jsou propojené atom:link rel="current", "prev-archive" a "next-archive";
+  nejnovější stránka next-archive nemá, doplní se jí jednou při zápisu další
+  stránky a pak už se nemění (lze ji cachovat navždy, viz is_sealed)
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from file_locks import file_lock
+from item_changes import add_updated
+
+
+ARCHIVE_DIR = "archive"
+STATE_FILE = "state.json"
+CURRENT_FILE = "current.xml"
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+HISTORY_NS = "http://purl.org/syndication/history/1.0"
+
+# Pole položky, která archiv potřebuje (bez date_obj apod.)
+ITEM_FIELDS = ("title", "url", "description", "date", "updated", "hash")
+
+
+def page_filename(number):
+    return f"page-{number:04d}.xml"
+
+
+def page_number(filename):
+    """Číslo stránky ze jména page-0001.xml"""
+    return int(os.path.splitext(os.path.basename(filename))[0][len("page-"):])
+
+
+def is_sealed(path):
+    """Archivní stránka se už nezmění (existuje stránka za ní)"""
+    return os.path.exists(os.path.join(os.path.dirname(path), page_filename(page_number(path) + 1)))
+
+
+def add_links(rss, links, archive=False):
+    """
+    Doplní do RSS kanálu atom:link odkazy RFC 5005 (feedgen v RSS umí jen rel="self")
+
+    Args:
+        rss: RSS dokument (bytes)
+        links: [(rel, href), ...]
+        archive: Přidá fh:archive (dokument se už nezmění)
+
+    Returns:
+        RSS dokument (bytes)
+    """
+    from lxml import etree
+
+    root = etree.fromstring(rss, etree.XMLParser(remove_blank_text=True))
+    channel = root.find("channel")
+    position = list(channel).index(channel.find("description")) + 1
+    for rel, href in links:
+        link = etree.Element(f"{{{ATOM_NS}}}link", rel=rel, href=href)
+        channel.insert(position, link)
+        position += 1
+    if archive:
+        channel.insert(position, etree.Element(f"{{{HISTORY_NS}}}archive", nsmap={"fh": HISTORY_NS}))
+    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+
+
+def write_bytes(path, data):
+    """Atomický zápis souboru"""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def item_key(item):
+    """Pořadí položek v archivu (datum, URL) - stejné napříč běhy"""
+    return (item["date"], item["url"])
+
+
+class FeedArchive:
+
+    def __init__(self, archive_dir=ARCHIVE_DIR, page_size=50, current_size=20):
+        self.archive_dir = archive_dir
+        self.page_size = page_size
+        self.current_size = current_size
+
+    def source_dir(self, generator):
+        return os.path.join(self.archive_dir, generator.source_id)
+
+    def load_state(self, generator):
+        path = os.path.join(self.source_dir(generator), STATE_FILE)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {"pages": 0, "archived_through": None, "archived_urls": [], "pending": []}
+
+    def save_state(self, generator, state):
+        path = os.path.join(self.source_dir(generator), STATE_FILE)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def write_feed(self, generator, path, items, links, archive=False):
+        """
+        Zapíše RSS s odkazy RFC 5005
+
+        Args:
+            items: Položky seřazené od nejnovějších
+            links: [(rel, href), ...] - href relativní k adresáři zdroje
+            archive: Přidá fh:archive (dokument se už nezmění)
+        """
+        from feedgen.feed import FeedGenerator
+
+        fg = FeedGenerator()
+        fg.title(generator.source_name + (" - archiv" if archive else ""))
+        fg.link(href=generator.base_url, rel='alternate')
+        fg.description(f"RSS kanál zdroje {generator.source_name}")
+        fg.language('cs')
+
+        for item in reversed(items):
+            fe = fg.add_entry()
+            fe.title(item['title'])
+            fe.link(href=item['url'])
+            fe.description(item.get('description') or item['title'])
+            fe.guid(item['url'], permalink=True)
+
+            pub_date = datetime.fromisoformat(item['date'])
+            if pub_date.tzinfo is None:
+                pub_date = pub_date.replace(tzinfo=timezone.utc)
+            fe.pubDate(pub_date)
+
+        write_bytes(path, add_links(add_updated(fg.rss_str(), items), links, archive))
+
+    def link_next(self, directory, number):
+        """Doplní stránce number odkaz next-archive na stránku za ní (jediná změna stránky)"""
+        from lxml import etree
+
+        path = os.path.join(directory, page_filename(number))
+        if not os.path.exists(path):
+            return
+        root = etree.parse(path).getroot()
+        channel = root.find("channel")
+        rels = [link.get("rel") for link in channel.findall(f"{{{ATOM_NS}}}link")]
+        if "next-archive" in rels:
+            return
+        last_link = channel.findall(f"{{{ATOM_NS}}}link")[-1]
+        last_link.addnext(etree.Element(f"{{{ATOM_NS}}}link", rel="next-archive", href=page_filename(number + 1)))
+        write_bytes(path, etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8"))
+
+    def update(self, generator, items):
+        """
+        Přidá nové položky zdroje do archivu a přepíše aktuální feed
+
+        Položky, které mezitím vypadly z cache, zůstávají v čekajících, takže
+        historie je úplná bez ohledu na retenci zdroje.
+
+        Returns:
+            Seznam nově zapsaných archivních stránek
+        """
+        return self._locked_update(generator, items)[0]
+
+    def subscription(self, generator, items):
+        """
+        Aktualizuje archiv a vrátí okno pro odebíraný feed zdroje
+
+        Returns:
+            (položky od nejnovějších, [(rel, href), ...]) - href je relativní
+            k adresáři feedu zdroje (generator.rss_file)
+        """
+        _, state = self._locked_update(generator, items)
+        links = []
+        if state["pages"]:
+            page = os.path.abspath(os.path.join(self.source_dir(generator), page_filename(state["pages"])))
+            feed_dir = os.path.dirname(os.path.abspath(generator.rss_file))
+            links.append(("prev-archive", os.path.relpath(page, feed_dir).replace(os.sep, "/")))
+        return state["pending"][::-1], links
+
+    def _locked_update(self, generator, items):
+        directory = self.source_dir(generator)
+        os.makedirs(directory, exist_ok=True)
+        # Archiv zdroje aktualizuje vždy jen jeden proces (stav i stránky)
+        with file_lock(os.path.join(directory, STATE_FILE)):
+            return self._update(generator, directory, items)
+
+    def is_archived(self, state, item):
+        """
+        Položka už je na archivní stránce
+
+        Zdroje s daty bez času (H7O) přidávají během dne položky s libovolnou URL,
+        značka archived_through proto odděluje jen starší dny; položky ze dne
+        značky se poznají podle archived_urls.
+        """
+        if not state["archived_through"]:
+            return False
+        day = state["archived_through"][0]
+        if item["date"] == day:
+            return item["url"] in state["archived_urls"]
+        return item["date"] < day
+
+    def _update(self, generator, directory, items):
+        state = self.load_state(generator)
+        archived_urls = set(state.get("archived_urls", []))
+        state["archived_urls"] = archived_urls
+
+        pending = {item["url"]: item for item in state["pending"]}
+        for item in items:
+            if not self.is_archived(state, item):
+                pending[item["url"]] = {field: item[field] for field in ITEM_FIELDS if field in item}
+        pending = sorted(pending.values(), key=item_key)
+
+        written = []
+        # Archivujeme jen celé stránky, aktuální feed nikdy neklesne pod current_size
+        while len(pending) >= self.current_size + self.page_size:
+            page_items, pending = pending[:self.page_size], pending[self.page_size:]
+            number = state["pages"] + 1
+            links = [("current", CURRENT_FILE), ("self", page_filename(number))]
+            if number > 1:
+                links.append(("prev-archive", page_filename(number - 1)))
+
+            path = os.path.join(directory, page_filename(number))
+            if not os.path.exists(path):
+                self.write_feed(generator, path, page_items[::-1], links, archive=True)
+                written.append(page_filename(number))
+            # Předchozí stránka teprve teď dostane next-archive (stránka za ní existuje)
+            if number > 1:
+                self.link_next(directory, number - 1)
+            state["pages"] = number
+            # Pozdě přidaná položka ze dne značky může být starší než značka
+            last = item_key(page_items[-1])
+            if state["archived_through"]:
+                last = max(last, tuple(state["archived_through"]))
+            if not state["archived_through"] or last[0] != state["archived_through"][0]:
+                archived_urls.clear()
+            archived_urls.update(item["url"] for item in page_items if item["date"] == last[0])
+            state["archived_through"] = list(last)
+
+        links = [("current", CURRENT_FILE), ("self", CURRENT_FILE)]
+        if state["pages"]:
+            links.append(("prev-archive", page_filename(state["pages"])))
+        self.write_feed(generator, os.path.join(directory, CURRENT_FILE), pending[::-1], links)
+
+        state["pending"] = pending
+        state["archived_urls"] = sorted(archived_urls)
+        self.save_state(generator, state)
+        print(
+            f"Archiv {generator.source_id}: aktuální feed {len(pending)} položek, "
+            f"{state['pages']} archivních stránek (nových {len(written)})."
+        )
+        return written, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archivní feedy podle RFC 5005 (z cache)")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help="Adresář archivu")
+    parser.add_argument("--page-size", type=int, default=50, help="Počet položek archivní stránky")
+    parser.add_argument("--current-size", type=int, default=20, help="Minimální počet položek aktuálního feedu")
+    args = parser.parse_args()
+
+    from aggregate_feed import default_generators
+
+    archive = FeedArchive(args.archive_dir, page_size=args.page_size, current_size=args.current_size)
+    for generator in default_generators():
+        # Odebíraný feed zdroje se přegeneruje jako okno nad archivem
+        generator.archive = archive
+        generator.generate_rss(generator.load_cache())
+
+
+if __name__ == "__main__":
+    main()
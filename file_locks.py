@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Zámky souborů pro souběžné běhy generátorů (překryv cronu, démon + ruční běh, více procesů)
+- Každý zdroj má vlastní zámek (<soubor>.lock), takže různé zdroje běží paralelně
+- Zámky jsou poradní (flock) a drží se jen po dobu zápisu, ne po celé stahování
+- Optimistické sloučení: cache se načte bez zámku; pokud ji mezitím uložil jiný
+  proces, při zápisu se načte znovu a nové položky se sloučí s aktuální verzí
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from item_changes import apply_updates
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    """Zámek se nepodařilo získat v daném čase"""
+
+
+def _try_lock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, timeout=60, poll_interval=0.05):
+    """
+    Výlučný zámek prostředku (souboru) napříč procesy
+
+    Args:
+        path: Chráněný soubor; zámek je v <path>.lock vedle něj
+        timeout: Nejdelší čekání na zámek v sekundách
+    """
+    lock_path = f"{path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(lock_path, 'a+') as f:
+        while not _try_lock(f):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Zámek {lock_path} je držen déle než {timeout} s")
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+def file_version(path):
+    """Verze souboru pro optimistické slučování (None = soubor neexistuje)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def commit_cache(generator, cached_items, cached_version, new_items, updated_items, page_items):
+    """
+    Sloučí nové položky do cache, uloží ji a vygeneruje feed pod zámkem zdroje
+
+    Pokud cache od načtení (cached_version) změnil jiný proces, sloučí se
+    nové položky a úpravy ze stažených stránek s aktuální verzí na disku.
+
+    Returns:
+        (výsledné položky, nové položky, upravené položky) - po sloučení
+        s verzí jiného procesu jen ty, které ještě nezapsal
+    """
+    with file_lock(generator.cache_file):
+        if file_version(generator.cache_file) != cached_version:
+            print("Cache mezitím uložil jiný proces, slučuji s aktuální verzí.")
+            cached_items = generator.load_cache()
+            on_disk = {item["url"] for item in cached_items}
+            new_items = [item for item in new_items if item["url"] not in on_disk]
+            # Úpravy, které už jiný proces zapsal, mají stejný hash a znovu se nepočítají
+            updated_items = apply_updates(cached_items, page_items)
+
+        kept = generator.merge_items(cached_items, new_items)
+        generator.save_cache(kept)
+        generator.generate_rss(kept)
+    return kept, new_items, updated_items
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Trvalý index prvního výskytu položek pro zdroje bez data (Kosmas)
+- URL -> čas prvního výskytu (sekundy UTC) a pořadí na stránkách při prvním výskytu
+- Nové položky běhu dostanou časy ostře větší než všechny dříve přidělené, v pořadí
+  ze stránek; přidělení je O(nových položek) a nezávisí na čase běhu ani čísle stránky
+- Cache tak zůstává seřazená od nejnovějších bez přeřazování řetězců: nové položky
+  se jen předřadí a pořadí položek ve feedu se mezi běhy nemění
+- Soubor: 8 bajtů posledního přiděleného času + záznamy (hash URL, čas, pořadí)
+  seřazené podle hashe; čte se přes mmap a binární půlení jako seen_urls.py
+"""
+
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+
+from file_locks import file_lock
+from seen_urls import HASH_SIZE, url_hash
+
+
+HEADER = struct.Struct(">q")
+VALUE = struct.Struct(">qI")
+RECORD_SIZE = HASH_SIZE + VALUE.size
+
+
+def iso_date(timestamp):
+    """Čas prvního výskytu jako ISO datum (UTC)"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def date_seconds(value):
+    """ISO datum jako sekundy UTC (naivní datum = místní čas)"""
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def prepends(new_items, cached_items):
+    """
+    Lze nové položky jen předřadit před cache? (O(nových položek))
+
+    Platí, pokud jsou nové položky seřazené od nejnovějších a ta nejstarší
+    z nich je novější než nejnovější položka cache.
+    """
+    if not new_items:
+        return True
+    if any(new_items[i]["date"] <= new_items[i + 1]["date"] for i in range(len(new_items) - 1)):
+        return False
+    return not cached_items or new_items[-1]["date"] > cached_items[0]["date"]
+
+
+class FirstSeenIndex:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._map = None
+        # Nové záznamy: hash -> (čas, pořadí)
+        self._pending = {}
+        self._last = None
+
+    def _open(self):
+        if self._map is None and self._file is None and os.path.exists(self.path):
+            if os.path.getsize(self.path) >= HEADER.size:
+                self._file = open(self.path, 'rb')
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        self._open()
+        stored = (len(self._map) - HEADER.size) // RECORD_SIZE if self._map is not None else 0
+        return stored + len(self._pending)
+
+    @property
+    def last_assigned(self):
+        """Poslední přidělený čas (0 = prázdný index)"""
+        if self._last is None:
+            self._open()
+            self._last = HEADER.unpack_from(self._map)[0] if self._map is not None else 0
+        return self._last
+
+    def _stored_get(self, key):
+        self._open()
+        if self._map is None:
+            return None
+        low, high = 0, (len(self._map) - HEADER.size) // RECORD_SIZE
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * RECORD_SIZE
+            value = self._map[offset:offset + HASH_SIZE]
+            if value < key:
+                low = middle + 1
+            elif value > key:
+                high = middle
+            else:
+                return VALUE.unpack_from(self._map, offset + HASH_SIZE)
+        return None
+
+    def get(self, url):
+        """(čas prvního výskytu, pořadí) nebo None"""
+        key = url_hash(url)
+        return self._pending.get(key) or self._stored_get(key)
+
+    def __contains__(self, url):
+        return self.get(url) is not None
+
+    def assign(self, items, now=None, floor=None):
+        """
+        Přidělí položkám (v pořadí ze stránek, nejnovější první) datum prvního výskytu
+
+        Dříve viděné položky dostanou uložený čas. Nové dostanou časy ostře
+        větší než všechny dříve přidělené i než floor a klesající podle pořadí.
+
+        Args:
+            now: Čas běhu v sekundách UTC (výchozí aktuální)
+            floor: Nejnovější datum v cache (ISO) - nové položky musí být novější
+
+        Returns:
+            Položky (upravené na místě)
+        """
+        new_items = []
+        for item in items:
+            known = self.get(item["url"])
+            if known is not None:
+                item["date"] = iso_date(known[0])
+            else:
+                new_items.append(item)
+        if not new_items:
+            return items
+
+        if now is None:
+            now = int(datetime.now(timezone.utc).timestamp())
+        last = self.last_assigned
+        if floor is not None:
+            last = max(last, date_seconds(floor))
+        # Nejstarší nová položka je o sekundu novější než poslední přidělená
+        start = max(now, last + len(new_items))
+        for rank, item in enumerate(new_items):
+            timestamp = start - rank
+            item["date"] = iso_date(timestamp)
+            self._pending[url_hash(item["url"])] = (timestamp, rank)
+        self._last = start
+        return items
+
+    def save(self):
+        """
+        Sloučí nové záznamy se souborem (atomicky) a znovu ho namapuje
+
+        Pod zámkem se slučuje s aktuálním souborem; poslední přidělený čas
+        je maximum z obou verzí.
+        """
+        if not self._pending:
+            return
+        with file_lock(self.path):
+            # Soubor mohl mezitím nahradit jiný proces - namapujeme aktuální verzi
+            self.close()
+            self._open()
+            stored = self._map if self._map is not None else b""
+            stored_last = HEADER.unpack_from(stored)[0] if stored else 0
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as out:
+                out.write(HEADER.pack(max(stored_last, self._last or 0)))
+                position = HEADER.size
+                for key in sorted(self._pending):
+                    # Uložené záznamy s menším hashem zapíšeme po blocích
+                    start = position
+                    while position < len(stored) and stored[position:position + HASH_SIZE] < key:
+                        position += RECORD_SIZE
+                    out.write(stored[start:position])
+                    # Záznam, který už uložil jiný proces, má přednost (dřívější výskyt)
+                    if stored[position:position + HASH_SIZE] != key:
+                        out.write(key + VALUE.pack(*self._pending[key]))
+                out.write(stored[position:])
+            self.close()
+            os.replace(tmp_path, self.path)
+        self._pending = {}
+        self._last = None
@@ -1,34 +1,258 @@
 #!/usr/bin/env python3
 """
 Unified RSS Generator - generuje RSS pro všechny zdroje
+- Výchozí režim: zdroje běží postupně v jednom procesu
+- --spawn-workers N: koordinátor vloží běh do fronty (work_queue.py) a spustí N workerů
+- --enqueue / --worker: koordinátor a workery spouštěné zvlášť (i na více strojích se sdíleným diskem)
+- --async: všechny zdroje souběžně v jednom procesu na jedné smyčce asyncio (async_core.py)
+- Navazující výstupy zdroje běží souběžně s během dalších zdrojů (output_sinks.py)
 """
 
-from rss_generator import H7oRSSGenerator
-from kosmas_generator import KosmasRSSGenerator
+import argparse
+import functools
+import subprocess
+import sys
+import time
+from parse_pool import create_executor
+from source_engine import SourceRSSGenerator, load_source_configs
+from output_sinks import drain
+from run_guard import CircuitBreakers, Deadline, guarded_run
+from run_setup import add_run_arguments, run_options
+from work_queue import QUEUE_FILE, WorkQueue, run_worker
 
 
 def main():
+    parser = argparse.ArgumentParser(description="RSS generátor pro všechny zdroje")
+    add_run_arguments(parser)
+    parser.add_argument(
+        "--source-budget",
+        type=float,
+        default=300,
+        help="Časový rozpočet jednoho zdroje v sekundách (0 = bez limitu)",
+    )
+    parser.add_argument(
+        "--total-budget",
+        type=float,
+        default=900,
+        help="Časový limit celého běhu v sekundách (0 = bez limitu)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=3,
+        help="Počet selhání za sebou, po kterém se zdroj dočasně přeskakuje",
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=3600,
+        help="Doba přeskakování zdroje po otevření jističe v sekundách",
+    )
+    parser.add_argument(
+        "--queue",
+        default=QUEUE_FILE,
+        help="SQLite fronta úloh pro režim koordinátor/worker",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Jen vložit běh všech zdrojů do fronty (koordinátor) a skončit",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Běžet jako worker: brát úlohy z fronty, dokud není hotová",
+    )
+    parser.add_argument(
+        "--spawn-workers",
+        type=int,
+        default=None,
+        help="Vložit běh do fronty, spustit N lokálních workerů a počkat na výsledky",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=None,
+        help="Worker zpracuje jen úlohy daného běhu",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=600,
+        help="Doba pronájmu úlohy; úlohy spadlého workeru se po ní převezmou",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Nejvyšší počet pokusů o úlohu zdroje",
+    )
+    args = parser.parse_args()
+    if args.use_async and (args.profile or args.worker):
+        parser.error("--async nelze kombinovat s --profile ani --worker")
+
+    if args.enqueue or args.spawn_workers:
+        # Koordinátor nepotřebuje generátory, jen seznam zdrojů
+        queue = WorkQueue(args.queue, args.lease_seconds, args.max_attempts)
+        run_id = queue.enqueue(source_ids(), args.run_id)
+        print(f"Běh {run_id} vložen do fronty {args.queue}.")
+        if args.spawn_workers:
+            wait_for_workers(queue, run_id, spawn_workers(args.spawn_workers, run_id))
+            return print_summary(queue_results(queue, run_id))
+        return 0
+
+    # Sdílený procesový pool pro všechny zdroje (jen pokud je požadován)
+    executor = None
+    if args.workers is not None:
+        executor = create_executor(args.workers or None)
+
     print("=" * 60)
     print("  RSS Generator pro H7O a Kosmas.cz")
     print("=" * 60)
     print()
-    
-    # Generujeme H7O feed
-    print("🔹 Generuji H7O RSS feed...\n")
-    h7o_gen = H7oRSSGenerator()
-    h7o_gen.run()
-    
-    print("\n" + "=" * 60 + "\n")
-    
-    # Generujeme Kosmas feed
-    print("🔹 Generuji Kosmas.cz RSS feed...\n")
-    kosmas_gen = KosmasRSSGenerator()
-    kosmas_gen.run()
-    
+
+    generators = build_generators(args, executor)
+
+    # Celkový limit běhu; každý zdroj má navíc vlastní rozpočet v rámci zbývajícího času
+    total_deadline = Deadline(args.total_budget) if args.total_budget else None
+    breakers = CircuitBreakers(
+        failure_threshold=args.breaker_threshold,
+        cooldown_seconds=args.breaker_cooldown,
+    )
+
+    def run(generator):
+        guarded = functools.partial(
+            guarded_run,
+            generator,
+            breakers=breakers,
+            source_budget=args.source_budget or None,
+            total_deadline=total_deadline,
+        )
+        if args.profile:
+            # Každý zdroj má vlastní .pstats a report fází
+            from profiling import profiled_run
+
+            return profiled_run(generator, args.profile_dir, run=guarded)
+        return guarded()
+
+    try:
+        if args.worker:
+            queue = WorkQueue(args.queue, args.lease_seconds, args.max_attempts)
+            processed = run_worker(
+                queue,
+                {generator.source_id: generator for generator in generators},
+                run,
+                run_id=args.run_id,
+            )
+            print(f"\nWorker dokončil {processed} úloh, fronta je hotová.")
+            return 0
+
+        if args.use_async:
+            # asyncio načteme jen v asynchronním režimu
+            from async_core import guarded_run_async, run_all
+
+            guarded = functools.partial(
+                guarded_run_async,
+                breakers=breakers,
+                source_budget=args.source_budget or None,
+                total_deadline=total_deadline,
+            )
+            return print_summary(run_all(generators, guarded, args.max_connections))
+
+        results = {}
+        for index, generator in enumerate(generators):
+            if index > 0:
+                print("\n" + "=" * 60 + "\n")
+            print(f"🔹 Generuji {generator.source_name} RSS feed...\n")
+            results[generator.source_name] = run(generator)
+    finally:
+        # Navazující výstupy běží ve vlastních vláknech - počkáme na ně
+        drain()
+        if executor is not None:
+            executor.shutdown()
+
+    return print_summary(results)
+
+
+def source_ids():
+    """Identifikátory všech povolených zdrojů z konfigurace"""
+    return [config["id"] for config in load_source_configs(enabled_only=True)]
+
+
+def build_generators(args, executor):
+    """Vytvoří generátory všech zdrojů s navazujícími výstupy po běhu"""
+    # Souhrnný feed a přehled čtou cache právě těchto generátorů (seznam se naplní níže)
+    generators = []
+    options = run_options(args, sources=generators, executor=executor)
+    # Zdroje z konfigurace (sources/*.json, *.toml), včetně H7O a Kosmasu
+    generators.extend(
+        SourceRSSGenerator(config, **options) for config in load_source_configs(enabled_only=True)
+    )
+    return generators
+
+
+def worker_argv(argv, run_id):
+    """Argumenty workeru: stejné volby jako koordinátor, bez --spawn-workers/--enqueue"""
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg in ("--spawn-workers", "--run-id"):
+            skip = True
+            continue
+        if arg == "--enqueue" or arg.startswith(("--spawn-workers=", "--run-id=")):
+            continue
+        result.append(arg)
+    return result + ["--worker", "--run-id", run_id]
+
+
+def spawn_workers(count, run_id):
+    """Spustí lokální workery jako samostatné procesy"""
+    command = [sys.executable, __file__] + worker_argv(sys.argv[1:], run_id)
+    print(f"Spouštím {count} workerů...")
+    return [subprocess.Popen(command) for _ in range(count)]
+
+
+def wait_for_workers(queue, run_id, processes, poll_interval=1.0):
+    """Počká na dokončení běhu (nebo na konec všech workerů)"""
+    while not queue.is_finished(run_id):
+        if all(process.poll() is not None for process in processes):
+            print("⚠️ Všechny workery skončily, ale běh není dokončen.")
+            break
+        time.sleep(poll_interval)
+    for process in processes:
+        process.wait()
+
+
+def queue_results(queue, run_id):
+    """Výsledky běhu z fronty ve tvaru pro print_summary"""
+    results = {}
+    for source_id, (status, result, attempts, error) in queue.results(run_id).items():
+        results[source_id] = result if status == "done" else "failed"
+    return results
+
+
+def print_summary(results):
+    """
+    Vypíše souhrn běhu
+
+    Returns:
+        Návratový kód procesu: 1, pokud některý zdroj selhal (CI pak běh označí
+        jako chybný), jinak 0; přeskočení jističem chybou není
+    """
     print("\n" + "=" * 60)
-    print("✅ Všechny RSS feedy byly úspěšně vygenerovány!")
+    problems = {name: result for name, result in results.items() if result != "ok"}
+    if problems:
+        # Ostatní feedy jsou publikované, selhané zdroje jen vypíšeme
+        print("⚠️ RSS feedy vygenerovány, některé zdroje neproběhly:")
+        for name, result in problems.items():
+            print(f"  - {name}: {'přeskočen (jistič)' if result == 'skipped' else 'selhal'}")
+    else:
+        print("✅ Všechny RSS feedy byly úspěšně vygenerovány!")
     print("=" * 60)
+    return 1 if "failed" in results.values() else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
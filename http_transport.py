@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Vyměnitelný HTTP transport pod fetch_raw/fetch_page generátorů
+- RequestsTransport: skutečné stahování přes requests (výchozí)
+- RecordingTransport: stahuje přes jiný transport a odpovědi ukládá do kazety na disk
+- ReplayTransport: odpovídá z kazety bez sítě, volitelně se simulovanou latencí
+- Kazeta je adresář: <klíč>.json (URL, stav, kódování, hlavičky, doba odpovědi) + <klíč>.body
+- Podmíněné požadavky (rychlá kontrola, If-None-Match / If-Modified-Since) jdou přes
+  stejný transport; přehrávání odpoví 304, pokud validátory sedí na záznam
+- Asynchronní protějšky transportů jsou v async_core.py (přepínač --async)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# Nejvyšší počet souběžných požadavků v režimu --async (všechny zdroje dohromady)
+MAX_CONNECTIONS = 10
+
+
+class TransportError(Exception):
+    """Chyba stahování (síť, HTTP chyba, chybějící záznam v kazetě, timeout)"""
+
+
+class Response:
+    """Odpověď transportu - jen to, co generátory potřebují"""
+
+    def __init__(self, url, status, content, encoding=None, headers=None):
+        self.url = url
+        self.status = status
+        self.content = content
+        self.encoding = encoding
+        # Hlavičky ukládáme malými písmeny (HTTP hlavičky nerozlišují velikost)
+        self.headers = {name.lower(): value for name, value in (headers or {}).items()}
+
+    @property
+    def etag(self):
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("last-modified")
+
+
+class RequestsTransport:
+    """Stahování přes requests"""
+
+    def get(self, url, timeout=10, headers=None):
+        # requests načteme až při skutečném požadavku
+        import requests
+
+        try:
+            response = requests.get(url, timeout=timeout, headers=headers)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+        return Response(
+            url,
+            response.status_code,
+            response.content,
+            response.encoding or response.apparent_encoding,
+            response.headers,
+        )
+
+
+class Cassette:
+    """Adresář se zaznamenanými odpověďmi (jedna dvojice souborů na URL)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+
+    def paths(self, url):
+        base = os.path.join(self.directory, self.key(url))
+        return f"{base}.json", f"{base}.body"
+
+    def save(self, response, elapsed=0.0):
+        """Uloží odpověď (atomicky, tělo i metadata)"""
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path, body_path = self.paths(response.url)
+        meta = {
+            "url": response.url,
+            "status": response.status,
+            "encoding": response.encoding,
+            "headers": response.headers,
+            "elapsed": round(elapsed, 4),
+        }
+        for path, data in (
+            (body_path, response.content),
+            (meta_path, json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")),
+        ):
+            tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def load(self, url):
+        """
+        Returns:
+            (Response, elapsed) nebo None, když URL v kazetě není
+        """
+        meta_path, body_path = self.paths(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            content = f.read()
+        response = Response(meta["url"], meta["status"], content, meta["encoding"], meta["headers"])
+        return response, meta.get("elapsed", 0.0)
+
+    def urls(self):
+        """URL všech záznamů v kazetě"""
+        if not os.path.isdir(self.directory):
+            return []
+        result = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                    result.append(json.load(f)["url"])
+        return result
+
+
+class RecordingTransport:
+    """Stahuje přes vnitřní transport a každou úspěšnou odpověď zapíše do kazety"""
+
+    def __init__(self, directory, inner=None):
+        self.cassette = Cassette(directory)
+        self.inner = inner if inner is not None else RequestsTransport()
+
+    def get(self, url, timeout=10, headers=None):
+        start = time.perf_counter()
+        response = self.inner.get(url, timeout=timeout, headers=headers)
+        # 304 nemá tělo - v kazetě zůstane poslední úplná odpověď
+        if response.status != 304:
+            self.cassette.save(response, time.perf_counter() - start)
+        return response
+
+
+class ReplayTransport:
+    """
+    Odpovídá ze zaznamenané kazety
+
+    Args:
+        directory: Adresář kazety
+        latency: None = zaznamenaná doba odpovědi, číslo = pevná latence v sekundách
+                 (0 = bez čekání, vhodné pro testy)
+    """
+
+    def __init__(self, directory, latency=None):
+        self.cassette = Cassette(directory)
+        self.latency = latency
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=10, headers=None):
+        with self._lock:
+            self.requested.append(url)
+        recorded = self.cassette.load(url)
+        if recorded is None:
+            raise TransportError(f"URL není v kazetě: {url}")
+        response, elapsed = recorded
+
+        delay = elapsed if self.latency is None else self.latency
+        if delay > timeout:
+            # Simulovaná odpověď by nestihla timeout požadavku
+            time.sleep(timeout)
+            raise TransportError(f"Vypršel timeout ({timeout} s): {url}")
+        if delay > 0:
+            time.sleep(delay)
+        if response.status >= 400:
+            raise TransportError(f"HTTP {response.status}: {url}")
+        if is_not_modified(response, headers or {}):
+            return Response(url, 304, b"", response.encoding, response.headers)
+        return response
+
+
+def is_not_modified(response, headers):
+    """Odpovídají podmíněné hlavičky požadavku validátorům odpovědi? (jako server s 304)"""
+    headers = {name.lower(): value for name, value in headers.items()}
+    if "if-none-match" in headers:
+        return response.etag is not None and headers["if-none-match"] == response.etag
+    if "if-modified-since" in headers:
+        return response.last_modified is not None and headers["if-modified-since"] == response.last_modified
+    return False
+
+
+def add_transport_arguments(parser):
+    """Přidá přepínače --record/--replay do argparse parseru"""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Zaznamenat stažené odpovědi do kazety v adresáři DIR",
+    )
+    group.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help="Nestahovat, odpovídat ze zaznamenané kazety v adresáři DIR",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=None,
+        help="Pevná simulovaná latence přehrávání v sekundách (výchozí zaznamenaná)",
+    )
+
+
+def add_async_arguments(parser):
+    """Přidá přepínače --async a --max-connections (async_core.py se načte až při použití)"""
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Stahovat asynchronně (asyncio) - všechny zdroje na jedné smyčce a s jedním poolem spojení",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=MAX_CONNECTIONS,
+        help="Nejvyšší počet souběžných požadavků v režimu --async",
+    )
+
+
+def transport_from_args(args):
+    """Transport podle přepínačů --record/--replay (None = výchozí requests)"""
+    if args.record:
+        return RecordingTransport(args.record)
+    if args.replay:
+        return ReplayTransport(args.replay, latency=args.replay_latency)
+    return None
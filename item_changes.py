@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Detekce upravených položek podle hashe obsahu
+- Každá položka v cache nese krátký hash svých textových polí ("hash")
+- Položky z již stažených stránek, které jsou v cache, se porovnají jen podle hashe
+- Upravená položka se v cache přepíše a dostane čas úpravy ("updated")
+- V RSS nese čas úpravy element atom:updated (feedgen ho v RSS vynechá, pubDate
+  zůstává datem vydání, aby se upravená položka nejevila jako nová)
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+# Pole, jejichž změna znamená úpravu položky (datum a URL se nemění)
+CONTENT_FIELDS = ("title", "description", "author", "authors", "category")
+
+
+def content_hash(item):
+    """Vrátí 64bitový hash textových polí položky (16 hex znaků)"""
+    parts = []
+    for field in CONTENT_FIELDS:
+        value = item.get(field)
+        if isinstance(value, list):
+            value = "\x1e".join(value)
+        parts.append(value or "")
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def stamp_hashes(items):
+    """Doplní hash položkám, které ho ještě nemají (nové položky, starší cache)"""
+    for item in items:
+        if "hash" not in item:
+            item["hash"] = content_hash(item)
+
+
+def apply_updates(cached_items, page_items, now=None):
+    """
+    Porovná znovu viděné položky s cache a upravené v cache přepíše
+
+    Args:
+        cached_items: Položky z cache (upravují se na místě)
+        page_items: Položky ze stažených stránek
+        now: Čas úpravy (výchozí aktuální čas v UTC)
+
+    Returns:
+        Seznam upravených položek z cache
+    """
+    by_url = {item["url"]: item for item in cached_items}
+    updated_at = (now or datetime.now(timezone.utc)).isoformat()
+    updated = []
+
+    for item in page_items:
+        cached = by_url.get(item["url"])
+        if cached is None:
+            continue
+        digest = content_hash(item)
+        if cached.get("hash", content_hash(cached)) == digest:
+            cached["hash"] = digest
+            continue
+
+        for field in CONTENT_FIELDS:
+            if field in item:
+                cached[field] = item[field]
+        cached["hash"] = digest
+        cached["updated"] = updated_at
+        updated.append(cached)
+
+    return updated
+
+
+def report_updates(updated):
+    """Vypíše upravené položky"""
+    if not updated:
+        return
+    print(f"\nUpraveno {len(updated)} již známých položek:")
+    for item in updated[:10]:
+        print(f"  - {item['title']}")
+
+
+def add_updated(rss, items):
+    """
+    Doplní upraveným položkám RSS element atom:updated s časem úpravy
+
+    Args:
+        rss: RSS dokument (bytes) - položky mají guid = URL
+        items: Položky feedu; upravené nesou "updated"
+
+    Returns:
+        RSS dokument (bytes)
+    """
+    updated = {item["url"]: item["updated"] for item in items if item.get("updated")}
+    if not updated:
+        return rss
+
+    from lxml import etree
+
+    root = etree.fromstring(rss, etree.XMLParser(remove_blank_text=True))
+    for entry in root.iter("item"):
+        value = updated.get(entry.findtext("guid"))
+        if value is None:
+            continue
+        when = datetime.fromisoformat(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        etree.SubElement(entry, f"{{{ATOM_NS}}}updated").text = when.isoformat()
+    return etree.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8")
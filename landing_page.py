@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Statický přehled zdrojů (preview.html) generovaný z cache
+- Pro každý zdroj nejnovější položky, počet položek v cache a čas poslední změny
+- Šablony se při importu jednou rozdělí na literály a pole (compile_template),
+  vykreslení je jen spojení řetězců
+- Sekce zdroje se přegeneruje jen tehdy, když se jeho data v běhu změnila (otisk
+  počtu a nejnovějších položek); ostatní sekce se vezmou hotové ze stavu
+- Čtenáři stačí statické HTML - bez JavaScriptu a bez parsování XML feedů
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+from file_locks import file_lock
+
+
+PAGE_FILE = "preview.html"
+STATE_FILE = "preview_state.json"
+
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+def compile_template(text):
+    """
+    Předkompiluje šablonu s poli {{název}}
+
+    Returns:
+        Funkce render(values) -> řetězec; hodnoty se dosazují bez escapování
+    """
+    parts = PLACEHOLDER.split(text)
+    literals, names = parts[0::2], parts[1::2]
+    pairs = list(zip(names, literals[1:]))
+    first = literals[0]
+
+    def render(values):
+        out = [first]
+        for name, literal in pairs:
+            out.append(values[name])
+            out.append(literal)
+        return "".join(out)
+
+    return render
+
+
+PAGE = compile_template("""<!DOCTYPE html>
+<html lang="cs">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Přehled novinek - RSS Feeds</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; color: #333; padding: 20px; max-width: 900px; margin: 0 auto; }
+        h1, h2 { color: #667eea; }
+        .meta { color: #666; font-size: 0.9em; }
+        ol { padding-left: 20px; }
+        li { margin: 6px 0; }
+        time { color: #666; font-size: 0.85em; margin-left: 6px; }
+        a { color: #667eea; }
+    </style>
+</head>
+<body>
+    <h1>📰 Přehled novinek</h1>
+    <p class="meta">Nejnovější položky ze všech zdrojů. Celé seznamy jsou v RSS feedech.</p>
+{{sections}}
+    <p><a href="index.html">Zpět na feedy</a> · <a href="stats.html">Statistiky běhů</a></p>
+</body>
+</html>
+""")
+
+SECTION = compile_template("""    <section id="{{source_id}}">
+        <h2>{{source_name}}</h2>
+        <p class="meta">Položek: {{count}} · Aktualizováno {{updated}} UTC · <a href="{{feed}}">RSS</a></p>
+        <ol>
+{{items}}
+        </ol>
+    </section>
+""")
+
+ITEM = compile_template(
+    """            <li><a href="{{url}}">{{title}}</a><time datetime="{{date}}">{{day}}</time></li>"""
+)
+
+
+def section_fingerprint(items, max_items):
+    """Otisk dat zobrazených v sekci: počet položek a nejnovější položky"""
+    digest = hashlib.sha1(str(len(items)).encode("ascii"))
+    for item in items[:max_items]:
+        for field in ("url", "title", "date"):
+            digest.update(b"\0" + str(item.get(field) or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LandingPage:
+
+    def __init__(self, generators, page_file=PAGE_FILE, state_file=STATE_FILE, max_items=10):
+        self.generators = generators
+        self.page_file = page_file
+        self.state_file = state_file
+        self.max_items = max_items
+
+    def load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def save_state(self, state):
+        tmp_path = f"{self.state_file}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def render_section(self, generator, items, updated):
+        """HTML sekce jednoho zdroje"""
+        rows = [
+            ITEM({
+                "url": html.escape(item["url"]),
+                "title": html.escape(item.get("title") or item["url"]),
+                "date": html.escape(item.get("date") or ""),
+                "day": html.escape((item.get("date") or "")[:10]),
+            })
+            for item in items[:self.max_items]
+        ]
+        return SECTION({
+            "source_id": html.escape(generator.source_id),
+            "source_name": html.escape(generator.source_name),
+            "count": str(len(items)),
+            "updated": html.escape(updated),
+            "feed": html.escape(os.path.basename(generator.rss_file)),
+            "items": "\n".join(rows),
+        })
+
+    def refresh_section(self, state, generator, items, now=None):
+        """
+        Přegeneruje sekci zdroje, pokud se jeho data změnila
+
+        Returns:
+            True, pokud se sekce změnila
+        """
+        fingerprint = section_fingerprint(items, self.max_items)
+        previous = state.get(generator.source_id)
+        if previous is not None and previous["fingerprint"] == fingerprint:
+            return False
+        now = now or datetime.now(timezone.utc)
+        updated = now.strftime("%Y-%m-%d %H:%M")
+        state[generator.source_id] = {
+            "fingerprint": fingerprint,
+            "updated": updated,
+            "html": self.render_section(generator, items, updated),
+        }
+        return True
+
+    def update(self, generator, items, now=None):
+        """
+        Aktualizuje přehled po běhu zdroje
+
+        Ostatní zdroje se čtou z cache jen tehdy, když ještě nemají sekci ve stavu.
+
+        Returns:
+            Přegenerované zdroje (source_id)
+        """
+        with file_lock(self.state_file):
+            state = self.load_state()
+            changed = []
+            for source in self.generators:
+                if source.source_id == generator.source_id:
+                    source_items = items
+                elif source.source_id in state:
+                    continue
+                else:
+                    source_items = source.load_cache()
+                if self.refresh_section(state, source, source_items, now):
+                    changed.append(source.source_id)
+
+            if changed or not os.path.exists(self.page_file):
+                self.write_page(state)
+                self.save_state(state)
+        print(f"Přehled {self.page_file}: přegenerováno sekcí {len(changed)}.")
+        return changed
+
+    def write_page(self, state):
+        """Složí stránku z hotových sekcí (v pořadí zdrojů)"""
+        sections = [
+            state[generator.source_id]["html"]
+            for generator in self.generators
+            if generator.source_id in state
+        ]
+        tmp_path = f"{self.page_file}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(PAGE({"sections": "".join(sections).rstrip("\n")}))
+        os.replace(tmp_path, self.page_file)
+
+    def on_source_run(self, generator, items):
+        """Callback pro after_run generátorů"""
+        self.update(generator, items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statický přehled novinek všech zdrojů (z cache)")
+    parser.add_argument("--output", default=PAGE_FILE, help="Výstupní HTML soubor")
+    parser.add_argument("--max-items", type=int, default=10, help="Počet položek na zdroj")
+    args = parser.parse_args()
+
+    from aggregate_feed import default_generators
+
+    generators = default_generators()
+    page = LandingPage(generators, page_file=args.output, max_items=args.max_items)
+    for generator in generators:
+        page.update(generator, generator.load_cache())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,56 @@ Utility pro logování běhů RSS generátorů
 """
 
 import os
+import time
 from datetime import datetime, timedelta, timezone
 
+from file_locks import file_lock
+from run_stats import HTML_FILE, STATS_FILE, RunStats
+
+
+# Čas importu modulu - náhradní začátek, kde čas startu procesu z /proc není k dispozici
+PROCESS_STARTED = time.perf_counter()
+_startup_seconds = None
+
+
+def process_age():
+    """
+    Stáří procesu v sekundách podle /proc/self/stat (Linux), jinak None
+
+    Zahrnuje i start interpretu a importy před log_utils; přesnost je
+    dána tiky jádra (obvykle 10 ms).
+    """
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, AttributeError):
+        return None
+    # Jméno procesu (2. pole) může obsahovat mezery - pole počítáme až za závorkou;
+    # starttime je 22. pole, tj. 20. za jménem
+    fields = stat[stat.rindex(b")") + 2:].split()
+    return max(uptime - int(fields[19]) / ticks_per_second, 0.0)
+
+
+def startup_seconds():
+    """Vrátí dobu startu procesu (od spuštění procesu do prvního volání)"""
+    global _startup_seconds
+    if _startup_seconds is None:
+        age = process_age()
+        _startup_seconds = age if age is not None else time.perf_counter() - PROCESS_STARTED
+    return _startup_seconds
+
 
 class RSSLogger:
-    def __init__(self, log_file="rss_update_log.md"):
+    def __init__(self, log_file="rss_update_log.md", run_stats=None):
         self.log_file = log_file
+        # Souhrnné statistiky se ukládají vedle logu
+        if run_stats is None:
+            directory = os.path.dirname(log_file)
+            run_stats = RunStats(os.path.join(directory, STATS_FILE), os.path.join(directory, HTML_FILE))
+        self.run_stats = run_stats
         self._ensure_log_exists()
     
     def _ensure_log_exists(self):
@@ -78,7 +122,18 @@ class RSSLogger:
             f.writelines(header_lines)
             f.writelines(filtered_lines)
     
-    def log_run(self, source_name, new_items_count, new_items_titles=None, error=None):
+    def log_run(
+        self,
+        source_name,
+        new_items_count,
+        new_items_titles=None,
+        error=None,
+        startup_seconds=None,
+        note=None,
+        duration_seconds=None,
+        pages_fetched=None,
+        skipped=False,
+    ):
         """
         Zaloguje spuštění generátoru
         
@@ -87,33 +142,32 @@ class RSSLogger:
             new_items_count: Počet nových položek
             new_items_titles: Seznam titulů nových položek
             error: Chybová zpráva, pokud nastala
+            startup_seconds: Doba startu procesu (importy) v sekundách
+            note: Doplňující poznámka (např. výsledek rychlé kontroly)
+            duration_seconds: Doba běhu generátoru v sekundách
+            pages_fetched: Počet stažených stránek
+            skipped: Zdroj se nestahoval (jistič, vypršený časový limit) - důvod je v note
         """
-        self._ensure_log_exists()
-        self._clean_old_entries()
-        
         now = datetime.now(timezone.utc)
         timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
         
-        # Načteme existující obsah
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Najdeme konec hlavičky (řádek s "---")
-        header_end = 0
-        for i, line in enumerate(lines):
-            if line.strip() == "---":
-                header_end = i + 1
-                break
-        
         # Vytvoříme nový záznam
         new_entry = []
         new_entry.append("\n")
         new_entry.append(f"## 🕐 {timestamp} UTC\n\n")
         new_entry.append(f"**Zdroj:** {source_name}\n\n")
+        if startup_seconds is not None:
+            new_entry.append(f"**Start procesu:** {startup_seconds * 1000:.0f} ms\n\n")
+        if duration_seconds is not None:
+            new_entry.append(f"**Doba běhu:** {duration_seconds:.1f} s\n\n")
+        if note:
+            new_entry.append(f"**Poznámka:** {note}\n\n")
         
         if error:
             new_entry.append(f"**Status:** ❌ Chyba\n\n")
             new_entry.append(f"**Chybová zpráva:**\n```\n{error}\n```\n\n")
+        elif skipped:
+            new_entry.append(f"**Status:** ⏸ Přeskočeno\n\n")
         else:
             new_entry.append(f"**Status:** ✅ Úspěch\n\n")
             new_entry.append(f"**Nové položky:** {new_items_count}\n\n")
@@ -129,11 +183,32 @@ class RSSLogger:
         
         new_entry.append("---\n")
         
-        # Vložíme nový záznam hned za hlavičku
-        new_content = lines[:header_end] + new_entry + lines[header_end:]
-        
-        # Zapíšeme zpět
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            f.writelines(new_content)
+        # Čtení a zápis logu pod zámkem, aby se souběžné běhy nepřepsaly
+        with file_lock(self.log_file):
+            self._ensure_log_exists()
+            self._clean_old_entries()
+            
+            # Načteme existující obsah
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            
+            # Najdeme konec hlavičky (řádek s "---")
+            header_end = 0
+            for i, line in enumerate(lines):
+                if line.strip() == "---":
+                    header_end = i + 1
+                    break
+            
+            # Vložíme nový záznam hned za hlavičku
+            new_content = lines[:header_end] + new_entry + lines[header_end:]
+            
+            # Zapíšeme zpět (atomicky - čtenáři nikdy neuvidí rozepsaný soubor)
+            tmp_path = f"{self.log_file}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(new_content)
+            os.replace(tmp_path, self.log_file)
+
+        # Souhrnné statistiky se aktualizují přírůstkově - dashboardy nemusí číst log
+        self.run_stats.update(source_name, new_items_count, error, duration_seconds, pages_fetched)
         
         print(f"📝 Log zapsán do {self.log_file}")
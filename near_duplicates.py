@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Detekce téměř duplicitních položek (nad rámec shody URL)
+- Klíč položky: normalizovaný titulek (bez diakritiky, interpunkce a označení vazby/vydání) + autoři
+- Podobné titulky se hledají přes 64bitový simhash rozdělený do pásem (LSH), takže
+  vyhledání jedné položky stojí téměř konstantní čas i proti dlouhé historii
+- Pravidla sloučení jsou nastavitelná (dedupe_rules generátoru nebo "dedupe" v konfiguraci zdroje)
+- Otisky všech dříve viděných položek se drží v SQLite (NearDuplicateStore): simhash se
+  počítá jen pro nové položky a porovnává se i s položkami mimo retenci cache
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import unicodedata
+
+
+DEFAULT_RULES = {
+    # Maximální Hammingova vzdálenost simhashů titulků (0 = jen přesná shoda klíče)
+    "max_distance": 3,
+    # Simhash se použije jen pro titulky s alespoň tolika slovy
+    # (krátké titulky jako "Albánie – Marco Polo" se porovnávají jen přesně)
+    "min_tokens": 4,
+    # Duplicitní položky musí mít stejné autory
+    "require_same_author": True,
+    # Položka bez autora se smí sloučit s položkou se stejným titulkem a autorem
+    "allow_missing_author": True,
+    # Regulární výrazy (nad normalizovaným titulkem) pro označení vazby a vydání
+    "edition_patterns": [
+        r"\((?:[^)]*\b)?(?:kartonova|brozovana|vazana|pevna|mekka|paperback|hardback|"
+        r"e-?kniha|audiokniha|cd|mp3|vydani|dotisk)\b[^)]*\)",
+        r"\b\d+\s*\.?\s*(?:vydani|dotisk)\b",
+        r"\b(?:e-?kniha|audiokniha|paperback|hardback)\b",
+    ],
+}
+
+SIMHASH_BITS = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    signature INTEGER
+);
+CREATE INDEX IF NOT EXISTS items_title_key ON items (title_key);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    item_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bands_key ON bands (band, key);
+"""
+
+
+def strip_diacritics(text):
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in normalized if not unicodedata.combining(c)).lower()
+
+
+class NearDuplicateIndex:
+    """
+    Index již známých položek pro hledání téměř duplicit
+
+    Přesné klíče jsou ve slovníku (normalizovaný titulek -> položky). Simhash
+    se rozdělí na max_distance + 1 pásem; dvě hodnoty ve vzdálenosti nejvýše
+    max_distance se podle Dirichletova principu shodují alespoň v jednom pásmu,
+    takže stačí porovnat kandidáty ze stejných kyblíků.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = dict(DEFAULT_RULES)
+        self.rules.update(rules or {})
+        self.edition_res = [re.compile(p) for p in self.rules["edition_patterns"]]
+        self.max_distance = self.rules["max_distance"]
+        self.bands = self.max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.bands
+        self._exact = {}
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def title_tokens(self, title):
+        """Slova normalizovaného titulku (bez diakritiky a označení vydání)"""
+        text = strip_diacritics(title)
+        for pattern in self.edition_res:
+            text = pattern.sub(" ", text)
+        return re.findall(r"\w+", text)
+
+    def author_key(self, item):
+        """Seřazení autoři bez diakritiky; prázdný řetězec, pokud autor chybí"""
+        authors = item.get("authors")
+        if authors is None:
+            authors = [item.get("author") or ""]
+        names = (" ".join(re.findall(r"\w+", strip_diacritics(a))) for a in authors)
+        return "|".join(sorted(name for name in names if name))
+
+    @staticmethod
+    def simhash(tokens):
+        """64bitový simhash ze slov a dvojic slov titulku"""
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        weights = [0] * SIMHASH_BITS
+        for feature in features:
+            value = int.from_bytes(
+                hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+            )
+            for bit in range(SIMHASH_BITS):
+                weights[bit] += 1 if value >> bit & 1 else -1
+        return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+    def _band_keys(self, signature):
+        mask = (1 << self.band_bits) - 1
+        return [signature >> (band * self.band_bits) & mask for band in range(self.bands)]
+
+    def _signature(self, item):
+        tokens = self.title_tokens(item["title"])
+        signature = None
+        if self.max_distance > 0 and len(tokens) >= self.rules["min_tokens"]:
+            signature = self.simhash(tokens)
+        return " ".join(tokens), self.author_key(item), signature
+
+    def _authors_match(self, first, second):
+        if not self.rules["require_same_author"] or first == second:
+            return True
+        return self.rules["allow_missing_author"] and not (first and second)
+
+    def _exact_matches(self, title_key):
+        """Známé položky se stejným klíčem titulku: [(autoři, položka)]"""
+        return self._exact.get(title_key, ())
+
+    def _band_matches(self, band, key):
+        """Známé položky ve stejném kyblíku pásma: [(simhash, autoři, položka)]"""
+        return self._buckets[band].get(key, ())
+
+    def _insert(self, title_key, author_key, signature, item):
+        self._exact.setdefault(title_key, []).append((author_key, item))
+        if signature is not None:
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, []).append((signature, author_key, item))
+
+    def is_empty(self):
+        return not self._exact
+
+    def commit(self):
+        """Trvalé indexy uloží přidané položky (index v paměti nic neukládá)"""
+
+    def find(self, item):
+        """Vrátí již známou položku, se kterou je item téměř duplicitní, jinak None"""
+        title_key, author_key, signature = self._signature(item)
+        if not title_key:
+            return None
+
+        # Položka se stejnou URL je tatáž položka (např. z přerušeného běhu), ne duplicita
+        for other_author, other in self._exact_matches(title_key):
+            if other["url"] != item["url"] and self._authors_match(author_key, other_author):
+                return other
+
+        if signature is None:
+            return None
+        for band, key in enumerate(self._band_keys(signature)):
+            for other_signature, other_author, other in self._band_matches(band, key):
+                if (
+                    other["url"] != item["url"]
+                    and bin(signature ^ other_signature).count("1") <= self.max_distance
+                    and self._authors_match(author_key, other_author)
+                ):
+                    return other
+        return None
+
+    def add(self, item):
+        title_key, author_key, signature = self._signature(item)
+        if title_key:
+            self._insert(title_key, author_key, signature, item)
+
+
+def _to_signed(value):
+    """64bitový simhash jako znaménkové číslo pro SQLite INTEGER"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+class NearDuplicateStore(NearDuplicateIndex):
+    """
+    Trvalý index otisků (SQLite): klíče titulků a kyblíky LSH všech dříve viděných položek
+
+    Pro nalezenou položku vrací jen URL a titulek. Soubor se otevře až při
+    prvním použití. Při změně pravidel (jiné klíče a pásma) se index vyprázdní
+    a collapse_new_items ho znovu naplní z cache.
+    """
+
+    def __init__(self, path, rules=None):
+        super().__init__(rules)
+        self.path = path
+        self._conn = None
+
+    def connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.executescript(SCHEMA)
+            rules = json.dumps(self.rules, sort_keys=True)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'rules'").fetchone()
+            if row is None or row[0] != rules:
+                conn.execute("DELETE FROM bands")
+                conn.execute("DELETE FROM items")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rules', ?)", (rules,))
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _exact_matches(self, title_key):
+        rows = self.connect().execute(
+            "SELECT author_key, url, title FROM items WHERE title_key = ?", (title_key,)
+        )
+        return [(author_key, {"url": url, "title": title}) for author_key, url, title in rows]
+
+    def _band_matches(self, band, key):
+        rows = self.connect().execute(
+            "SELECT items.signature, items.author_key, items.url, items.title"
+            " FROM bands JOIN items ON items.id = bands.item_id"
+            " WHERE bands.band = ? AND bands.key = ?",
+            (band, key),
+        )
+        return [
+            (signature & ((1 << SIMHASH_BITS) - 1), author_key, {"url": url, "title": title})
+            for signature, author_key, url, title in rows
+        ]
+
+    def _insert(self, title_key, author_key, signature, item):
+        conn = self.connect()
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO items (url, title, title_key, author_key, signature)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (item["url"], item["title"], title_key, author_key,
+             None if signature is None else _to_signed(signature)),
+        )
+        if cursor.rowcount and signature is not None:
+            conn.executemany(
+                "INSERT INTO bands (band, key, item_id) VALUES (?, ?, ?)",
+                [(band, key, cursor.lastrowid) for band, key in enumerate(self._band_keys(signature))],
+            )
+
+    def is_empty(self):
+        return self.connect().execute("SELECT 1 FROM items LIMIT 1").fetchone() is None
+
+    def commit(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+
+def collapse_new_items(existing_items, new_items, rules=None, index=None):
+    """
+    Vyřadí nové položky, které jsou téměř duplicitní s již známými
+
+    Ponechává se dříve známá položka (z cache, případně dřívější na stránce).
+
+    Args:
+        existing_items: Položky z cache
+        new_items: Nové položky (URL, která v cache nejsou)
+        rules: Pravidla sloučení (doplní se z DEFAULT_RULES); None = sloučení vypnuto
+        index: Trvalý index (NearDuplicateStore); cache se do něj načte jen, když je prázdný.
+            Bez něj se index sestaví z cache při každém volání.
+
+    Returns:
+        (ponechané nové položky, [(vyřazená položka, ponechaná položka), ...])
+    """
+    if rules is None or not new_items:
+        return list(new_items), []
+
+    if index is None:
+        index = NearDuplicateIndex(rules)
+    if index.is_empty():
+        for item in existing_items:
+            index.add(item)
+
+    kept = []
+    collapsed = []
+    for item in new_items:
+        duplicate = index.find(item)
+        if duplicate is not None:
+            collapsed.append((item, duplicate))
+            continue
+        index.add(item)
+        kept.append(item)
+    index.commit()
+    return kept, collapsed
+
+
+def report_collapsed(collapsed):
+    """Vypíše vyřazené téměř duplicitní položky"""
+    if not collapsed:
+        return
+    print(f"\nSloučeno {len(collapsed)} téměř duplicitních položek:")
+    for item, duplicate in collapsed[:10]:
+        print(f"  - {item['title']} ({item['url']}) ~ {duplicate['url']}")
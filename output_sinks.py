@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Souběžné navazující výstupy po běhu zdroje (souhrnný feed, dílčí feedy, index, archiv...)
+- Položky se po sloučení připraví jednou (RenderedItems): neměnný seřazený snímek
+  a líně sdílený JSON, který si výstupy nemusí serializovat každý zvlášť
+- Každý registrovaný výstup (callback after_run) běží ve vlastním vlákně ("pruhu"):
+  výstupy běží souběžně navzájem i se zbytkem běhu, ale jeden výstup sdílený více
+  zdroji zpracovává běhy postupně a ve stejném pořadí
+- Výstup obalený after_outputs() (ping hubu) běží až po ostatních výstupech téhož
+  běhu, aby oznamoval už zapsané feedy (např. souhrnný all_feed.xml)
+- Další výstup tak běh neprodlouží - run() na výstupy nečeká, počká se na ně až
+  před dalším během stejného generátoru (wait_for_outputs), při profilování a na
+  konci procesu (drain)
+- Zápis cache a hlavního RSS zůstává v commit_cache pod zámkem zdroje
+- ObjectStoreSink: výstup do adresáře jako náhrada objektového úložiště
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from functools import cached_property
+
+
+OBJECT_STORE_DIR = "object_store"
+
+
+class RenderedItems(tuple):
+    """Seřazený snímek položek běhu (nejnovější první) sdílený všemi výstupy"""
+
+    def __new__(cls, items=(), facet_index=None):
+        rendered = super().__new__(cls, items)
+        # Invertovaný index faset postavený při sloučení právě těchto položek (nebo None)
+        rendered.facet_index = facet_index
+        return rendered
+
+    @cached_property
+    def json(self):
+        """Položky jako JSON (UTF-8, bez date_obj) - serializuje se nejvýše jednou"""
+        items = [
+            {key: value for key, value in item.items() if key != "date_obj"}
+            for item in self
+        ]
+        return json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class AfterOutputs:
+    """Výstup, který se spustí až po dokončení ostatních výstupů téhož běhu"""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+
+def after_outputs(sink):
+    """Označí výstup, který potřebuje hotové ostatní výstupy běhu (např. HubNotifier)"""
+    return AfterOutputs(sink)
+
+
+class Publication:
+    """Rozeslané výstupy jednoho běhu"""
+
+    def __init__(self, futures=None):
+        self.futures = list(futures or [])
+
+    def wait(self):
+        """Počká na všechny výstupy; chyby jen vypíše (běh neshodí)"""
+        futures, self.futures = self.futures, []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Chyba při zpracování výstupu po běhu: {e}")
+
+
+class OutputSinks:
+    """Pruhy výstupů: registrovaný výstup -> jednovláknový executor"""
+
+    def __init__(self):
+        # Výstup -> [executor, počet nedokončených úloh]; nečinný pruh se ukončí,
+        # aby v procesu nezůstávala vlákna (fork poolu parsování)
+        self._lanes = {}
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _submit(self, sink, generator, items, after=()):
+        # Vázané metody téhož objektu jsou si rovné - sdílený výstup má jeden pruh
+        with self._lock:
+            lane = self._lanes.get(sink)
+            if lane is None:
+                lane = self._lanes[sink] = [ThreadPoolExecutor(1, thread_name_prefix="output"), 0]
+            lane[1] += 1
+            return lane[0].submit(self._run, sink, generator, items, after)
+
+    def _run(self, sink, generator, items, after=()):
+        try:
+            # Výstupy, na které se čeká, běží v jiných pruzích (nikdy nečekají zpět)
+            wait(after)
+            sink(generator, items)
+        finally:
+            with self._lock:
+                lane = self._lanes[sink]
+                lane[1] -= 1
+                if lane[1] == 0:
+                    del self._lanes[sink]
+                    lane[0].shutdown(wait=False)
+
+    def publish(self, generator, items, sinks, facet_index=None):
+        """
+        Rozešle položky běhu všem výstupům souběžně
+
+        Args:
+            facet_index: Index faset z merge_items pro tytéž položky (facet_feeds.py)
+
+        Returns:
+            Publication (wait() počká na dokončení)
+        """
+        rendered = items if isinstance(items, RenderedItems) else RenderedItems(items, facet_index)
+        futures = [
+            self._submit(sink, generator, rendered)
+            for sink in sinks if not isinstance(sink, AfterOutputs)
+        ]
+        futures += [
+            self._submit(sink.sink, generator, rendered, after=tuple(futures))
+            for sink in sinks if isinstance(sink, AfterOutputs)
+        ]
+        publication = Publication(futures)
+        with self._lock:
+            self._pending = [p for p in self._pending if p.futures] + [publication]
+        return publication
+
+    def drain(self):
+        """Počká na všechny rozeslané výstupy (konec procesu)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for publication in pending:
+            publication.wait()
+
+
+# Sdílené pruhy všech generátorů procesu
+default_sinks = OutputSinks()
+
+
+def publish(generator, items, sinks, facet_index=None):
+    """Rozešle položky běhu výstupům přes sdílené pruhy procesu"""
+    return default_sinks.publish(generator, items, sinks, facet_index)
+
+
+def drain():
+    """Počká na výstupy všech dosud dokončených běhů"""
+    default_sinks.drain()
+
+
+class ObjectStoreSink:
+    """
+    Výstup do adresáře napodobujícího objektové úložiště
+
+    Každý zdroj má objekty <source_id>/items.json a <source_id>/feed.xml.
+    Objekt se zapisuje atomicky spolu s metadaty (<klíč>.meta.json: etag,
+    velikost, typ, čas nahrání); nezměněný obsah (stejný etag) se nepřepisuje.
+    """
+
+    def __init__(self, directory=OBJECT_STORE_DIR):
+        self.directory = directory
+
+    def object_path(self, key):
+        return os.path.join(self.directory, *key.split("/"))
+
+    def etag(self, key):
+        """Etag uloženého objektu nebo None"""
+        try:
+            with open(self.object_path(key) + ".meta.json", encoding="utf-8") as f:
+                return json.load(f).get("etag")
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, data, content_type):
+        """
+        Uloží objekt (atomicky)
+
+        Returns:
+            True, pokud se obsah změnil a objekt se zapsal
+        """
+        etag = hashlib.sha256(data).hexdigest()
+        if self.etag(key) == etag:
+            return False
+
+        path = self.object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {
+            "key": key,
+            "etag": etag,
+            "size": len(data),
+            "content_type": content_type,
+            "uploaded": datetime.now(timezone.utc).isoformat(),
+        }
+        for target, payload in (
+            (path, data),
+            (path + ".meta.json", json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")),
+        ):
+            tmp_path = f"{target}.tmp{os.getpid()}.{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, target)
+        return True
+
+    def on_source_run(self, generator, items):
+        """Callback pro after_run generátorů"""
+        if not isinstance(items, RenderedItems):
+            items = RenderedItems(items)
+        written = self.put(f"{generator.source_id}/items.json", items.json, "application/json")
+        if os.path.exists(generator.rss_file):
+            with open(generator.rss_file, "rb") as f:
+                feed = f.read()
+            written = self.put(f"{generator.source_id}/feed.xml", feed, "application/rss+xml") or written
+        if written:
+            print(f"Objektové úložiště aktualizováno: {self.directory}/{generator.source_id}")
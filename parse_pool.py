@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Paralelní parsování stránek v procesovém poolu
+- Hlavní vlákno stahuje surová data stránek
+- Parsování HTML a extrakce položek běží v procesech poolu
+- Výsledky se vrací v pořadí stránek, takže early-stop logika zůstává stejná
+"""
+
+import os
+from collections import deque
+
+
+def default_workers():
+    """Vrátí výchozí počet procesů (počet jader)"""
+    return os.cpu_count() or 1
+
+
+def create_executor(workers=None):
+    """Vytvoří procesový pool pro parsování stránek"""
+    # multiprocessing importujeme až když je pool opravdu potřeba
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=workers or default_workers())
+
+
+def iter_parsed_pages(
+    fetch_raw,
+    parse_func,
+    max_pages,
+    parse_args=(),
+    executor=None,
+    workers=None,
+    prefetch=None,
+):
+    """
+    Stahuje stránky 1..max_pages a parsuje je v procesovém poolu
+
+    Args:
+        fetch_raw: Funkce page_num -> (bytes, encoding) nebo None při chybě
+        parse_func: Funkce na úrovni modulu (raw, encoding, page_num, *parse_args)
+        max_pages: Maximální počet stránek
+        parse_args: Další argumenty pro parse_func (musí jít picklovat)
+        executor: Sdílený pool; pokud není zadán, vytvoří se vlastní
+        workers: Počet procesů vlastního poolu
+        prefetch: Kolik stránek může být rozpracováno dopředu
+
+    Yields:
+        (page_num, výsledek parse_func) v pořadí stránek; při chybě stahování
+        (page_num, None) a generátor skončí. Ukončení generátoru (break
+        u volajícího) zruší dosud nezpracované stránky.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = create_executor(workers)
+    if prefetch is None:
+        prefetch = workers or default_workers()
+
+    pending = deque()
+    next_page = 1
+    fetch_failed = False
+
+    try:
+        while True:
+            # Stahujeme dopředu, dokud pool parsuje předchozí stránky
+            while not fetch_failed and next_page <= max_pages and len(pending) < prefetch:
+                raw = fetch_raw(next_page)
+                if raw is None:
+                    fetch_failed = True
+                    pending.append((next_page, None))
+                else:
+                    content, encoding = raw
+                    future = executor.submit(
+                        parse_func, content, encoding, next_page, *parse_args
+                    )
+                    pending.append((next_page, future))
+                next_page += 1
+
+            if not pending:
+                return
+
+            page_num, future = pending.popleft()
+            if future is None:
+                yield page_num, None
+                return
+            yield page_num, future.result()
+    finally:
+        for _, future in pending:
+            if future is not None:
+                future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Proudové kroky pro run() generátorů: stažení → extrakce → deduplikace → retence → výstupy
+- Procházení stránek je generátor, který stahuje jen tak daleko, jak se čte. run()
+  ho projde jednou do seznamu nových položek, protože ten potřebuje sloučení
+  téměř duplicitních položek, detekce úprav i viděné URL
+- Od sloučení dál je zpracování proudové: cache i nové položky jsou seřazené od
+  nejnovějších, slučují se přes heapq.merge, retence skončí u první příliš staré
+  položky a feed vezme začátek výsledku bez dalšího řazení
+- Cache se zapisuje položku po položce do dočasného souboru a atomicky se nahradí
+  a lze ji i číst po položkách (iter_json_array), např. jen začátek pro souhrnný feed
+- Paměť běhu není konstantní: run() drží celou cache (load_cache), nové položky
+  a výsledný seznam, který čtou feed a navazující výstupy. Špička je úměrná cache
+  plus stránkám prvního stahování a omezuje ji retence zdroje (max_items,
+  max_age_days) a pagination.max_pages; proudově se odstraňují jen mezikopie
+"""
+
+import heapq
+import json
+import os
+import re
+
+
+def ensure_newest_first(items):
+    """Seřadí seznam od nejnovějších na místě, pokud seřazený není (starší cache)"""
+    if any(items[i]["date"] < items[i + 1]["date"] for i in range(len(items) - 1)):
+        items.sort(key=lambda x: x["date"], reverse=True)
+    return items
+
+
+def merge_newest_first(*streams):
+    """Sloučí proudy seřazené od nejnovějších do jednoho (bez kopie)"""
+    return heapq.merge(*streams, key=lambda x: x["date"], reverse=True)
+
+
+def unique_by_url(items):
+    """Propustí jen první výskyt každé URL"""
+    seen = set()
+    for item in items:
+        if item["url"] not in seen:
+            seen.add(item["url"])
+            yield item
+
+
+WHITESPACE = re.compile(r"\s*")
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """
+    Čte JSON pole ze souboru proudově po prvcích
+
+    Soubor se čte po blocích, takže při předčasném ukončení (islice)
+    se nenačte celý. Formát zápisu (odsazení) nehraje roli.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        expect = "["
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"Neúplné JSON pole v {path}")
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            char = buffer[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError(f"{path} neobsahuje JSON pole")
+                pos += 1
+                expect = "item"
+            elif char == "]":
+                return
+            elif expect == ",":
+                if char != ",":
+                    raise ValueError(f"Chybí čárka mezi prvky JSON pole v {path}")
+                pos += 1
+                expect = "item"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Prvek pokračuje v dalším bloku
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        raise
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+                yield item
+                pos = end
+                expect = ","
+
+
+def write_json_stream(path, items, exclude=()):
+    """
+    Zapíše položky jako JSON pole proudově (stejný formát jako json.dump s indent=2)
+
+    Args:
+        path: Cílový soubor (nahradí se atomicky až po zápisu všech položek)
+        items: Iterovatelné položky
+        exclude: Klíče, které se do souboru nezapisují (např. date_obj)
+
+    Returns:
+        Počet zapsaných položek
+    """
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    count = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for item in items:
+                if exclude:
+                    item = {key: value for key, value in item.items() if key not in exclude}
+                encoded = json.dumps(item, ensure_ascii=False, indent=2)
+                f.write("[\n  " if count == 0 else ",\n  ")
+                f.write(encoded.replace("\n", "\n  "))
+                count += 1
+            f.write("\n]" if count else "[]")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Profilování běhu generátoru (--profile)
+- Celý běh zdroje běží pod cProfile, výsledek se uloží do profiles/<zdroj>-<čas>.pstats
+- tracemalloc sleduje alokace; report profiles/<zdroj>-<čas>.txt je rozdělený podle fází:
+  stahování, parsování (BeautifulSoup), extrakce, sloučení, serializace feedu (feedgen), zápis logu
+- Kolem každého volání fáze se vezme snímek tracemalloc a rozdíl (compare_to) se sčítá
+  po řádcích; report ukazuje největší přírůstky pod názvem fáze. Snímky se berou mimo
+  měřený čas fáze (v .pstats se ale projeví)
+- Fáze se měří obalením metod instance generátoru (a log_run jeho loggeru) jen po
+  dobu profilovaného běhu; třídy ani jiné instance se nemění
+- Navazující výstupy (output_sinks.py) běží ve vláknech, na které run() nečeká -
+  profilované okno se zavře až po nich, takže jejich alokace jsou v reportu
+  (cProfile ale měří jen vlákno běhu)
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import threading
+import tracemalloc
+from datetime import datetime
+
+
+PROFILE_DIR = "profiles"
+
+# Metoda generátoru -> fáze
+PHASE_METHODS = {
+    "fetch_raw": "stahování",
+    "parse_html": "parsování (BeautifulSoup)",
+    "extract_items_from_page": "extrakce",
+    "merge_items": "sloučení",
+    "generate_rss": "serializace feedu (feedgen)",
+}
+LOG_PHASE = "zápis logu"
+OUTPUTS_PHASE = "navazující výstupy (čekání)"
+
+
+def _snapshot():
+    """Snímek alokací bez režie samotného měření"""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+def top_allocations(top):
+    """Řádky s nejvíce živými alokacemi (jeden snímek, např. na konci běhu)"""
+    return [
+        (str(stat.traceback[0]), stat.size)
+        for stat in _snapshot().statistics("lineno")[:top]
+    ]
+
+
+class PhaseProfiler:
+    """Čas a alokace podle fází běhu"""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.phases = {}
+        # Fáze -> {řádek: součet přírůstků paměti} z rozdílů snímků kolem volání
+        self.phase_lines = {}
+        # Největší alokace po řádcích (snímek na konci běhu, viz profiled_run)
+        self.lines = []
+        self._lock = threading.Lock()
+
+    def _stats(self, name):
+        return self.phases.setdefault(name, {"calls": 0, "seconds": 0.0, "allocated": 0})
+
+    def wrap(self, name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            before = _snapshot() if tracemalloc.is_tracing() else None
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                # Rozdíl je přibližný, pokud souběžně alokují jiná vlákna
+                diff = _snapshot().compare_to(before, "lineno") if before is not None else []
+                with self._lock:
+                    stats = self._stats(name)
+                    stats["calls"] += 1
+                    stats["seconds"] += seconds
+                    stats["allocated"] += max(sum(stat.size_diff for stat in diff), 0)
+                    lines = self.phase_lines.setdefault(name, {})
+                    for stat in diff:
+                        if stat.size_diff:
+                            location = str(stat.traceback[0])
+                            lines[location] = lines.get(location, 0) + stat.size_diff
+        return wrapper
+
+    def top_lines(self, name):
+        """Řádky s největším přírůstkem paměti ve fázi: [(řádek, bajty), ...]"""
+        lines = self.phase_lines.get(name, {})
+        grown = sorted(((size, location) for location, size in lines.items() if size > 0), reverse=True)
+        return [(location, size) for size, location in grown[:self.top]]
+
+    def instrument(self, generator):
+        """
+        Obalí metody generátoru a zápis logu měřením fází
+
+        Returns:
+            Funkce, která obalení zruší
+        """
+        wrapped = []
+        for method, phase in PHASE_METHODS.items():
+            if hasattr(generator, method):
+                setattr(generator, method, self.wrap(phase, getattr(generator, method)))
+                wrapped.append(method)
+
+        # Zápis logu měříme na instanci loggeru, kterou si běh vytvoří
+        make_logger = generator.make_logger
+
+        def profiled_logger():
+            logger = make_logger()
+            logger.log_run = self.wrap(LOG_PHASE, logger.log_run)
+            return logger
+
+        generator.make_logger = profiled_logger
+        wrapped.append("make_logger")
+
+        def restore():
+            for method in wrapped:
+                delattr(generator, method)
+
+        return restore
+
+    def report(self):
+        lines = ["Fáze                              volání   čas [s]   přírůstek paměti [KiB]"]
+        for name, stats in sorted(self.phases.items(), key=lambda x: -x[1]["seconds"]):
+            lines.append(
+                f"{name:<34}{stats['calls']:>6}{stats['seconds']:>10.3f}{stats['allocated'] / 1024:>25.1f}"
+            )
+        for name, _ in sorted(self.phases.items(), key=lambda x: -x[1]["seconds"]):
+            top = self.top_lines(name)
+            if not top:
+                continue
+            lines.append("")
+            lines.append(f"Největší přírůstky paměti - {name}:")
+            for location, size in top:
+                lines.append(f"  {size / 1024:>10.1f} KiB  {location}")
+        if self.lines:
+            lines.append("")
+            lines.append("Největší alokace (živé na konci běhu):")
+            for location, size in self.lines[:self.top]:
+                lines.append(f"  {size / 1024:>10.1f} KiB  {location}")
+        return "\n".join(lines)
+
+
+def profiled_run(generator, profile_dir=PROFILE_DIR, run=None, top=25):
+    """
+    Spustí běh generátoru pod cProfile a tracemalloc a uloží výsledky
+
+    Args:
+        generator: Profilovaný generátor (podle source_id se pojmenují soubory)
+        profile_dir: Adresář pro .pstats a reporty
+        run: Funkce spouštějící běh (výchozí generator.run), např. guarded_run
+
+    Returns:
+        Návratová hodnota běhu
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(profile_dir, f"{generator.source_id}-{stamp}")
+
+    phases = PhaseProfiler()
+    restore = phases.instrument(generator)
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        profiler.enable()
+        try:
+            return (run or generator.run)()
+        finally:
+            # Výstupy běhu musí doběhnout uvnitř okna (tracemalloc i čas čekání)
+            phases.wrap(OUTPUTS_PHASE, generator.wait_for_outputs)()
+            profiler.disable()
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        phases.lines = top_allocations(phases.top)
+        tracemalloc.stop()
+        restore()
+
+        profiler.dump_stats(f"{base}.pstats")
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(f"Profil běhu {generator.source_name} ({stamp})\n")
+            f.write(f"Špička alokované paměti: {peak / 1024 / 1024:.1f} MiB\n")
+            if getattr(generator, "workers", None) or getattr(generator, "executor", None):
+                f.write("Pozn.: parsování v procesovém poolu se v profilu neobjeví.\n")
+            f.write("\n" + phases.report() + "\n\n")
+            f.write(stream.getvalue())
+        print(f"Profil uložen: {base}.pstats, {base}.txt")
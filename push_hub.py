@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Push oznámení o změně feedů (místo slepého dotazování čteček)
+- PushHub: lokální hub ve stylu WebSub (odběr s ověřením záměru, publikace, doručení POSTem)
+- EventBroker: události pro Server-Sent Events (/events) a long-poll (/poll) v server.py
+- HubNotifier: callback generátorů, který po běhu s novými nebo upravenými položkami pošle hubu ping
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from urllib.parse import urlencode, urlsplit
+
+
+SUBSCRIPTIONS_FILE = "websub_subscriptions.json"
+DEFAULT_LEASE_SECONDS = 10 * 24 * 3600
+MAX_LEASE_SECONDS = 30 * 24 * 3600
+
+
+class EventBroker:
+    """Posledních N událostí s pořadovými čísly; čekající klienti se probudí při nové události"""
+
+    def __init__(self, max_events=100):
+        self._events = deque(maxlen=max_events)
+        self._last_id = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self):
+        with self._condition:
+            return self._last_id
+
+    def publish(self, topic):
+        with self._condition:
+            self._last_id += 1
+            self._events.append({"id": self._last_id, "topic": topic, "time": time.time()})
+            self._condition.notify_all()
+            return self._last_id
+
+    def wait(self, since, timeout):
+        """Vrátí události s id > since; pokud žádné nejsou, čeká nejvýše timeout sekund"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id > since, timeout=timeout)
+            return [event for event in self._events if event["id"] > since]
+
+
+class PushHub:
+    """
+    Lokální hub ve stylu WebSub
+
+    Odběratel pošle POST hub.mode=subscribe, hub.topic, hub.callback (volitelně
+    hub.lease_seconds a hub.secret). Hub ověří záměr požadavkem GET na callback
+    s hub.challenge a odběr uloží. Generátor pak pošle hub.mode=publish a hub.url;
+    hub přečte feed z disku a doručí ho všem odběratelům POSTem.
+    """
+
+    def __init__(self, feed_dir, hub_url, state_file=None, broker=None, timeout=10):
+        self.feed_dir = os.path.abspath(feed_dir)
+        self.hub_url = hub_url
+        self.state_file = state_file or os.path.join(self.feed_dir, SUBSCRIPTIONS_FILE)
+        self.broker = broker if broker is not None else EventBroker()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._subscriptions = None
+
+    def _load(self):
+        if self._subscriptions is None:
+            self._subscriptions = {}
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self._subscriptions = json.load(f)
+        return self._subscriptions
+
+    def _save(self):
+        tmp_path = f"{self.state_file}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._subscriptions, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def subscribers(self, topic):
+        """Platné odběry tématu: {callback: {"expires": ..., "secret": ...}}"""
+        now = time.time()
+        with self._lock:
+            return {
+                callback: sub
+                for callback, sub in self._load().get(topic, {}).items()
+                if sub["expires"] > now
+            }
+
+    def topic_path(self, topic):
+        """Soubor feedu pro téma (jen .xml soubory v adresáři feedů), jinak None"""
+        path = os.path.normpath(os.path.join(self.feed_dir, urlsplit(topic).path.lstrip("/")))
+        if not path.startswith(self.feed_dir + os.sep) or not path.endswith(".xml"):
+            return None
+        return path
+
+    def handle_request(self, form, background=True):
+        """
+        Zpracuje POST na hub
+
+        Args:
+            form: Parametry formuláře (hodnoty jako u parse_qs, tj. seznamy)
+            background: Ověření záměru a doručení proběhne ve vlákně
+
+        Returns:
+            (HTTP status, zpráva)
+        """
+        def param(name, default=None):
+            return form.get(name, [default])[0]
+
+        mode = param("hub.mode")
+        if mode == "publish":
+            topic = param("hub.url") or param("hub.topic")
+            if not topic or self.topic_path(topic) is None:
+                return 400, "Neznámé téma"
+            self._run(self.publish, (topic,), background)
+            return 202, "Publikace přijata"
+
+        if mode in ("subscribe", "unsubscribe"):
+            topic = param("hub.topic")
+            callback = param("hub.callback")
+            if not topic or not callback or self.topic_path(topic) is None:
+                return 400, "Chybí hub.topic nebo hub.callback"
+            if urlsplit(callback).scheme not in ("http", "https"):
+                return 400, "Neplatný hub.callback"
+            try:
+                lease = int(param("hub.lease_seconds", DEFAULT_LEASE_SECONDS))
+            except ValueError:
+                return 400, "Neplatný hub.lease_seconds"
+            lease = max(1, min(lease, MAX_LEASE_SECONDS))
+            args = (mode, topic, callback, lease, param("hub.secret"))
+            self._run(self.verify_and_store, args, background)
+            return 202, "Požadavek přijat, probíhá ověření"
+
+        return 400, "Neplatný hub.mode"
+
+    @staticmethod
+    def _run(func, args, background):
+        if background:
+            threading.Thread(target=func, args=args, daemon=True).start()
+        else:
+            func(*args)
+
+    def verify_and_store(self, mode, topic, callback, lease, secret=None):
+        """Ověří záměr odběratele (GET s hub.challenge) a uloží nebo zruší odběr"""
+        import urllib.request
+
+        challenge = secrets.token_urlsafe(16)
+        query = urlencode({
+            "hub.mode": mode,
+            "hub.topic": topic,
+            "hub.challenge": challenge,
+            "hub.lease_seconds": lease,
+        })
+        separator = "&" if urlsplit(callback).query else "?"
+        try:
+            with urllib.request.urlopen(f"{callback}{separator}{query}", timeout=self.timeout) as response:
+                verified = 200 <= response.status < 300 and response.read().decode("utf-8").strip() == challenge
+        except OSError as e:
+            print(f"Ověření odběru {callback} selhalo: {e}")
+            return False
+        if not verified:
+            print(f"Odběratel {callback} nepotvrdil záměr ({mode}).")
+            return False
+
+        with self._lock:
+            topic_subs = self._load().setdefault(topic, {})
+            if mode == "subscribe":
+                topic_subs[callback] = {"expires": time.time() + lease, "secret": secret}
+            else:
+                topic_subs.pop(callback, None)
+            self._save()
+        return True
+
+    def publish(self, topic):
+        """
+        Oznámí změnu tématu: událost pro SSE/long-poll a doručení obsahu odběratelům
+
+        Returns:
+            Počet úspěšně doručených odběratelů
+        """
+        import urllib.request
+
+        self.broker.publish(topic)
+        path = self.topic_path(topic)
+        subscribers = self.subscribers(topic)
+        if not subscribers or path is None or not os.path.exists(path):
+            return 0
+
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        delivered = 0
+        for callback, sub in subscribers.items():
+            headers = {
+                "Content-Type": "application/rss+xml; charset=utf-8",
+                "Link": f'<{self.hub_url}>; rel="hub", <{topic}>; rel="self"',
+            }
+            if sub.get("secret"):
+                digest = hmac.new(sub["secret"].encode("utf-8"), content, hashlib.sha256).hexdigest()
+                headers["X-Hub-Signature"] = f"sha256={digest}"
+            request = urllib.request.Request(callback, data=content, headers=headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if 200 <= response.status < 300:
+                        delivered += 1
+            except OSError as e:
+                print(f"Doručení {topic} odběrateli {callback} selhalo: {e}")
+        return delivered
+
+
+class HubNotifier:
+    """Callback pro after_run: po běhu s novými nebo upravenými položkami pošle hubu ping"""
+
+    def __init__(self, hub_url, feed_base_url=None, extra_files=("all_feed.xml",), timeout=10):
+        self.hub_url = hub_url
+        # Bez zadání se feedy hledají v kořeni serveru hubu (server.py)
+        if feed_base_url is None:
+            url = urlsplit(hub_url)
+            feed_base_url = f"{url.scheme}://{url.netloc}/"
+        self.feed_base_url = feed_base_url.rstrip("/") + "/"
+        self.extra_files = tuple(extra_files)
+        self.timeout = timeout
+
+    def topics(self, generator):
+        files = (os.path.basename(generator.rss_file),) + self.extra_files
+        return [self.feed_base_url + name for name in files]
+
+    def ping(self, topic):
+        import urllib.request
+
+        data = urlencode({"hub.mode": "publish", "hub.url": topic}).encode("ascii")
+        with urllib.request.urlopen(self.hub_url, data=data, timeout=self.timeout) as response:
+            return response.status
+
+    def on_source_run(self, generator, items):
+        if not generator.changed_items:
+            return
+        for topic in self.topics(generator):
+            self.ping(topic)
+        print(f"Hub {self.hub_url} informován o změně {generator.source_id}.")
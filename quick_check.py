@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Rychlá kontrola "nic se nezměnilo" před spuštěním celého generátoru
+- Podmíněný požadavek na první stránku (ETag / Last-Modified) přes transport generátoru,
+  takže funguje i se záznamem a přehráváním (--record / --replay)
+- Porovnání hashe obsahu první stránky s posledním úspěšným během
+- Nepotřebuje BeautifulSoup ani feedgen, takže častý cron je levný
+"""
+
+import hashlib
+import json
+import os
+
+from file_locks import file_lock
+from http_transport import TransportError
+
+
+VALIDATORS_FILE = "http_validators.json"
+
+
+class HTTPValidators:
+    """Uložené validátory první stránky zdrojů (URL -> ETag, Last-Modified, hash)"""
+
+    def __init__(self, path=VALIDATORS_FILE):
+        self.path = path
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            self._data = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+        return self._data
+
+    def get(self, url):
+        return self._load().get(url, {})
+
+    def update(self, url, etag, last_modified, content):
+        """Zapamatuje si validátory a hash obsahu stránky"""
+        # Soubor sdílí všechny zdroje - zapisujeme do aktuální verze pod zámkem
+        with file_lock(self.path):
+            self._data = None
+            self._load()[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "sha256": hashlib.sha256(content).hexdigest(),
+            }
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def conditional_get(transport, url, validators, timeout=10):
+    """
+    Podmíněný GET přes transport generátoru (http_transport.py)
+
+    Returns:
+        http_transport.Response; při 304 bez obsahu
+    """
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return transport.get(url, timeout=timeout, headers=headers)
+
+
+def is_unchanged(generator, cached_items, validators_store):
+    """
+    Rozhodne, zda se zdroj od posledního úspěšného běhu nezměnil
+
+    Nezměněný je, pokud první stránka vrátí 304 nebo stejný obsah a žádná
+    položka v cache nevypadne z retence. Jinak stažená data první stránky
+    předá generátoru (generator.prefetched), aby se nestahovala znovu.
+    """
+    if not cached_items:
+        return False
+
+    # Pokud je potřeba prořezat staré položky, musí proběhnout celý běh
+    if len(generator.apply_retention(cached_items)) != len(cached_items):
+        return False
+
+    url = generator.page_url(1)
+    validators = validators_store.get(url)
+    try:
+        response = conditional_get(generator.transport, url, validators)
+    except TransportError as e:
+        print(f"Rychlá kontrola selhala ({e}), pokračuji plným během.")
+        return False
+
+    if response.status == 304:
+        print("Rychlá kontrola: první stránka se nezměnila (304).")
+        return True
+
+    if validators.get("sha256") == hashlib.sha256(response.content).hexdigest():
+        print("Rychlá kontrola: obsah první stránky se nezměnil.")
+        return True
+
+    generator.prefetched[1] = (response.content, response.encoding, response.etag, response.last_modified)
+    return False
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Offline přegenerování cache a RSS z uložených snímků stránek
+- Znovu spustí extrakci nad snímky bez přístupu na síť
+- Po opravě selektorů stačí spustit replay místo nového stahování
+- Generátory mají stejné zapojení jako běh (archiv feedu, navazující výstupy, run_setup.py)
+  a cache se zapisuje pod zámkem zdroje (file_locks.commit_cache)
+"""
+
+import argparse
+from datetime import datetime
+from file_locks import commit_cache, file_version
+from first_seen import iso_date
+from run_setup import generator_options
+from snapshot_store import SnapshotStore
+from source_engine import SourceRSSGenerator, load_source_configs
+
+
+def available_generators():
+    """Vrátí generátory podle ID zdroje (všechny konfigurace v sources/)"""
+    # Souhrnný feed a přehled zahrnují jen povolené zdroje (seznam se naplní níže)
+    enabled = []
+    options = generator_options(enabled)
+    generators = {}
+    for config in load_source_configs():
+        generator = SourceRSSGenerator(config, **options)
+        if config.get("enabled", True):
+            enabled.append(generator)
+        generators[config["id"]] = generator
+    return generators
+
+
+def replay_items(generator, store, run_ids=None):
+    """
+    Extrahuje položky ze snímků běhů zdroje (od nejstaršího po nejnovější)
+
+    Novější běh přepíše pole položky se stejnou URL, ale datum zůstává
+    z prvního výskytu (u Kosmasu je datum odvozené z času stažení). Zdroj
+    s indexem prvního výskytu (first_seen) převezme data z indexu, pokud
+    v něm položka je - stejná data jako v živém běhu.
+    """
+    if run_ids is None:
+        run_ids = store.list_runs(generator.source_id)
+
+    items_by_url = {}
+    pages_count = 0
+
+    for run_id in run_ids:
+        manifest = store.load_manifest(generator.source_id, run_id)
+        fetched_at = datetime.fromisoformat(manifest["started_at"])
+
+        for page, content in store.iter_pages(generator.source_id, run_id):
+            pages_count += 1
+            items = generator.extract_snapshot(
+                content, page["encoding"], page["page_num"], fetched_at
+            )
+            for item in items:
+                previous = items_by_url.get(item["url"])
+                if previous is not None:
+                    item["date"] = previous["date"]
+                items_by_url[item["url"]] = item
+
+    if generator.first_seen is not None:
+        for url, item in items_by_url.items():
+            known = generator.first_seen.get(url)
+            if known is not None:
+                item["date"] = iso_date(known[0])
+
+    print(f"Zpracováno {pages_count} snímků z {len(run_ids)} běhů.")
+    return sorted(items_by_url.values(), key=lambda x: x["date"], reverse=True)
+
+
+def replay_source(generator, store, run_ids=None, dry_run=False):
+    """
+    Přegeneruje cache a RSS zdroje ze snímků
+
+    Cache se nahradí položkami ze snímků stejně jako při běhu: sloučení,
+    retence, zápis cache a feedu (u archivovaného zdroje jen aktuální okno)
+    pod zámkem zdroje, pak navazující výstupy generátoru.
+    """
+    print(f"=== Replay: {generator.source_id} ===\n")
+
+    if run_ids is None and not store.list_runs(generator.source_id):
+        print("Žádné snímky pro tento zdroj, přeskakuji.")
+        return []
+
+    items = replay_items(generator, store, run_ids)
+
+    if dry_run:
+        items = generator.apply_retention(items)
+        print(f"Položek po aplikaci retence: {len(items)}")
+        for item in items[:10]:
+            print(f"  - {item['title']}")
+        return items
+
+    # Prázdná výchozí cache: položky ze snímků ji nahradí (změnu jiným procesem sloučí commit_cache)
+    kept, _, _ = commit_cache(generator, [], file_version(generator.cache_file), items, [], items)
+    print(f"Položek po aplikaci retence: {len(kept)}")
+    generator.notify_after_run(kept)
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Přegeneruje cache a RSS z uložených snímků stránek"
+    )
+    parser.add_argument(
+        "source",
+        nargs="?",
+        default="all",
+        help="ID zdroje k přegenerování (výchozí: all)",
+    )
+    parser.add_argument("--snapshots", default="snapshots", help="Adresář se snímky")
+    parser.add_argument(
+        "--run",
+        action="append",
+        dest="runs",
+        help="Použije jen zadané běhy (lze opakovat); výchozí jsou všechny",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Jen vypíše výsledek extrakce, nepřepisuje cache ani RSS",
+    )
+    args = parser.parse_args()
+
+    generators = available_generators()
+    if args.source != "all" and args.source not in generators:
+        parser.error(f"Neznámý zdroj: {args.source} (dostupné: {', '.join(sorted(generators))})")
+
+    store = SnapshotStore(args.snapshots)
+    sources = sorted(generators) if args.source == "all" else [args.source]
+
+    for source in sources:
+        replay_source(generators[source], store, run_ids=args.runs, dry_run=args.dry_run)
+        print()
+
+
+if __name__ == "__main__":
+    main()
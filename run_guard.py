@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Časové limity a jističe (circuit breakers) pro běh zdrojů
+- Deadline: časový rozpočet zdroje i celého běhu; hlídá se před stažením každé stránky
+  (fetch_raw) a timeout HTTP požadavků se zkrátí na zbývající čas
+- Timeout requests platí pro navázání spojení a pro každé čtení zvlášť, ne pro celý
+  požadavek: pomalu odkapávající odpověď může rozpočet překročit, další stránka se už
+  ale nestáhne
+- Po vypršení rozpočtu se už nestahuje, zdroj ale dokončí běh z cache a feed publikuje
+- CircuitBreakers: po opakovaných selháních se zdroj na dobu vychladnutí přeskakuje; stav je v JSON
+"""
+
+import json
+import os
+import time
+
+from file_locks import file_lock
+from log_utils import RSSLogger
+
+
+BREAKERS_FILE = "circuit_breakers.json"
+
+
+class Deadline:
+    """Časový limit měřený monotónními hodinami"""
+
+    def __init__(self, seconds, parent=None):
+        self.expires_at = time.monotonic() + seconds
+        # Nadřazený limit (celý běh) - platí dřívější z obou
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, default):
+        """
+        Timeout požadavku omezený zbývajícím časem
+
+        Pro requests je to limit jednoho čtení (a navázání spojení), ne celého
+        požadavku; celkový rozpočet se proto kontroluje i mezi stránkami.
+        """
+        return min(default, self.remaining())
+
+
+class CircuitBreakers:
+    """
+    Jističe zdrojů
+
+    Po failure_threshold selháních za sebou se jistič otevře a zdroj se
+    cooldown_seconds přeskakuje. Po vychladnutí se zkusí jeden běh: úspěch
+    jistič zavře, další selhání ho otevře znovu na dvojnásobnou dobu
+    (nejvýše max_cooldown_seconds).
+    """
+
+    def __init__(
+        self,
+        path=BREAKERS_FILE,
+        failure_threshold=3,
+        cooldown_seconds=3600,
+        max_cooldown_seconds=24 * 3600,
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._state = None
+
+    def _load(self):
+        if self._state is None:
+            self._state = {}
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+        return self._state
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source_id):
+        return self._load().get(source_id, {"failures": 0, "open_until": 0, "cooldown": 0})
+
+    def allow(self, source_id, now=None):
+        """Smí zdroj běžet? (zavřený jistič nebo uplynulé vychladnutí)"""
+        return self.get(source_id)["open_until"] <= (now or time.time())
+
+    def record_success(self, source_id):
+        # Soubor zapisujeme vždy, aby existoval i bez selhání (workflow ho commituje)
+        with file_lock(self.path):
+            self._state = None
+            self._load().pop(source_id, None)
+            self._save()
+
+    def record_failure(self, source_id, now=None):
+        now = now or time.time()
+        # Zdroje mohou běžet v různých procesech - měníme aktuální verzi souboru
+        with file_lock(self.path):
+            self._state = None
+            state = dict(self.get(source_id))
+            state["failures"] += 1
+            if state["failures"] >= self.failure_threshold:
+                # Každé další otevření jističe zdvojnásobí dobu vychladnutí
+                cooldown = min(max(self.cooldown_seconds, state["cooldown"] * 2), self.max_cooldown_seconds)
+                state["cooldown"] = cooldown
+                state["open_until"] = now + cooldown
+            self._load()[source_id] = state
+            self._save()
+        return state
+
+
+def start_guarded(generator, breakers=None, source_budget=None, total_deadline=None):
+    """
+    Připraví běh zdroje: ověří jistič, nastaví časový rozpočet a vynuluje počítadla
+
+    Returns:
+        False, pokud se má zdroj přeskočit (jistič je otevřený)
+    """
+    source_id = generator.source_id
+
+    if breakers is not None and not breakers.allow(source_id):
+        until = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(breakers.get(source_id)["open_until"]))
+        print(f"⏸ Zdroj {generator.source_name} přeskočen - jistič otevřen do {until}.")
+        RSSLogger().log_run(
+            source_name=generator.source_name,
+            new_items_count=0,
+            note=f"Přeskočeno: jistič otevřen do {until}",
+            skipped=True,
+        )
+        return False
+
+    if source_budget is not None:
+        generator.deadline = Deadline(source_budget, parent=total_deadline)
+    else:
+        generator.deadline = total_deadline
+    generator.fetch_failures = 0
+    generator.pages_fetched = 0
+    return True
+
+
+def run_failed(generator):
+    """Selhání = žádná stránka se nestáhla a aspoň jeden požadavek skončil chybou"""
+    return generator.fetch_failures > 0 and generator.pages_fetched == 0
+
+
+def finish_guarded(generator, breakers, failed):
+    """
+    Zaznamená výsledek běhu do jističe
+
+    Returns:
+        "ok" nebo "failed"
+    """
+    source_id = generator.source_id
+    if breakers is not None:
+        if failed:
+            state = breakers.record_failure(source_id)
+            print(f"Jistič {source_id}: {state['failures']} selhání za sebou.")
+        elif generator.pages_fetched > 0:
+            breakers.record_success(source_id)
+    return "failed" if failed else "ok"
+
+
+def guarded_run(generator, breakers=None, source_budget=None, total_deadline=None):
+    """
+    Spustí generátor s časovým rozpočtem a jističem
+
+    Chyba zdroje se zaznamená do jističe a nepřeruší ostatní zdroje.
+
+    Returns:
+        "ok", "failed" nebo "skipped"
+    """
+    if not start_guarded(generator, breakers, source_budget, total_deadline):
+        return "skipped"
+
+    try:
+        generator.run()
+    except Exception as e:
+        print(f"❌ Zdroj {generator.source_name} selhal: {e}")
+        failed = True
+    else:
+        failed = run_failed(generator)
+    finally:
+        generator.deadline = None
+
+    return finish_guarded(generator, breakers, failed)
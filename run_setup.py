@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Zapojení generátorů pro spuštění z CLI (rss_generator.py, kosmas_generator.py,
+source_engine.py, generate_all.py, replay_snapshots.py)
+- Společné volby CLI (pool, snímky, rychlá kontrola, sondování, hub, profilování, transport)
+- Navazující výstupy po běhu zdroje a archiv feedu - source_engine.py je nezná,
+  generátor je dostane jako after_run a archive
+- Spuštění generátorů (postupně, asynchronně nebo s profilováním)
+"""
+
+import sys
+
+from aggregate_feed import AggregatedFeed, default_generators
+from facet_feeds import FacetFeeds
+from feed_archive import FeedArchive
+from http_transport import add_async_arguments, add_transport_arguments, transport_from_args
+from landing_page import LandingPage
+from output_sinks import ObjectStoreSink, after_outputs, drain
+from push_hub import HubNotifier
+from search_index import SearchIndex
+from snapshot_store import SnapshotStore
+
+
+def add_run_arguments(parser):
+    """Společné volby CLI generátorů (pool, snímky, rychlá kontrola, hub, profilování, transport)"""
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Počet procesů pro parsování stránek při prvním stahování (0 = počet jader)")
+    parser.add_argument("--snapshots", nargs="?", const="snapshots", default=None,
+                        help="Ukládat snímky stažených stránek do adresáře (výchozí snapshots)")
+    parser.add_argument("--snapshot-keep", type=int, default=30,
+                        help="Počet posledních běhů zdroje, jejichž snímky se drží")
+    parser.add_argument("--quick-check", action="store_true",
+                        help="Před plným během ověřit podmíněným požadavkem, zda se zdroj změnil")
+    parser.add_argument("--backfill", choices=["sequential", "probe"], default="sequential",
+                        help="Strategie prvního stahování (probe = sondování dat stránek, jen zdroje s datem)")
+    parser.add_argument("--backfill-pages", type=int, default=None,
+                        help="Nejvýše stránek při sondování (výchozí max_pages z konfigurace zdroje)")
+    parser.add_argument("--hub", default=None,
+                        help="URL hubu pro push oznámení o změně feedu (např. http://localhost:8000/hub)")
+    parser.add_argument("--object-store", default=None,
+                        help="Adresář objektového úložiště, kam se po běhu zapíší položky a feed zdroje")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profilovat běh (cProfile + tracemalloc), výsledky do --profile-dir")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="Adresář pro .pstats soubory a reporty profilování")
+    add_transport_arguments(parser)
+    add_async_arguments(parser)
+
+
+def output_sinks(sources, hub=None, object_store=None):
+    """
+    Navazující výstupy po běhu zdroje (after_run)
+
+    Args:
+        sources: Generátory všech zdrojů pro souhrnný feed a přehled
+        hub: URL hubu pro push oznámení (None = bez oznámení)
+        object_store: Adresář objektového úložiště (None = bez něj)
+    """
+    # Po každém zdroji přegenerujeme i souhrnný feed, dílčí feedy, index a přehled
+    sinks = [
+        AggregatedFeed(sources).on_source_run,
+        FacetFeeds().on_source_run,
+        SearchIndex().on_source_run,
+        LandingPage(sources).on_source_run,
+    ]
+    if hub:
+        # Hub oznamuje i souhrnný feed - ping až po zápisu ostatních výstupů
+        sinks.append(after_outputs(HubNotifier(hub).on_source_run))
+    if object_store:
+        sinks.append(ObjectStoreSink(object_store).on_source_run)
+    return sinks
+
+
+def generator_options(sources=None, hub=None, object_store=None, **options):
+    """
+    Parametry generátoru s navazujícími výstupy a archivem feedu
+
+    Args:
+        sources: Generátory pro souhrnný feed a přehled (výchozí všechny povolené
+            zdroje); lze předat i seznam, který se naplní až později
+        options: Další parametry SourceRSSGenerator
+    """
+    if sources is None:
+        sources = default_generators()
+    return dict(
+        options,
+        after_run=output_sinks(sources, hub, object_store),
+        # Archiv se aktualizuje už se zápisem feedu zdroje (feed_archive.py)
+        archive=FeedArchive(),
+    )
+
+
+def run_options(args, sources=None, executor=None):
+    """
+    Parametry generátoru z voleb add_run_arguments (včetně navazujících výstupů)
+
+    Args:
+        sources: viz generator_options
+        executor: Sdílený procesový pool více zdrojů (místo poolu podle --workers)
+    """
+    return generator_options(
+        sources,
+        hub=args.hub,
+        object_store=args.object_store,
+        workers=None if executor is not None else args.workers,
+        executor=executor,
+        snapshot_store=SnapshotStore(args.snapshots, args.snapshot_keep) if args.snapshots else None,
+        quick_check=args.quick_check,
+        backfill=args.backfill,
+        backfill_pages=args.backfill_pages,
+        transport=transport_from_args(args),
+    )
+
+
+def run_generators(generators, args):
+    """
+    Spustí generátory podle voleb CLI (profilování, asynchronně, nebo postupně)
+
+    Chyba zdroje ukončí proces s nenulovým kódem (v asynchronním režimu
+    až po doběhnutí ostatních zdrojů).
+    """
+    failed = []
+    try:
+        if args.profile:
+            # cProfile a tracemalloc načteme jen při profilování
+            from profiling import profiled_run
+
+            for generator in generators:
+                profiled_run(generator, args.profile_dir)
+        elif args.use_async:
+            # asyncio načteme jen v asynchronním režimu; zdroje běží souběžně na jedné smyčce
+            from async_core import run_all
+
+            results = run_all(generators, max_connections=args.max_connections)
+            failed = [name for name, result in results.items() if result == "failed"]
+        else:
+            for generator in generators:
+                generator.run()
+    finally:
+        # Počkáme na navazující výstupy (běží ve vlastních vláknech)
+        drain()
+    if failed:
+        sys.exit(f"Selhané zdroje: {', '.join(failed)}")
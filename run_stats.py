@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Průběžné souhrnné statistiky běhů podle zdroje
+- Každý zápis do logu aktualizuje malý stavový soubor v konstantním čase (bez čtení logu)
+- Celkové počty běhů, selhání, nových položek a stažených stránek
+- Klouzavé hodnoty s exponenciálním zapomínáním: podíl selhání, nové položky
+  a stránky na běh, p50/p95 doby běhu z logaritmického histogramu
+- Ke stavu se vedle index.html generuje statický přehled stats.html
+"""
+
+import html
+import json
+import math
+import os
+from datetime import datetime, timezone
+
+from file_locks import file_lock
+
+
+STATS_FILE = "run_stats.json"
+HTML_FILE = "stats.html"
+
+# Váha starších běhů klesá s každým dalším během (poločas zhruba 69 běhů)
+DECAY = 0.99
+
+# Histogram dob běhu: koše po čtvrtinách binárního řádu od 10 ms (relativní chyba kvantilu do ~9 %)
+BUCKET_BASE = 0.01
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 80
+
+
+def bucket_index(seconds):
+    """Index koše histogramu pro dobu běhu"""
+    if seconds <= BUCKET_BASE:
+        return 0
+    index = int(math.log2(seconds / BUCKET_BASE) * BUCKETS_PER_DOUBLING) + 1
+    return min(index, BUCKET_COUNT - 1)
+
+
+def bucket_value(index):
+    """Reprezentativní doba koše (geometrický střed jeho hranic)"""
+    if index == 0:
+        return BUCKET_BASE
+    return BUCKET_BASE * 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+
+
+def quantile(histogram, q):
+    """Kvantil z (váženého) histogramu; None, pokud je prázdný"""
+    total = sum(histogram)
+    if total <= 0:
+        return None
+    threshold = q * total
+    running = 0.0
+    for index, weight in enumerate(histogram):
+        running += weight
+        if running >= threshold and weight > 0:
+            return bucket_value(index)
+    return bucket_value(len(histogram) - 1)
+
+
+def new_source_stats():
+    return {
+        "runs": 0,
+        "failures": 0,
+        "new_items": 0,
+        "pages": 0,
+        "last_run": None,
+        "last_error": None,
+        # Klouzavé (exponenciálně vážené) součty
+        "weight": 0.0,
+        "weighted_failures": 0.0,
+        "weighted_new_items": 0.0,
+        "weighted_pages": 0.0,
+        "durations": [0.0] * BUCKET_COUNT,
+    }
+
+
+def record(stats, new_items_count=0, error=None, duration_seconds=None, pages_fetched=None, now=None):
+    """Započítá jeden běh do statistik zdroje (na místě, konstantní čas)"""
+    stats["runs"] += 1
+    stats["last_run"] = (now or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+    stats["last_error"] = error
+    if error:
+        stats["failures"] += 1
+    else:
+        stats["new_items"] += new_items_count
+    if pages_fetched:
+        stats["pages"] += pages_fetched
+
+    stats["weight"] = stats["weight"] * DECAY + 1
+    stats["weighted_failures"] = stats["weighted_failures"] * DECAY + (1 if error else 0)
+    stats["weighted_new_items"] = stats["weighted_new_items"] * DECAY + (0 if error else new_items_count)
+    stats["weighted_pages"] = stats["weighted_pages"] * DECAY + (pages_fetched or 0)
+    # Běhy bez změřené doby (např. přeskočené jističem) do histogramu nepatří
+    if duration_seconds is not None:
+        durations = stats["durations"]
+        for index in range(BUCKET_COUNT):
+            durations[index] *= DECAY
+        durations[bucket_index(duration_seconds)] += 1
+    return stats
+
+
+def summarize(stats):
+    """Odvozené hodnoty pro přehled a JSON endpoint"""
+    weight = stats["weight"] or 1.0
+    p50 = quantile(stats["durations"], 0.5)
+    p95 = quantile(stats["durations"], 0.95)
+    return {
+        "runs": stats["runs"],
+        "failures": stats["failures"],
+        "failure_rate": round(stats["weighted_failures"] / weight, 4),
+        "duration_p50": round(p50, 3) if p50 is not None else None,
+        "duration_p95": round(p95, 3) if p95 is not None else None,
+        "new_items_per_run": round(stats["weighted_new_items"] / weight, 2),
+        "pages_per_run": round(stats["weighted_pages"] / weight, 2),
+        "new_items_total": stats["new_items"],
+        "pages_total": stats["pages"],
+        "last_run": stats["last_run"],
+        "last_error": stats["last_error"],
+    }
+
+
+class RunStats:
+    """
+    Stav statistik všech zdrojů v jednom JSON souboru
+
+    Aktualizace probíhá pod zámkem souboru, takže souběžné běhy
+    (viz file_locks.py) se navzájem nepřepíšou.
+    """
+
+    def __init__(self, stats_file=STATS_FILE, html_file=HTML_FILE):
+        self.stats_file = stats_file
+        self.html_file = html_file
+
+    def load(self):
+        """Načte stav: název zdroje -> statistiky"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("sources", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def summary(self):
+        """Odvozené statistiky všech zdrojů"""
+        return {name: summarize(stats) for name, stats in sorted(self.load().items())}
+
+    def update(self, source_name, new_items_count=0, error=None, duration_seconds=None, pages_fetched=None):
+        """Započítá běh zdroje a přepíše stavový soubor i HTML přehled"""
+        with file_lock(self.stats_file):
+            sources = self.load()
+            stats = sources.setdefault(source_name, new_source_stats())
+            record(stats, new_items_count, error, duration_seconds, pages_fetched)
+            _write_atomic(self.stats_file, json.dumps({"sources": sources}, ensure_ascii=False))
+            if self.html_file:
+                _write_atomic(self.html_file, render_html(
+                    {name: summarize(stats) for name, stats in sorted(sources.items())}
+                ))
+        return stats
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _format_seconds(value):
+    return "–" if value is None else f"{value:.2f} s"
+
+
+def render_html(summary):
+    """Statický přehled statistik (stats.html)"""
+    rows = []
+    for name, stats in summary.items():
+        status = "❌" if stats["last_error"] else "✅"
+        rows.append(
+            "            <tr>"
+            f"<td>{html.escape(name)}</td>"
+            f"<td>{stats['runs']}</td>"
+            f"<td>{stats['failure_rate'] * 100:.1f} %</td>"
+            f"<td>{_format_seconds(stats['duration_p50'])}</td>"
+            f"<td>{_format_seconds(stats['duration_p95'])}</td>"
+            f"<td>{stats['new_items_per_run']:.1f}</td>"
+            f"<td>{stats['pages_per_run']:.1f}</td>"
+            f"<td>{status} {html.escape(stats['last_run'] or '')}</td>"
+            "</tr>"
+        )
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    return f"""<!DOCTYPE html>
+<html lang="cs">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Statistiky běhů RSS generátorů</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; color: #333; padding: 20px; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ padding: 6px 12px; border-bottom: 1px solid #ddd; text-align: right; }}
+        th:first-child, td:first-child {{ text-align: left; }}
+    </style>
+</head>
+<body>
+    <h1>📈 Statistiky běhů</h1>
+    <p>Klouzavé hodnoty (starší běhy mají menší váhu). Data i jako JSON na <code>/stats</code>.</p>
+    <table>
+        <thead>
+            <tr><th>Zdroj</th><th>Běhy</th><th>Selhání</th><th>Doba p50</th><th>Doba p95</th><th>Nové položky / běh</th><th>Stránky / běh</th><th>Poslední běh (UTC)</th></tr>
+        </thead>
+        <tbody>
+{chr(10).join(rows)}
+        </tbody>
+    </table>
+    <p><a href="index.html">Zpět na feedy</a> · Vygenerováno {generated} UTC</p>
+</body>
+</html>
+"""
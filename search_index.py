@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Fulltextový index položek všech zdrojů (SQLite FTS5)
+- Indexuje titulek, popis, autora a kategorii
+- Po každém běhu zdroje se index aktualizuje inkrementálně (nové, změněné, odstraněné položky)
+- Dotazy obsluhuje server.py na /search?q=...&source=...
+"""
+
+import argparse
+import hashlib
+import re
+import sqlite3
+
+
+INDEX_FILE = "search_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    author TEXT NOT NULL,
+    category TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_source_date ON documents (source, date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, description, author, category,
+    content='documents', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, description, author, category)
+    VALUES (new.id, new.title, new.description, new.author, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, description, author, category)
+    VALUES ('delete', old.id, old.title, old.description, old.author, old.category);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, description, author, category)
+    VALUES ('delete', old.id, old.title, old.description, old.author, old.category);
+    INSERT INTO documents_fts (rowid, title, description, author, category)
+    VALUES (new.id, new.title, new.description, new.author, new.category);
+END;
+"""
+
+
+def document_fields(item):
+    """Vrátí indexovaná pole položky (autor může být řetězec nebo seznam autorů)"""
+    authors = item.get("authors")
+    author = ", ".join(authors) if authors else item.get("author", "")
+    return (
+        item["title"],
+        item.get("description", ""),
+        author,
+        item.get("category", ""),
+    )
+
+
+def build_match_query(text):
+    """
+    Převede uživatelský dotaz na bezpečný FTS5 dotaz
+
+    Každé slovo se hledá jako prefix a všechna slova musí být obsažena,
+    takže operátory FTS5 v dotazu nemohou způsobit chybu syntaxe.
+    """
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class SearchIndex:
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            # Spojení používá pruh výstupů (output_sinks.py) - vždy jen jedno vlákno
+            # najednou, ale po nečinnosti jiné než to, které ho otevřelo
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def sync_source(self, source_id, items):
+        """
+        Srovná index zdroje s aktuálními položkami
+
+        Zapisují se jen rozdíly: nové a změněné položky (podle hashe polí)
+        a odstranění položek, které z cache vypadly.
+
+        Returns:
+            (přidáno, změněno, odstraněno)
+        """
+        db = self.connection
+        existing = {
+            row["url"]: (row["id"], row["hash"])
+            for row in db.execute("SELECT id, url, hash FROM documents WHERE source = ?", (source_id,))
+        }
+
+        added = updated = 0
+        current_urls = set()
+        with db:
+            for item in items:
+                fields = document_fields(item)
+                digest = hashlib.sha1(
+                    "\x1f".join((item["date"],) + fields).encode("utf-8")
+                ).hexdigest()
+                url = item["url"]
+                current_urls.add(url)
+
+                if url not in existing:
+                    db.execute(
+                        "INSERT OR REPLACE INTO documents "
+                        "(url, source, date, title, description, author, category, hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (url, source_id, item["date"]) + fields + (digest,),
+                    )
+                    added += 1
+                elif existing[url][1] != digest:
+                    db.execute(
+                        "UPDATE documents SET date = ?, title = ?, description = ?, "
+                        "author = ?, category = ?, hash = ? WHERE id = ?",
+                        (item["date"],) + fields + (digest, existing[url][0]),
+                    )
+                    updated += 1
+
+            removed = [existing[url][0] for url in existing if url not in current_urls]
+            db.executemany("DELETE FROM documents WHERE id = ?", [(i,) for i in removed])
+
+        return added, updated, len(removed)
+
+    def search(self, text, source=None, limit=50):
+        """Vyhledá položky; výsledky jsou seřazené od nejnovějších"""
+        match = build_match_query(text)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT d.url, d.source, d.date, d.title, d.description, d.author, d.category "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        params = [match]
+        if source:
+            sql += " AND d.source = ?"
+            params.append(source)
+        sql += " ORDER BY d.date DESC LIMIT ?"
+        params.append(limit)
+
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def on_source_run(self, generator, items):
+        """Callback pro after_run generátorů"""
+        added, updated, removed = self.sync_source(generator.source_id, items)
+        print(
+            f"Fulltextový index {generator.source_id}: +{added}, ~{updated}, -{removed}."
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fulltextový index položek")
+    parser.add_argument("--index", default=INDEX_FILE, help="Soubor indexu")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="Srovná index s cache všech zdrojů")
+    search_parser = subparsers.add_parser("search", help="Vyhledá položky")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--source", default=None)
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    if args.command == "rebuild":
+        from aggregate_feed import default_generators
+
+        for generator in default_generators():
+            index.on_source_run(generator, generator.load_cache())
+    else:
+        for row in index.search(args.query, source=args.source):
+            print(f"{row['date'][:10]}  [{row['source']}] {row['title']}  {row['url']}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Trvalá množina již viděných URL (i mimo retenci cache)
+- Soubor je seřazené pole 64bitových hashů URL (8 bajtů big-endian na URL)
+- Čte se přes mmap a hledá binárním půlením, takže se do paměti nenačítá celý
+- Nové URL se drží v paměti a při uložení se se souborem sloučí: místo každého
+  nového hashe se najde binárním půlením a úseky souboru mezi nimi se kopírují vcelku
+- Pravděpodobnost falešné shody je pro milion URL řádově 1e-8
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+
+from file_locks import file_lock
+
+
+HASH_SIZE = 8
+
+
+def url_hash(url):
+    """64bitový hash URL jako bajty (lexikografické pořadí = číselné pořadí)"""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=HASH_SIZE).digest()
+
+
+class Records:
+    """Buffer pevně širokých záznamů (hashů) jako seřazená posloupnost pro bisect"""
+
+    def __init__(self, buffer, size=HASH_SIZE):
+        self.buffer = buffer
+        self.size = size
+
+    def __len__(self):
+        return len(self.buffer) // self.size
+
+    def __getitem__(self, index):
+        return self.buffer[index * self.size:(index + 1) * self.size]
+
+    def contains(self, key):
+        index = bisect.bisect_left(self, key)
+        return index < len(self) and self[index] == key
+
+
+class SeenURLs:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._map = None
+        self._pending = set()
+
+    def _open(self):
+        if self._map is None and self._file is None and os.path.exists(self.path):
+            if os.path.getsize(self.path) >= HASH_SIZE:
+                self._file = open(self.path, 'rb')
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        self._open()
+        stored = len(self._map) // HASH_SIZE if self._map is not None else 0
+        return stored + len(self._pending)
+
+    def _stored_contains(self, key):
+        self._open()
+        return self._map is not None and Records(self._map).contains(key)
+
+    def __contains__(self, url):
+        key = url_hash(url)
+        return key in self._pending or self._stored_contains(key)
+
+    def add(self, url):
+        key = url_hash(url)
+        if not self._stored_contains(key):
+            self._pending.add(key)
+
+    def update(self, urls):
+        for url in urls:
+            self.add(url)
+
+    def save(self):
+        """
+        Sloučí nové hashe se souborem (atomicky) a znovu ho namapuje
+
+        Pod zámkem se slučuje s aktuálním souborem, takže se zachovají
+        i hashe, které mezitím uložil jiný proces.
+        """
+        if not self._pending:
+            return
+        with file_lock(self.path):
+            # Soubor mohl mezitím nahradit jiný proces - namapujeme aktuální verzi
+            self.close()
+            self._open()
+            records = Records(self._map if self._map is not None else b"")
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as out:
+                position = 0
+                for key in sorted(self._pending):
+                    # Uložené hashe menší než nový klíč zapíšeme jedním blokem
+                    index = bisect.bisect_left(records, key, position)
+                    out.write(records.buffer[position * HASH_SIZE:index * HASH_SIZE])
+                    position = index
+                    # Hash, který už uložil jiný proces, nezdvojujeme
+                    if index == len(records) or records[index] != key:
+                        out.write(key)
+                out.write(records.buffer[position * HASH_SIZE:])
+            self.close()
+            os.replace(tmp_path, self.path)
+        self._pending = set()
+
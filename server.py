@@ -2,12 +2,110 @@
 """
 Jednoduchý HTTP server pro testování RSS feedu.
 Spustí lokální server, který zpřístupní h7o_feed.xml pro RSS čtečky.
+Na /search?q=...&source=...&format=rss|json vyhledává ve fulltextovém indexu.
+Na /hub běží lokální WebSub hub, změny feedů lze odebírat i přes /events (SSE) a /poll (long-poll).
+Na /stats vrací souhrnné statistiky běhů jako JSON (HTML přehled je statický stats.html).
 """
 
 import http.server
+import json
 import socketserver
 import sys
+from datetime import datetime, timezone
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from feed_archive import is_sealed
+from push_hub import EventBroker, PushHub
+from run_stats import RunStats
+from search_index import SearchIndex
+
+
+def search_response(index: SearchIndex, query_string: str) -> Tuple[int, str, bytes]:
+    """Vyhodnotí dotaz /search a vrátí (status, Content-Type, tělo odpovědi)."""
+    params = parse_qs(query_string)
+    query = params.get('q', [''])[0].strip()
+    source = params.get('source', [None])[0]
+    output_format = params.get('format', ['rss'])[0]
+
+    if not query:
+        return 400, 'text/plain; charset=utf-8', 'Chybí parametr q'.encode('utf-8')
+    if output_format not in ('rss', 'json'):
+        return 400, 'text/plain; charset=utf-8', 'Parametr format musí být rss nebo json'.encode('utf-8')
+
+    try:
+        # Záporný limit by v SQLite znamenal „bez omezení“
+        limit = max(1, min(int(params.get('limit', ['50'])[0]), 200))
+    except ValueError:
+        return 400, 'text/plain; charset=utf-8', 'Parametr limit musí být číslo'.encode('utf-8')
+
+    results = index.search(query, source=source, limit=limit)
+
+    if output_format == 'json':
+        body = json.dumps({'query': query, 'source': source, 'results': results}, ensure_ascii=False)
+        return 200, 'application/json; charset=utf-8', body.encode('utf-8')
+
+    from feedgen.feed import FeedGenerator
+
+    fg = FeedGenerator()
+    fg.title(f'Hledání: {query}')
+    fg.link(href=f'/search?{query_string}', rel='alternate')
+    fg.description(f'Výsledky hledání „{query}“')
+    fg.language('cs')
+
+    # feedgen vkládá položky na začátek, proto přidáváme od nejstarší
+    for item in reversed(results):
+        fe = fg.add_entry()
+        fe.title(item['title'])
+        fe.link(href=item['url'])
+        fe.description(item['description'] or item['title'])
+        fe.guid(item['url'], permalink=True)
+        if item['category']:
+            fe.category(term=item['category'])
+
+        pub_date = datetime.fromisoformat(item['date'])
+        if pub_date.tzinfo is None:
+            pub_date = pub_date.replace(tzinfo=timezone.utc)
+        fe.pubDate(pub_date)
+
+    return 200, 'application/rss+xml; charset=utf-8', fg.rss_str(pretty=True)
+
+
+def poll_response(broker: EventBroker, query_string: str, max_timeout: float = 60) -> Tuple[int, str, bytes]:
+    """Long-poll: počká na události novější než since a vrátí je jako JSON."""
+    params = parse_qs(query_string)
+    try:
+        since = int(params.get('since', ['0'])[0])
+        timeout = min(float(params.get('timeout', ['25'])[0]), max_timeout)
+    except ValueError:
+        return 400, 'text/plain; charset=utf-8', 'Parametry since a timeout musí být čísla'.encode('utf-8')
+
+    topic = params.get('topic', [None])[0]
+    events = broker.wait(since, timeout)
+    if topic:
+        events = [event for event in events if event['topic'] == topic]
+    last_id = events[-1]['id'] if events else max(since, broker.last_id)
+    body = json.dumps({'last_id': last_id, 'events': events}, ensure_ascii=False)
+    return 200, 'application/json; charset=utf-8', body.encode('utf-8')
+
+
+def stats_response(run_stats: RunStats, query_string: str) -> Tuple[int, str, bytes]:
+    """Souhrnné statistiky běhů (všech zdrojů nebo ?source=...) jako JSON."""
+    summary = run_stats.summary()
+    source = parse_qs(query_string).get('source', [None])[0]
+    if source is not None:
+        if source not in summary:
+            return 404, 'text/plain; charset=utf-8', f'Neznámý zdroj {source}'.encode('utf-8')
+        summary = {source: summary[source]}
+    body = json.dumps({'sources': summary}, ensure_ascii=False)
+    return 200, 'application/json; charset=utf-8', body.encode('utf-8')
+
+
+class ThreadingServer(socketserver.ThreadingTCPServer):
+    """Každý požadavek ve vlastním vlákně - SSE a long-poll drží spojení otevřené."""
+    daemon_threads = True
 
 
 def run_server(port: int = 8000):
@@ -15,11 +113,75 @@ def run_server(port: int = 8000):
     
     # Zajistí, že běžíme ve správném adresáři
     script_dir = Path(__file__).parent
+    search_index_path = str(script_dir / 'search_index.sqlite')
+    hub = PushHub(script_dir, f'http://localhost:{port}/hub')
+    run_stats = RunStats(str(script_dir / 'run_stats.json'), str(script_dir / 'stats.html'))
     
     class CustomHandler(http.server.SimpleHTTPRequestHandler):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, directory=str(script_dir), **kwargs)
         
+        def send_body(self, status: int, content_type: str, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == '/search':
+                # Server obsluhuje požadavky ve vláknech, SQLite spojení je proto na požadavek
+                search_index = SearchIndex(search_index_path)
+                try:
+                    self.send_body(*search_response(search_index, url.query))
+                finally:
+                    search_index.close()
+            elif url.path == '/poll':
+                self.send_body(*poll_response(hub.broker, url.query))
+            elif url.path == '/events':
+                self.stream_events(url.query)
+            elif url.path == '/stats':
+                self.send_body(*stats_response(run_stats, url.query))
+            else:
+                super().do_GET()
+
+        def do_POST(self):
+            if urlsplit(self.path).path != '/hub':
+                self.send_error(404)
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            form = parse_qs(self.rfile.read(length).decode('utf-8'))
+            status, message = hub.handle_request(form)
+            self.send_body(status, 'text/plain; charset=utf-8', message.encode('utf-8'))
+
+        def stream_events(self, query_string: str):
+            """Server-Sent Events: každá změna feedu jako událost feed-updated."""
+            params = parse_qs(query_string)
+            topic = params.get('topic', [None])[0]
+            last_id = self.headers.get('Last-Event-ID') or params.get('since', [None])[0]
+            since = int(last_id) if last_id and last_id.isdigit() else hub.broker.last_id
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            try:
+                while True:
+                    events = hub.broker.wait(since, timeout=15)
+                    if not events:
+                        # Komentář udrží spojení přes proxy
+                        self.wfile.write(b': keepalive\n\n')
+                    for event in events:
+                        since = event['id']
+                        if topic and event['topic'] != topic:
+                            continue
+                        data = json.dumps(event, ensure_ascii=False)
+                        self.wfile.write(f'id: {event["id"]}\nevent: feed-updated\ndata: {data}\n\n'.encode('utf-8'))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        
         def end_headers(self):
             # Přidá správné CORS hlavičky pro přístup z různých domén
             self.send_header('Access-Control-Allow-Origin', '*')
@@ -29,13 +191,23 @@ def run_server(port: int = 8000):
             # Zajistí správný Content-Type pro XML soubory
             if self.path.endswith('.xml'):
                 self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                # Objevení hubu (WebSub) přes HTTP hlavičku Link
+                topic = f'http://localhost:{port}{urlsplit(self.path).path}'
+                self.send_header('Link', f'<{hub.hub_url}>; rel="hub", <{topic}>; rel="self"')
+                # Archivní stránky (RFC 5005) se nemění, jakmile za nimi vznikne další
+                path = urlsplit(self.path).path
+                if fnmatch(path, '/archive/*/page-*.xml') and is_sealed(self.translate_path(path)):
+                    self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
             
             super().end_headers()
     
     try:
-        with socketserver.TCPServer(("", port), CustomHandler) as httpd:
+        with ThreadingServer(("", port), CustomHandler) as httpd:
             print(f"✓ HTTP server běží na portu {port}")
             print(f"✓ RSS feed je dostupný na: http://localhost:{port}/h7o_feed.xml")
+            print(f"✓ Hledání: http://localhost:{port}/search?q=...")
+            print(f"✓ Push: hub http://localhost:{port}/hub, SSE /events, long-poll /poll")
+            print(f"✓ Statistiky běhů: http://localhost:{port}/stats (JSON), /stats.html")
             print(f"✓ Pro zastavení serveru stiskněte Ctrl+C")
             print()
             httpd.serve_forever()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Úložiště snímků stažených stránek
+- Každá stránka se ukládá komprimovaně pod svým SHA-256 hashem (stejné stránky jen jednou)
+- Pro každý běh a zdroj se vede manifest: URL a číslo stránky -> hash; zapíše se
+  jednou na konci běhu (finish_run)
+- Drží se jen posledních keep_runs běhů každého zdroje, objekty bez odkazu z manifestu
+  se smažou
+- Ze snímků lze offline znovu extrahovat položky (viz replay_snapshots.py)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+
+class SnapshotRun:
+    """Manifest jednoho běhu generátoru pro jeden zdroj"""
+
+    def __init__(self, store, source, run_id, started_at):
+        self.store = store
+        self.source = source
+        self.run_id = run_id
+        self.started_at = started_at
+        self.pages = []
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.store.manifest_dir(self.source), f"{self.run_id}.json")
+
+    def record(self, page_num, url, content, encoding):
+        """Uloží stránku a zapíše ji do manifestu běhu"""
+        digest = self.store.put(content)
+        self.pages.append({
+            "page_num": page_num,
+            "url": url,
+            "sha256": digest,
+            "encoding": encoding,
+            "size": len(content),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        })
+        return digest
+
+    def save(self):
+        """Zapíše manifest na disk"""
+        manifest = {
+            "run_id": self.run_id,
+            "source": self.source,
+            "started_at": self.started_at.isoformat(),
+            "pages": self.pages,
+        }
+        self.store._write_atomic(
+            self.manifest_path,
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+
+
+class SnapshotStore:
+
+    def __init__(self, root="snapshots", keep_runs=30):
+        self.root = root
+        # Počet posledních běhů zdroje, jejichž snímky se drží (None = všechny)
+        self.keep_runs = keep_runs
+
+    def object_path(self, digest):
+        """Cesta k objektu podle hashe (dvouznakové podadresáře)"""
+        return os.path.join(self.root, "objects", digest[:2], f"{digest[2:]}.html.gz")
+
+    def manifest_dir(self, source):
+        return os.path.join(self.root, "manifests", source)
+
+    def _write_atomic(self, path, data):
+        """Zapíše soubor přes dočasný soubor a přejmenování"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, content):
+        """Uloží surová data stránky a vrátí jejich hash"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            # mtime=0 -> stejný obsah dává stejný komprimovaný soubor
+            self._write_atomic(path, gzip.compress(content, mtime=0))
+        return digest
+
+    def get(self, digest):
+        """Načte surová data stránky podle hashe"""
+        with open(self.object_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def start_run(self, source):
+        """Založí manifest nového běhu pro zdroj"""
+        started_at = datetime.now(timezone.utc)
+        run_id = started_at.strftime("%Y%m%dT%H%M%S%fZ")
+        return SnapshotRun(self, source, run_id, started_at)
+
+    def finish_run(self, run):
+        """Zapíše manifest dokončeného běhu a prořeže staré běhy zdroje"""
+        run.save()
+        if self.keep_runs is not None:
+            self.prune(run.source, self.keep_runs)
+
+    def prune(self, source, keep_runs):
+        """
+        Smaže manifesty starších běhů zdroje a objekty, na které už nic neodkazuje
+
+        Returns:
+            Počet smazaných objektů
+        """
+        runs = self.list_runs(source)
+        if len(runs) <= keep_runs:
+            return 0
+        for run_id in runs[:len(runs) - keep_runs]:
+            os.remove(os.path.join(self.manifest_dir(source), f"{run_id}.json"))
+
+        # Objekty sdílejí všechny zdroje - odkazy sbíráme ze všech manifestů
+        referenced = set()
+        manifests = os.path.join(self.root, "manifests")
+        for other in os.listdir(manifests):
+            for run_id in self.list_runs(other):
+                referenced.update(page["sha256"] for page in self.load_manifest(other, run_id)["pages"])
+
+        removed = 0
+        objects = os.path.join(self.root, "objects")
+        for prefix in os.listdir(objects):
+            for name in os.listdir(os.path.join(objects, prefix)):
+                if name.endswith(".html.gz") and prefix + name[:-len(".html.gz")] not in referenced:
+                    os.remove(os.path.join(objects, prefix, name))
+                    removed += 1
+        return removed
+
+    def list_runs(self, source):
+        """Vrátí ID běhů zdroje seřazená od nejstaršího"""
+        directory = self.manifest_dir(source)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[:-len(".json")] for name in os.listdir(directory) if name.endswith(".json")
+        )
+
+    def load_manifest(self, source, run_id):
+        """Načte manifest běhu"""
+        path = os.path.join(self.manifest_dir(source), f"{run_id}.json")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def iter_pages(self, source, run_id):
+        """Vrací (záznam z manifestu, surová data) pro stránky běhu v pořadí stránek"""
+        manifest = self.load_manifest(source, run_id)
+        for page in sorted(manifest["pages"], key=lambda p: p["page_num"]):
+            yield page, self.get(page["sha256"])
@@ -0,0 +1,1115 @@
+#!/usr/bin/env python3
+"""
+Obecný RSS generátor řízený konfigurací (JSON/TOML)
+- Konfigurace určuje URL, stránkování, selektory položek a polí, formát data a retenci
+- Selektory se zkompilují jednou a všechna pole položky se vytáhnou jedním průchodem jejího podstromu
+- Nový zdroj = nový soubor v adresáři sources/, bez nového Python kódu
+- Vestavěné zdroje (H7O, Kosmas) jsou jen konfigurace sources/h7o.json a sources/kosmas.json
+"""
+
+from datetime import datetime, timezone, timedelta
+import argparse
+import json
+import os
+import re
+import string
+import threading
+import time
+from contextlib import closing
+from itertools import chain, islice, takewhile
+from urllib.parse import urljoin
+from log_utils import RSSLogger, startup_seconds
+from parse_pool import iter_parsed_pages
+from quick_check import HTTPValidators, is_unchanged
+from facet_feeds import index_facets
+from feed_archive import add_links, write_bytes
+from near_duplicates import NearDuplicateStore, collapse_new_items, report_collapsed
+from item_changes import add_updated, apply_updates, report_updates, stamp_hashes
+from seen_urls import SeenURLs
+from file_locks import commit_cache, file_version
+from first_seen import FirstSeenIndex, prepends
+from http_transport import RequestsTransport, TransportError
+from output_sinks import publish
+from pipeline import (
+    ensure_newest_first,
+    iter_json_array,
+    merge_newest_first,
+    unique_by_url,
+    write_json_stream,
+)
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+# Konfigurace zdrojů leží vedle modulů (nezávisle na pracovním adresáři)
+SOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources")
+
+# Jeden krok selektoru: tag, třídy a povinné atributy, např. a.article__link[href]
+_STEP_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)?"
+    r"(?P<classes>(?:\.[\w-]+)*)"
+    r"(?P<attrs>(?:\[[\w-]+\])*)$"
+)
+
+
+class SelectorError(ValueError):
+    """Neplatný selektor nebo konfigurace zdroje"""
+
+
+def compile_selector(selector):
+    """
+    Zkompiluje jednoduchý CSS selektor na n-tici kroků (tag, třídy, atributy)
+
+    Podporované jsou jen potomkové kombinátory (mezera), tagy, třídy a
+    přítomnost atributu, což stačí pro výpisy článků a je rychlé na porovnání.
+    """
+    steps = []
+    for part in selector.split():
+        match = _STEP_RE.match(part)
+        if not match or not part:
+            raise SelectorError(f"Nepodporovaný selektor: {selector!r}")
+        tag = match.group("tag")
+        classes = frozenset(c for c in match.group("classes").split(".") if c)
+        attrs = tuple(re.findall(r"\[([\w-]+)\]", match.group("attrs")))
+        steps.append((None if tag in (None, "*") else tag.lower(), classes, attrs))
+    if not steps:
+        raise SelectorError("Prázdný selektor")
+    return tuple(steps)
+
+
+def _step_matches(tag, step):
+    """Ověří, zda element odpovídá jednomu kroku selektoru"""
+    name, classes, attrs = step
+    if name is not None and tag.name != name:
+        return False
+    if classes and not classes.issubset(tag.get("class") or ()):
+        return False
+    for attr in attrs:
+        if not tag.has_attr(attr):
+            return False
+    return True
+
+
+class CompiledField:
+    """Zkompilované pole položky"""
+
+    def __init__(self, name, spec):
+        if isinstance(spec, str):
+            spec = {"selector": spec}
+        self.name = name
+        self.steps = compile_selector(spec["selector"])
+        self.attr = spec.get("attr")
+        self.multiple = spec.get("multiple", False)
+        self.required = spec.get("required", False)
+        self.absolute = spec.get("absolute", False)
+
+    def value(self, tag, base_url):
+        """Vrátí hodnotu pole z nalezeného elementu"""
+        if self.attr:
+            value = tag.get(self.attr)
+            if isinstance(value, list):
+                value = " ".join(value)
+            value = (value or "").strip()
+        else:
+            value = tag.get_text(strip=True)
+        if self.absolute and value:
+            value = urljoin(base_url, value)
+        return value
+
+
+class CompiledTemplate:
+    """Pole skládané z jiných polí podle šablony, např. {title} - {authors}"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.template = spec["template"]
+        self.fallback = spec.get("fallback", "")
+        self.fields = [
+            field for _, field, _, _ in string.Formatter().parse(self.template) if field
+        ]
+
+    def render(self, values):
+        context = {
+            key: ", ".join(value) if isinstance(value, list) else value
+            for key, value in values.items()
+        }
+        if all(context.get(field) for field in self.fields):
+            return self.template.format(**context)
+        return self.fallback.format(**context)
+
+
+def _tag_children(node):
+    """Potomci elementu, kteří jsou tagy (bez textu a komentářů)"""
+    from bs4 import Tag
+
+    return [child for child in node.children if isinstance(child, Tag)]
+
+
+def extract_fields(root, fields, base_url):
+    """
+    Vytáhne všechna pole jedním průchodem podstromu elementu
+
+    Pro každé pole se na cestě od kořene drží, kolik kroků selektoru už
+    odpovídá. Průchod je do hloubky v pořadí dokumentu (element, pak jeho
+    potomci, pak další sourozenec), takže první shoda odpovídá tomu, co by
+    vrátil BeautifulSoup find().
+    """
+    values = {field.name: ([] if field.multiple else None) for field in fields}
+    done = [False] * len(fields)
+    remaining = sum(1 for field in fields if not field.multiple)
+    has_multiple = remaining < len(fields)
+
+    # Zásobník (element, stav polí u rodiče) - stav je počet splněných kroků selektoru
+    initial = (0,) * len(fields)
+    stack = [(child, initial) for child in reversed(_tag_children(root))]
+    while stack:
+        node, states = stack.pop()
+        node_states = list(states)
+        for i, field in enumerate(fields):
+            if done[i]:
+                continue
+            state = states[i]
+            if not _step_matches(node, field.steps[state]):
+                continue
+            if state + 1 < len(field.steps):
+                node_states[i] = state + 1
+                continue
+            value = field.value(node, base_url)
+            if field.multiple:
+                values[field.name].append(value)
+            else:
+                values[field.name] = value
+                done[i] = True
+                remaining -= 1
+        if remaining == 0 and not has_multiple:
+            return values
+        # Obrácené pořadí, aby se potomci zpracovali v pořadí dokumentu před sourozenci
+        node_states = tuple(node_states)
+        stack.extend((child, node_states) for child in reversed(_tag_children(node)))
+    return values
+
+
+def find_all_matching(root, steps):
+    """Najde všechny elementy odpovídající selektoru v pořadí dokumentu"""
+    matches = []
+    stack = [(child, 0) for child in reversed(_tag_children(root))]
+    while stack:
+        node, state = stack.pop()
+        node_state = state
+        if _step_matches(node, steps[state]):
+            if state + 1 == len(steps):
+                matches.append(node)
+            else:
+                node_state = state + 1
+        stack.extend((child, node_state) for child in reversed(_tag_children(node)))
+    return matches
+
+
+def load_source_config(path):
+    """Načte konfiguraci zdroje z JSON nebo TOML souboru"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise SelectorError(f"TOML konfigurace vyžaduje Python 3.11+: {path}")
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+    for key in ("id", "base_url", "selectors"):
+        if key not in config:
+            raise SelectorError(f"V konfiguraci {path} chybí klíč {key!r}")
+    return config
+
+
+def load_source_configs(directory=SOURCES_DIR, enabled_only=False):
+    """Načte všechny konfigurace zdrojů z adresáře (seřazené podle názvu souboru)"""
+    if not os.path.isdir(directory):
+        return []
+    configs = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith((".json", ".toml")):
+            continue
+        config = load_source_config(os.path.join(directory, name))
+        if enabled_only and not config.get("enabled", True):
+            continue
+        configs.append(config)
+    return configs
+
+
+def builtin_config(source_id):
+    """Konfigurace vestavěného zdroje ze sources/<source_id>.json"""
+    return load_source_config(os.path.join(SOURCES_DIR, f"{source_id}.json"))
+
+
+def override_config(config, section=None, **values):
+    """
+    Kopie konfigurace s přepsanými hodnotami (None = ponechat z konfigurace)
+
+    Bez section se přepisují klíče nejvyšší úrovně, jinak klíče dané sekce
+    (např. override_config(config, "retention", max_items=100)).
+    """
+    values = {key: value for key, value in values.items() if value is not None}
+    config = dict(config)
+    if section is None:
+        config.update(values)
+    else:
+        config[section] = dict(config.get(section, {}), **values)
+    return config
+
+
+class SourceRSSGenerator:
+
+    def __init__(
+        self,
+        config,
+        workers=None,
+        executor=None,
+        snapshot_store=None,
+        quick_check=False,
+        validators=None,
+        after_run=None,
+        seen_file=None,
+        transport=None,
+        backfill="sequential",
+        backfill_pages=None,
+        fetch_threads=8,
+        first_seen_file=None,
+        archive=None,
+    ):
+        self.config = config
+        self.source_id = config["id"]
+        self.source_name = config.get("name", self.source_id)
+        self.base_url = config["base_url"]
+        self.cache_file = config.get("cache_file", f"{self.source_id}_cache.json")
+        self.rss_file = config.get("rss_file", f"{self.source_id}_feed.xml")
+
+        pagination = config.get("pagination", {})
+        self.page_url_template = pagination.get("page_url", "{base_url}?page={page}")
+        self.max_pages = pagination.get("max_pages", 10)
+        self.stop_without_next = pagination.get("stop_without_next", False)
+        next_text = pagination.get("next_text")
+        self.next_text_re = re.compile(next_text) if next_text else None
+
+        date = config.get("date", {})
+        self.date_field = date.get("field")
+        self.date_format = date.get("format")
+        self.page_step_minutes = date.get("page_step_minutes", 20)
+        # Zdroj bez data na stránce může datovat položky podle prvního výskytu
+        self.first_seen = None
+        if date.get("first_seen"):
+            self.first_seen = FirstSeenIndex(
+                first_seen_file or config.get("first_seen_file", f"{self.source_id}_first_seen.bin")
+            )
+
+        retention = config.get("retention", {})
+        self.max_age_days = retention.get("max_age_days")
+        self.max_items = retention.get("max_items")
+
+        self.feed = config.get("feed", {})
+        # Pole pro dílčí feedy: název pole -> prefix v názvu souboru (facet_feeds.py)
+        self.facet_fields = config.get("facets", {})
+        # Invertovaný index faset z posledního merge_items (předá se výstupům běhu)
+        self.facet_index = None
+        # Pravidla sloučení téměř duplicitních položek (near_duplicates.py, false = vypnuto)
+        dedupe = config.get("dedupe", {})
+        self.dedupe_rules = None if dedupe is False else dedupe
+        # Trvalý index otisků pro slučování - i proti položkám mimo retenci cache
+        self.duplicates = None
+        if self.dedupe_rules is not None:
+            self.duplicates = NearDuplicateStore(
+                config.get("dedupe_file", f"{self.source_id}_duplicates.sqlite"), self.dedupe_rules
+            )
+
+        # Selektory kompilujeme jen jednou pro celý běh
+        selectors = config["selectors"]
+        container = selectors.get("container")
+        self.container_steps = compile_selector(container) if container else None
+        self.item_steps = compile_selector(selectors["item"])
+        self.fields = []
+        self.templates = []
+        for name, spec in selectors["fields"].items():
+            if isinstance(spec, dict) and "template" in spec:
+                self.templates.append(CompiledTemplate(name, spec))
+            else:
+                self.fields.append(CompiledField(name, spec))
+        field_names = {field.name for field in self.fields}
+        for required in ("title", "url"):
+            if required not in field_names:
+                raise SelectorError(f"Zdroj {self.source_id}: chybí pole {required!r}")
+
+        self.workers = workers
+        self.executor = executor
+        self.snapshot_store = snapshot_store
+        self._snapshot_run = None
+        self._snapshot_lock = threading.Lock()
+        # Rychlá kontrola první stránky před plným během (viz quick_check.py)
+        self.quick_check = quick_check
+        self.validators = validators if validators is not None else HTTPValidators()
+        # Předem stažené stránky: page_num -> (content, encoding, etag, last_modified)
+        self.prefetched = {}
+        # Nové položky předané asynchronním během (async_core.run_async)
+        self.collected = None
+        self._page_validators = None
+        # Funkce volané po úspěšném běhu: callback(generator, items)
+        self.after_run = list(after_run or [])
+        # Archiv RFC 5005 (feed_archive.py): odebíraný feed je jen jeho aktuální okno
+        self.archive = archive
+        # Nové a upravené položky posledního běhu (pro push oznámení)
+        self.changed_items = []
+        # Rozeslané výstupy posledního běhu (output_sinks.py)
+        self.publication = None
+        # Časový rozpočet stahování (run_guard.Deadline, nastavuje guarded_run)
+        self.deadline = None
+        # Počty stažených stránek a chyb stahování (pro jističe v run_guard.py)
+        self.pages_fetched = 0
+        self.fetch_failures = 0
+        self._counter_lock = threading.Lock()
+        # Trvalá množina viděných URL - pamatuje si i položky mimo retenci cache
+        self.seen_urls = SeenURLs(seen_file or config.get("seen_file", f"{self.source_id}_seen_urls.bin"))
+        # HTTP transport pod fetch_raw (záznam/přehrávání viz http_transport.py)
+        self.transport = transport if transport is not None else RequestsTransport()
+        # Strategie prvního stahování: "sequential" (stránku po stránce) nebo "probe"
+        # (sondování dat stránek a paralelní stažení rozsahu) - jen u zdrojů s datem
+        # a časovou retencí, ostatní stahují sekvenčně
+        dated = self.date_field is not None and self.max_age_days is not None
+        self.backfill = backfill if dated else "sequential"
+        # Hloubka sondování (delší historie než pagination.max_pages jen na vyžádání)
+        self.backfill_pages = backfill_pages if backfill_pages is not None else self.max_pages
+        self.fetch_threads = fetch_threads
+
+    def load_cache(self):
+        """Načte uložený stav položek z cache souboru"""
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return []
+
+    def iter_cache(self):
+        """Prochází cache po položkách bez načtení celého souboru (od nejnovějších)"""
+        if os.path.exists(self.cache_file):
+            yield from iter_json_array(self.cache_file)
+
+    def save_cache(self, items):
+        """Uloží aktuální stav položek do cache souboru (proudově)"""
+        write_json_stream(self.cache_file, items)
+
+    def page_url(self, page_num=1):
+        """Vrátí URL stránky podle šablony z konfigurace"""
+        if page_num == 1:
+            return self.base_url
+        return self.page_url_template.format(base_url=self.base_url, page=page_num)
+
+    def fetch_raw(self, page_num=1):
+        """Stáhne jednu stránku a vrátí surová data (bytes, kódování)"""
+        url = self.page_url(page_num)
+
+        prefetched = self.prefetched.pop(page_num, None)
+        if prefetched is not None:
+            content, encoding, etag, last_modified = prefetched
+        else:
+            # Po vypršení časového rozpočtu už nestahujeme (běh doběhne z cache)
+            if self.deadline is not None and self.deadline.expired():
+                print(f"Vypršel časový limit zdroje, stránku {page_num} nestahuji.")
+                return None
+
+            timeout = self.deadline.timeout(10) if self.deadline is not None else 10
+            try:
+                response = self.transport.get(url, timeout=timeout)
+            except TransportError as e:
+                print(f"Chyba při stahování stránky {page_num}: {e}")
+                with self._counter_lock:
+                    self.fetch_failures += 1
+                return None
+            content = response.content
+            encoding = response.encoding
+            etag = response.etag
+            last_modified = response.last_modified
+
+        # fetch_raw běží i z vláken paralelního stahování (sondování dat)
+        with self._counter_lock:
+            self.pages_fetched += 1
+
+        # Validátory první stránky uložíme až po úspěšném běhu
+        if page_num == 1:
+            self._page_validators = (url, etag, last_modified, content)
+
+        self.record_snapshot(page_num, url, content, encoding)
+        return content, encoding
+
+    def record_snapshot(self, page_num, url, content, encoding):
+        """Uloží snímek stažené stránky do úložiště (pokud je nastaveno)"""
+        if self.snapshot_store is None:
+            return
+        # Stránky se mohou stahovat z více vláken (sondování dat)
+        with self._snapshot_lock:
+            if self._snapshot_run is None:
+                self._snapshot_run = self.snapshot_store.start_run(self.source_id)
+            try:
+                self._snapshot_run.record(page_num, url, content, encoding)
+            except OSError as e:
+                print(f"Chyba při ukládání snímku stránky {page_num}: {e}")
+
+    def finish_snapshots(self):
+        """Zapíše manifest snímků běhu (jednou na konci) a prořeže staré běhy"""
+        with self._snapshot_lock:
+            run, self._snapshot_run = self._snapshot_run, None
+        if run is None:
+            return
+        try:
+            self.snapshot_store.finish_run(run)
+        except OSError as e:
+            print(f"Chyba při ukládání manifestu snímků: {e}")
+
+    def parse_html(self, content, encoding=None):
+        """Parsuje surová data stránky"""
+        from bs4 import BeautifulSoup
+
+        text = content.decode(encoding or "utf-8", errors="replace")
+        return BeautifulSoup(text, 'html.parser')
+
+    def fetch_page(self, page_num=1):
+        """Stáhne a parsuje jednu stránku"""
+        raw = self.fetch_raw(page_num)
+        if raw is None:
+            return None
+        return self.parse_html(*raw)
+
+    def has_next_page(self, soup):
+        """Zjistí, zda stránka odkazuje na další stránku"""
+        if self.next_text_re is None:
+            return True
+        return soup.find('a', string=self.next_text_re) is not None
+
+    def page_timestamp(self, base_timestamp, page_num):
+        """Vrátí base timestamp pro danou stránku (u zdrojů bez data)"""
+        return base_timestamp - timedelta(minutes=(page_num - 1) * self.page_step_minutes)
+
+    def parse_page(self, content, encoding, page_num, base_timestamp=None):
+        """Parsuje surová data stránky a vrátí (položky, existuje další stránka)"""
+        if base_timestamp is None:
+            base_timestamp = datetime.now(timezone.utc)
+        soup = self.parse_html(content, encoding)
+        items = self.extract_items_from_page(soup, self.page_timestamp(base_timestamp, page_num))
+        return items, self.has_next_page(soup)
+
+    def parse_date(self, date_str):
+        """Převede datum podle formátu z konfigurace"""
+        try:
+            return datetime.strptime(date_str.strip(), self.date_format)
+        except (ValueError, TypeError):
+            return None
+
+    def extract_items_from_page(self, soup, base_timestamp=None):
+        """Extrahuje položky ze stránky podle zkompilovaných selektorů"""
+        items = []
+        seen_urls = set()
+
+        if base_timestamp is None:
+            base_timestamp = datetime.now(timezone.utc)
+
+        root = soup
+        if self.container_steps is not None:
+            containers = find_all_matching(soup, self.container_steps)
+            if not containers:
+                print(f"Kontejner položek pro {self.source_id} nenalezen!")
+                return items
+            root = containers[0]
+
+        for idx, element in enumerate(find_all_matching(root, self.item_steps)):
+            values = extract_fields(element, self.fields, self.base_url)
+
+            if any(field.required and not values[field.name] for field in self.fields):
+                continue
+
+            title = values["title"]
+            url = values["url"]
+            if not title or not url or url in seen_urls:
+                continue
+
+            if self.date_field:
+                date = self.parse_date(values.pop(self.date_field) or "")
+                if not date:
+                    continue
+            else:
+                # Zdroj bez data - zachováme pořadí ze stránky
+                date = base_timestamp - timedelta(seconds=idx)
+
+            for template in self.templates:
+                values[template.name] = template.render(values)
+
+            item = {name: value if value is not None else "" for name, value in values.items()}
+            item["date"] = date.isoformat()
+            seen_urls.add(url)
+            items.append(item)
+
+        return items
+
+    def extract_snapshot(self, content, encoding, page_num, fetched_at):
+        """Extrahuje položky z uloženého snímku stránky (bez přístupu na síť)"""
+        soup = self.parse_html(content, encoding)
+        return self.extract_items_from_page(soup, self.page_timestamp(fetched_at, page_num))
+
+    def cutoff_date(self):
+        """Vrátí hranici stáří položek (nebo None bez časové retence)"""
+        if self.max_age_days is None:
+            return None
+        return datetime.now() - timedelta(days=self.max_age_days)
+
+    def is_older_than(self, item, cutoff_date):
+        """Porovná datum položky s hranicí (naivní i timezone-aware data)"""
+        item_date = datetime.fromisoformat(item["date"])
+        if item_date.tzinfo is not None:
+            item_date = item_date.astimezone().replace(tzinfo=None)
+        return item_date < cutoff_date
+
+    def was_pruned(self, item, cached_items):
+        """
+        Vypadla položka mimo cache kvůli retenci? (pak se znovu nepublikuje)
+
+        Trvalá množina viděných URL se použije jen tam, kde ji retence mohla
+        odstranit: položka je starší než hranice stáří, nebo je cache plná
+        (max_items). Po smazání cache nebo u novější položky v neplné cache
+        se položka bere jako nová.
+        """
+        if not cached_items or item["url"] not in self.seen_urls:
+            return False
+        cutoff_date = self.cutoff_date()
+        if cutoff_date is not None and self.is_older_than(item, cutoff_date):
+            return True
+        return self.max_items is not None and len(cached_items) >= self.max_items
+
+    def apply_retention(self, items):
+        """Odstraní položky starší než max_age_days a omezí počet na max_items"""
+        cutoff_date = self.cutoff_date()
+        if cutoff_date is not None:
+            items = [item for item in items if not self.is_older_than(item, cutoff_date)]
+        if self.max_items is not None and len(items) > self.max_items:
+            items = sorted(items, key=lambda x: x["date"], reverse=True)[:self.max_items]
+        return items
+
+    def merge_items(self, cached_items, new_items):
+        """Sloučí cache a nové položky proudově (od nejnovějších) a prořeže je retencí"""
+        # Data z indexu prvního výskytu: nové položky se jen předřadí (bez řazení)
+        if self.first_seen is not None and prepends(new_items, cached_items):
+            return self.indexed(self.iter_retained(chain(new_items, cached_items)))
+        new_items.sort(key=lambda x: x["date"], reverse=True)
+        merged = merge_newest_first(ensure_newest_first(cached_items), new_items)
+        return self.indexed(self.iter_retained(merged))
+
+    def indexed(self, items):
+        """Seznam sloučených položek; fasety se indexují v tomtéž průchodu (facet_feeds.py)"""
+        if not self.facet_fields:
+            return list(items)
+        index = {}
+        kept = list(index_facets(items, self.facet_fields, index))
+        self.facet_index = index
+        return kept
+
+    def iter_retained(self, items):
+        """
+        Prořeže proud položek seřazený od nejnovějších (stáří i max_items)
+
+        Skončí u první položky starší než limit - další už se nečtou.
+        """
+        cutoff_date = self.cutoff_date()
+        if cutoff_date is not None:
+            items = takewhile(lambda item: not self.is_older_than(item, cutoff_date), items)
+        if self.max_items is not None:
+            items = islice(items, self.max_items)
+        return items
+
+    def iter_pages(self, max_pages, base_timestamp, workers=None, executor=None):
+        """Prochází stránky a vrací (page_num, položky, existuje další stránka)"""
+        if workers is None and executor is None:
+            for page_num in range(1, max_pages + 1):
+                soup = self.fetch_page(page_num)
+                if not soup:
+                    yield page_num, None, False
+                    return
+                items = self.extract_items_from_page(
+                    soup, self.page_timestamp(base_timestamp, page_num)
+                )
+                yield page_num, items, self.has_next_page(soup)
+            return
+
+        pages = iter_parsed_pages(
+            self.fetch_raw,
+            _parse_page_worker,
+            max_pages,
+            parse_args=(self.config, base_timestamp),
+            executor=executor,
+            workers=workers,
+        )
+        with closing(pages):
+            for page_num, parsed in pages:
+                if parsed is None:
+                    yield page_num, None, False
+                    return
+                items, has_next = parsed
+                yield page_num, items, has_next
+
+    def fetch_all_items(self, max_pages=None, cached_urls=None, workers=None, executor=None):
+        """Stáhne položky ze všech stránek (nebo do max_pages)"""
+        return list(self.iter_new_items(max_pages, cached_urls, workers, executor))
+
+    def iter_new_items(self, max_pages=None, cached_urls=None, workers=None, executor=None):
+        """
+        Proudově vrací nové položky stránku po stránce
+
+        Stránky se stahují jen tak daleko, jak daleko spotřebitel čte
+        (nebo do podmínky zastavení), a položky se nehromadí v seznamu.
+        """
+        if max_pages is None:
+            max_pages = self.max_pages
+        if cached_urls is None:
+            cached_urls = set()
+        if workers is None:
+            workers = self.workers
+        if executor is None:
+            executor = self.executor
+
+        page_num = 0
+        base_timestamp = datetime.now(timezone.utc)
+        cutoff_date = self.cutoff_date()
+
+        print(f"Stahuji položky zdroje {self.source_name}...")
+        print(f"Maximální počet stránek: {max_pages}")
+
+        pages = self.iter_pages(max_pages, base_timestamp, workers=workers, executor=executor)
+        with closing(pages):
+            for page_num, items, has_next in pages:
+                new_items, stop = self.check_page(page_num, items, has_next, cached_urls, cutoff_date)
+                yield from new_items
+                if stop:
+                    break
+            else:
+                if page_num >= max_pages:
+                    print(f"Dosaženo maximálního počtu stránek ({max_pages}).")
+
+    def check_page(self, page_num, items, has_next, cached_urls, cutoff_date):
+        """
+        Vybere ze stránky nové položky a rozhodne o zastavení procházení
+
+        Sdílí ji synchronní (iter_new_items) i asynchronní (async_core) procházení.
+
+        Returns:
+            (nové položky, zastavit)
+        """
+        print(f"Zpracovávám stránku {page_num}...", end=" ")
+
+        if items is None:
+            print("Chyba při stahování.")
+            return [], True
+
+        if not items:
+            print("Žádné položky nenalezeny.")
+            return [], True
+
+        new_items = []
+        old_count = 0
+        cached_count = 0
+        for item in items:
+            if item["url"] in cached_urls:
+                cached_count += 1
+            elif cutoff_date is not None and self.is_older_than(item, cutoff_date):
+                old_count += 1
+            else:
+                new_items.append(item)
+
+        print(
+            f"Nalezeno {len(new_items)} nových položek (přeskočeno {old_count} starých, {cached_count} již v cache)."
+        )
+
+        if cached_count > 0:
+            print("Nalezena položka již v cache, zastavuji stahování.")
+            return new_items, True
+
+        if old_count > 0 and len(new_items) == 0:
+            print("Všechny položky na stránce jsou starší než limit.")
+            return new_items, True
+
+        if old_count > len(items) / 2:
+            print("Více než polovina položek je starších než limit, zastavuji.")
+            return new_items, True
+
+        if self.stop_without_next and not has_next:
+            print("Dosaženo poslední stránky.")
+            return new_items, True
+        return new_items, False
+
+    def find_cutoff_page(self, cutoff_date, max_pages, probed):
+        """
+        Najde poslední stránku, na které je položka novější než cutoff_date
+
+        Stránkování je seřazené podle data, takže stačí sondovat stránky
+        1, 2, 4, 8, ... (galloping) a pak hranici dohledat binárním půlením.
+        Stačí O(log N) sekvenčních požadavků místo N. Stažené stránky se
+        ukládají do probed (page_num -> položky nebo None při chybě).
+        """
+        def is_recent(page_num):
+            if page_num not in probed:
+                print(f"Sonduji stránku {page_num}...", end=" ")
+                soup = self.fetch_page(page_num)
+                probed[page_num] = self.extract_items_from_page(soup) if soup else None
+                items = probed[page_num]
+                if items:
+                    newest = max(datetime.fromisoformat(item["date"]) for item in items)
+                    print(f"nejnovější položka {newest.strftime('%d/%m/%Y')}")
+                else:
+                    print("žádné položky.")
+            items = probed[page_num]
+            return bool(items) and not all(self.is_older_than(item, cutoff_date) for item in items)
+
+        if not is_recent(1):
+            return 1 if probed[1] else 0
+
+        # Galloping: zdvojnásobujeme stránku, dokud jsou na ní nové položky
+        low, high = 1, max_pages + 1
+        page_num = 2
+        while page_num <= max_pages:
+            if not is_recent(page_num):
+                high = page_num
+                break
+            low = page_num
+            page_num *= 2
+
+        # Binární hledání hranice mezi low (nové) a high (staré / za koncem)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if is_recent(middle):
+                low = middle
+            else:
+                high = middle
+
+        return low
+
+    def fetch_all_items_probing(self, max_pages=None, cached_urls=None, threads=None):
+        """
+        Stáhne položky až po hranici stáří pomocí sondování dat stránek
+
+        Nejprve najde poslední relevantní stránku (find_cutoff_page), pak
+        zbývající stránky v rozsahu stáhne paralelně. Filtrování podle cache
+        a data i pravidla zastavení jsou stejná jako ve fetch_all_items (check_page).
+        Bez max_pages se sonduje do backfill_pages (výchozí pagination.max_pages).
+        """
+        if max_pages is None:
+            max_pages = self.backfill_pages
+        if cached_urls is None:
+            cached_urls = set()
+        if threads is None:
+            threads = self.fetch_threads
+
+        cutoff_date = self.cutoff_date()
+        print(f"Stahuji položky novější než {cutoff_date.strftime('%d/%m/%Y')} (sondování)...")
+        print(f"Maximální počet stránek: {max_pages}")
+
+        probed = {}
+        last_page = self.find_cutoff_page(cutoff_date, max_pages, probed)
+        print(f"Poslední relevantní stránka: {last_page}")
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Zbývající stránky v rozsahu stáhneme paralelně
+        missing = [p for p in range(1, last_page + 1) if p not in probed]
+        if missing:
+            print(f"Stahuji paralelně {len(missing)} stránek...")
+            with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+                for page_num, raw in zip(missing, pool.map(self.fetch_raw, missing)):
+                    if raw is None:
+                        probed[page_num] = None
+                    else:
+                        probed[page_num] = self.extract_items_from_page(self.parse_html(*raw))
+
+        # Filtrování a zastavení stejně jako při sekvenčním procházení (check_page);
+        # stránky za last_page jsou celé starší než limit
+        all_items = []
+        for page_num in range(1, last_page + 1):
+            new_items, stop = self.check_page(
+                page_num, probed[page_num], page_num < last_page, cached_urls, cutoff_date
+            )
+            all_items.extend(new_items)
+            if stop:
+                break
+
+        return all_items
+
+    def generate_rss(self, items):
+        """
+        Generuje RSS XML soubor z položek
+
+        Args:
+            items: Položky seřazené od nejnovějších (výstup merge_items nebo
+                uložená cache) - feed vezme jen jejich začátek, bez řazení
+        """
+        from feedgen.feed import FeedGenerator
+
+        fg = FeedGenerator()
+        fg.title(self.feed.get("title", self.source_name))
+        fg.link(href=self.base_url, rel='alternate')
+        fg.description(self.feed.get("description", f"RSS kanál zdroje {self.source_name}"))
+        fg.language(self.feed.get("language", "cs"))
+
+        links = []
+        if self.archive is not None:
+            # Starší položky jsou na archivních stránkách (rel="prev-archive")
+            sorted_items, links = self.archive.subscription(self, items)
+        else:
+            max_feed_items = self.feed.get("max_items")
+            sorted_items = list(islice(items, max_feed_items))
+
+        for item in reversed(sorted_items):
+            fe = fg.add_entry()
+            fe.title(item['title'])
+            fe.link(href=item['url'])
+            fe.description(item.get('description') or item['title'])
+            fe.guid(item['url'], permalink=True)
+
+            pub_date = datetime.fromisoformat(item['date'])
+            if pub_date.tzinfo is None:
+                pub_date = pub_date.replace(tzinfo=timezone.utc)
+            fe.pubDate(pub_date)
+
+        # Upravené položky nesou čas poslední úpravy (atom:updated)
+        rss = add_updated(fg.rss_str(pretty=True), sorted_items)
+        if links:
+            rss = add_links(rss, links)
+        write_bytes(self.rss_file, rss)
+        print(f"\nRSS soubor vytvořen: {self.rss_file}")
+        print(f"Celkem položek v RSS: {len(sorted_items)}")
+
+    def notify_after_run(self, items, wait=True):
+        """Rozešle položky registrovaným výstupům souběžně; jejich chyby běh neshodí"""
+        # Index faset patří k položkám posledního sloučení - předá se jen s nimi
+        facet_index, self.facet_index = self.facet_index, None
+        self.publication = publish(self, items, self.after_run, facet_index)
+        if wait:
+            self.publication.wait()
+
+    def wait_for_outputs(self):
+        """Počká na navazující výstupy posledního běhu (run() na ně nečeká)"""
+        if self.publication is not None:
+            self.publication.wait()
+
+    def remember_validators(self):
+        """Uloží validátory první stránky po úspěšném běhu (pro rychlou kontrolu)"""
+        if self._page_validators is None:
+            return
+        try:
+            self.validators.update(*self._page_validators)
+        except OSError as e:
+            print(f"Chyba při ukládání validátorů: {e}")
+        self._page_validators = None
+
+    def make_logger(self):
+        """Logger běhu (profilování si obalí jeho log_run, viz profiling.py)"""
+        return RSSLogger()
+
+    def run(self):
+        """
+        Hlavní funkce pro spuštění generátoru
+
+        Navazující výstupy (after_run) běží ve vlastních vláknech a mohou běh
+        přečkat; počká se na ně před dalším během (wait_for_outputs) a na
+        konci procesu (output_sinks.drain).
+        """
+        print(f"=== {self.source_name} RSS Generator ===\n")
+        self._page_validators = None
+        # Výstupy předchozího běhu musí doběhnout (čtou stav generátoru)
+        self.wait_for_outputs()
+        if self.collected is None:
+            # Počítadla patří k tomuto běhu (asynchronní běh už stránky stáhl a započítal)
+            self.pages_fetched = 0
+            self.fetch_failures = 0
+        startup = startup_seconds()
+        started = time.perf_counter()
+
+        logger = self.make_logger()
+        new_items_titles = []
+
+        try:
+            cached_version = file_version(self.cache_file)
+            cached_items = self.load_cache()
+
+            # Rychlá kontrola - bez parsování a generování feedu
+            if self.quick_check and is_unchanged(self, cached_items, self.validators):
+                logger.log_run(
+                    source_name=self.source_name,
+                    new_items_count=0,
+                    startup_seconds=startup,
+                    duration_seconds=time.perf_counter() - started,
+                    pages_fetched=self.pages_fetched,
+                    note="Rychlá kontrola: beze změny",
+                )
+                print("\n=== Hotovo (beze změny) ===")
+                return
+
+            is_first_run = len(cached_items) == 0
+            # Procházení zastavuje jen cache; viděné URL řeší až was_pruned
+            cached_urls = {item["url"] for item in cached_items}
+
+            if self.collected is not None:
+                # Stránky už stáhlo a prošlo asynchronní procházení
+                print(f"Zpracovávám {len(self.collected)} položek z asynchronního stahování...\n")
+                new_items, self.collected = self.collected, None
+            elif is_first_run and self.backfill == "probe":
+                print("První spuštění - sonduji data stránek...\n")
+                new_items = self.fetch_all_items_probing(cached_urls=cached_urls)
+            elif is_first_run:
+                print(f"První spuštění - stahuji až {self.max_pages} stránek...\n")
+                # Položky ze stránek potřebuje sloučení duplicit, detekce úprav i viděné URL,
+                # proto se jediný průchod procházením uloží do seznamu
+                new_items = self.fetch_all_items(cached_urls=cached_urls)
+            else:
+                print(f"Nalezeno {len(cached_items)} položek v cache.")
+                print("Kontroluji nové položky...\n")
+                soup = self.fetch_page(1)
+                if soup:
+                    new_items = self.extract_items_from_page(soup)
+                else:
+                    new_items = []
+
+            # Nestáhla se žádná stránka: chyby stahování jsou selhání (stejně jako pro jistič,
+            # run_guard.run_failed), vypršený časový limit přeskočení; feed se vygeneruje z cache
+            fetch_error = None
+            skip_note = None
+            if self.pages_fetched == 0:
+                if self.fetch_failures > 0:
+                    fetch_error = "Nepodařilo se stáhnout žádnou stránku zdroje, feed je z cache"
+                elif self.deadline is not None and self.deadline.expired():
+                    skip_note = "Přeskočeno: vypršel časový limit zdroje, feed je z cache"
+
+            truly_new = list(unique_by_url(
+                item for item in new_items
+                if item["url"] not in cached_urls and not self.was_pruned(item, cached_items)
+            ))
+            # Téměř duplicitní položky (jiná vazba, nový slug) sloučíme s již známými
+            truly_new, collapsed = collapse_new_items(
+                cached_items, truly_new, self.dedupe_rules, self.duplicates
+            )
+            report_collapsed(collapsed)
+            if self.first_seen is not None:
+                # Data prvního výskytu: nové položky jsou novější než celá cache, v pořadí ze stránek
+                self.first_seen.assign(truly_new, floor=cached_items[0]["date"] if cached_items else None)
+
+            # Již známé položky ze stažených stránek porovnáme podle hashe obsahu
+            updated_items = apply_updates(cached_items, new_items)
+            report_updates(updated_items)
+            stamp_hashes(truly_new)
+            new_items_titles = [item["title"] for item in truly_new]
+
+            if truly_new:
+                print(f"\nNalezeno {len(truly_new)} nových položek")
+                for item in truly_new[:10]:
+                    print(f"  - {item['title']}")
+                if len(truly_new) > 10:
+                    print(f"  (Zobrazeno prvních 10 z {len(truly_new)})")
+            else:
+                print("\nŽádné nové položky nenalezeny.")
+
+            # Sloučíme nové a cache položky proudově (oba seznamy seřazené od nejnovějších)
+            # a prořežeme je; vznikne jediný výsledný seznam bez mezikopií.
+            # Probíhá pod zámkem zdroje: uloží cache a vygeneruje RSS
+            total_count = len(cached_items) + len(truly_new)
+            kept_items, truly_new, updated_items = commit_cache(
+                self, cached_items, cached_version, truly_new, updated_items, new_items
+            )
+            new_items_titles = [item["title"] for item in truly_new]
+            removed_count = total_count - len(kept_items)
+            if removed_count > 0:
+                print(f"\nOdstraněno {removed_count} starých položek.")
+
+            # Navazující výstupy (souhrnný feed apod.) běží souběžně se zbytkem běhu;
+            # run() na ně nečeká
+            self.changed_items = truly_new + updated_items
+            self.notify_after_run(kept_items, wait=False)
+
+            # Zapamatujeme si všechny viděné URL (po prořezání cache se nevrátí jako nové)
+            self.seen_urls.update(item["url"] for item in chain(new_items, kept_items))
+            self.seen_urls.save()
+            if self.first_seen is not None:
+                self.first_seen.save()
+
+            # Validátory první stránky pro příští rychlou kontrolu
+            self.remember_validators()
+
+            logger.log_run(
+                source_name=self.source_name,
+                new_items_count=len(truly_new),
+                new_items_titles=new_items_titles,
+                startup_seconds=startup,
+                duration_seconds=time.perf_counter() - started,
+                pages_fetched=self.pages_fetched,
+                error=fetch_error,
+                skipped=skip_note is not None,
+                note=skip_note or (f"Upravené položky: {len(updated_items)}" if updated_items else None),
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            print(f"\n❌ Chyba: {error_msg}")
+            logger.log_run(
+                source_name=self.source_name,
+                new_items_count=0,
+                error=error_msg,
+                startup_seconds=startup,
+                duration_seconds=time.perf_counter() - started,
+                pages_fetched=self.pages_fetched,
+            )
+            raise
+        finally:
+            # Snímky stránek (i z asynchronního stahování před run()) patří k tomuto běhu
+            self.finish_snapshots()
+
+        print("\n=== Hotovo ===")
+
+
+# Parser zdroje v procesu poolu: source_id -> (konfigurace, generátor); selektory
+# se zkompilují jednou za proces, ne pro každou stránku
+_worker_parsers = {}
+
+
+def _worker_parser(config):
+    """Generátor se zkompilovanými selektory pro parsování v procesu poolu"""
+    cached = _worker_parsers.get(config["id"])
+    if cached is None or cached[0] != config:
+        cached = _worker_parsers[config["id"]] = (config, SourceRSSGenerator(config))
+    return cached[1]
+
+
+def _parse_page_worker(content, encoding, page_num, config, base_timestamp):
+    """Parsuje stránku v procesu poolu a vrátí (položky, existuje další stránka)"""
+    return _worker_parser(config).parse_page(content, encoding, page_num, base_timestamp)
+
+
+def main():
+    # Navazující výstupy, archiv a volby běhu zapojuje run_setup.py
+    from run_setup import add_run_arguments, run_generators, run_options
+
+    parser = argparse.ArgumentParser(description="RSS generátor řízený konfigurací zdrojů")
+    parser.add_argument(
+        "configs",
+        nargs="*",
+        help=f"Konfigurace zdrojů (výchozí: povolené zdroje v {SOURCES_DIR}/)",
+    )
+    add_run_arguments(parser)
+    args = parser.parse_args()
+
+    if args.configs:
+        configs = [load_source_config(path) for path in args.configs]
+    else:
+        configs = load_source_configs(enabled_only=True)
+
+    if not configs:
+        print(f"Žádné povolené zdroje v {SOURCES_DIR}/")
+        return
+
+    options = run_options(args)
+    run_generators([SourceRSSGenerator(config, **options) for config in configs], args)
+
+
+if __name__ == "__main__":
+    main()
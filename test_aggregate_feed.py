@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test souhrnného feedu s k-way merge (bez přístupu na síť)
+"""
+
+import json
+from aggregate_feed import AggregatedFeed
+from rss_generator import H7oRSSGenerator
+from kosmas_generator import KosmasRSSGenerator
+
+
+def make_generators(tmp_path, h7o_items, kosmas_items):
+    h7o = H7oRSSGenerator(cache_file=str(tmp_path / "h7o.json"))
+    kosmas = KosmasRSSGenerator(cache_file=str(tmp_path / "kosmas.json"))
+    for gen, items in ((h7o, h7o_items), (kosmas, kosmas_items)):
+        with open(gen.cache_file, "w", encoding="utf-8") as f:
+            json.dump(items, f)
+    return h7o, kosmas
+
+
+def item(name, date):
+    return {"title": name, "url": f"https://example.com/{name}", "description": "", "date": date}
+
+
+def test_merge_orders_sources_by_date_with_cap(tmp_path):
+    """Položky obou zdrojů jsou proložené podle data a omezené limitem"""
+    h7o, kosmas = make_generators(
+        tmp_path,
+        [item("h3", "2026-05-03T00:00:00"), item("h1", "2026-05-01T00:00:00")],
+        [item("k4", "2026-05-04T00:00:00+00:00"), item("k2", "2026-05-02T00:00:00+00:00"),
+         item("k0", "2026-04-30T00:00:00+00:00")],
+    )
+    feed = AggregatedFeed([h7o, kosmas], max_items=4)
+
+    titles = [entry["title"] for _, entry in feed.merged_items()]
+
+    assert titles == ["k4", "h3", "k2", "h1"]
+
+
+def test_unsorted_cache_and_current_run(tmp_path):
+    """Neseřazená cache se seřadí a položky právě dokončeného běhu mají přednost"""
+    h7o, kosmas = make_generators(
+        tmp_path,
+        [item("h1", "2026-05-01T00:00:00"), item("h3", "2026-05-03T00:00:00")],
+        [item("stara", "2026-01-01T00:00:00+00:00")],
+    )
+    feed = AggregatedFeed([h7o, kosmas], max_items=10)
+    fresh = [item("k9", "2026-05-09T00:00:00+00:00")]
+
+    titles = [entry["title"] for _, entry in feed.merged_items(current=(kosmas, fresh))]
+
+    assert titles == ["k9", "h3", "h1"]
+
+
+def test_generate_writes_rss_and_atom(tmp_path):
+    """Souhrnný feed se zapíše jako RSS i Atom"""
+    h7o, kosmas = make_generators(
+        tmp_path,
+        [item("h1", "2026-05-01T00:00:00")],
+        [item("k2", "2026-05-02T00:00:00+00:00")],
+    )
+    feed = AggregatedFeed(
+        [h7o, kosmas],
+        rss_file=str(tmp_path / "all.xml"),
+        atom_file=str(tmp_path / "all.atom.xml"),
+    )
+    h7o.after_run.append(feed.on_source_run)
+
+    h7o.notify_after_run(h7o.load_cache())
+
+    rss = (tmp_path / "all.xml").read_text("utf-8")
+    assert rss.index("k2") < rss.index("h1")
+    assert "<source" in rss
+    assert "<feed" in (tmp_path / "all.atom.xml").read_text("utf-8")
+
+
+def test_cache_is_read_only_up_to_cap(tmp_path):
+    """Z cache se přečte jen začátek - zbytek souboru se neparsuje"""
+    h7o, kosmas = make_generators(
+        tmp_path,
+        [item("h2", "2026-05-02T00:00:00")],
+        [],
+    )
+    head = [item(f"k{n}", f"2026-05-0{9 - n}T00:00:00+00:00") for n in range(3)]
+    # Za limitem je poškozený konec, ke kterému se čtení nedostane
+    with open(kosmas.cache_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(head, indent=2)[:-2] + ",\n  {\"title\": ")
+    feed = AggregatedFeed([h7o, kosmas], max_items=3)
+
+    titles = [entry["title"] for _, entry in feed.merged_items()]
+
+    assert titles == ["k0", "k1", "k2"]
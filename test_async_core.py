@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test asynchronního jádra generátorů nad zaznamenanými stránkami (bez přístupu na síť)
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from async_core import ThreadedAsyncTransport, crawl_async, guarded_run_async, run_all, run_sync
+from http_transport import ReplayTransport
+from kosmas_generator import KosmasRSSGenerator
+from rss_generator import H7oRSSGenerator
+from run_guard import CircuitBreakers
+from test_http_transport import record_site
+from test_parse_pool import h7o_page_html, kosmas_page_html
+
+
+def cached_urls(path):
+    with open(path, encoding="utf-8") as f:
+        return [item["url"] for item in json.load(f)]
+
+
+def test_async_run_matches_sync_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pages = [h7o_page_html(1), h7o_page_html(2), h7o_page_html(3, has_next=False)]
+    cassette = record_site(tmp_path / "cassette", H7oRSSGenerator(), pages)
+
+    sync_gen = H7oRSSGenerator(cache_file="sync.json", rss_file="sync.xml", seen_file="sync.bin")
+    sync_gen.transport = ReplayTransport(cassette, latency=0)
+    sync_gen.run()
+
+    async_gen = H7oRSSGenerator(cache_file="async.json", rss_file="async.xml", seen_file="async.bin")
+    async_gen.transport = ReplayTransport(cassette, latency=0)
+    run_sync(async_gen)
+
+    assert cached_urls("async.json") == cached_urls("sync.json")
+    assert len(cached_urls("async.json")) == 15
+    assert async_gen.pages_fetched == 3
+    assert async_gen.collected is None
+
+
+def test_crawl_stops_at_cached_page(tmp_path):
+    gen = H7oRSSGenerator(cache_file=str(tmp_path / "cache.json"))
+    pages = [h7o_page_html(n) for n in range(1, 5)]
+    replay = ReplayTransport(record_site(tmp_path / "cassette", gen, pages), latency=0)
+
+    # Článek 6 je na druhé stránce - dál se nestahuje
+    known = {"https://www.h7o.cz/clanky/6-clanek"}
+    new_items = asyncio.run(crawl_async(gen, ThreadedAsyncTransport(replay), 10, known))
+
+    assert replay.requested == [gen.page_url(1), gen.page_url(2)]
+    assert len(new_items) == 9
+
+
+def test_sources_share_one_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    h7o = H7oRSSGenerator()
+    kosmas = KosmasRSSGenerator(max_pages=2)
+    cassette = tmp_path / "cassette"
+    record_site(cassette, h7o, [h7o_page_html(1), h7o_page_html(2, has_next=False)])
+    record_site(cassette, kosmas, [kosmas_page_html(1), kosmas_page_html(2)])
+    # Jedna kazeta se simulovanou latencí pro oba zdroje
+    h7o.transport = kosmas.transport = ReplayTransport(cassette, latency=0.2)
+
+    start = time.perf_counter()
+    results = run_all([h7o, kosmas])
+    elapsed = time.perf_counter() - start
+
+    assert results == {h7o.source_name: "ok", kosmas.source_name: "ok"}
+    assert len(cached_urls("articles_cache.json")) == 10
+    assert len(cached_urls("kosmas_cache.json")) == 8
+    # Čtyři stránky po 0,2 s: oba zdroje stahovaly souběžně
+    assert elapsed < 0.75
+
+
+def test_guarded_async_run_records_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gen = KosmasRSSGenerator()
+    gen.transport = ReplayTransport(tmp_path / "empty", latency=0)
+    breakers = CircuitBreakers(str(tmp_path / "breakers.json"), failure_threshold=1)
+
+    async def run(generator, transport, commit_executor):
+        return await guarded_run_async(generator, transport, commit_executor, breakers=breakers)
+
+    assert run_all([gen], run) == {gen.source_name: "failed"}
+    assert not breakers.allow(gen.source_id)
+
+
+def test_async_without_aiohttp_fails_loudly(monkeypatch):
+    """Bez aiohttp se --async nad sítí nespustí (žádný tichý přechod na vlákna)"""
+    import async_core
+
+    monkeypatch.setattr(async_core, "aiohttp", None)
+    gen = KosmasRSSGenerator()
+    with pytest.raises(SystemExit, match="aiohttp"):
+        run_all([gen])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test dílčích feedů podle kategorií a autorů (bez přístupu na síť)
+"""
+
+import os
+
+from facet_feeds import FacetFeeds, build_facet_index, slugify
+from rss_generator import H7oRSSGenerator
+from kosmas_generator import KosmasRSSGenerator
+
+
+def article(n, category, author, day):
+    return {
+        "title": f"Článek {n}",
+        "url": f"https://www.h7o.cz/clanky/{n}",
+        "description": "",
+        "date": f"2026-05-{day:02d}T00:00:00",
+        "category": category,
+        "author": author,
+    }
+
+
+def test_slugify():
+    assert slugify("Jan B. Peňas") == "jan-b-penas"
+    assert slugify("recenze") == "recenze"
+
+
+def test_index_handles_lists():
+    """Seznam autorů (Kosmas) zařadí položku do více faset"""
+    items = [{"authors": ["A", "B"]}, {"authors": ["B"]}]
+    index = build_facet_index(items, {"authors": "autor"})
+    assert index == {("authors", "A"): [0], ("authors", "B"): [0, 1]}
+
+
+def test_only_changed_facets_are_regenerated(tmp_path):
+    gen = H7oRSSGenerator()
+    facets = FacetFeeds(feeds_dir=str(tmp_path))
+    items = [
+        article(1, "recenze", "Jan Němec", 1),
+        article(2, "rozhovor", "Jan Němec", 2),
+    ]
+
+    first = facets.update(gen, items)
+    assert sorted(first) == [
+        "h7o_feed_autor_jan-nemec.xml",
+        "h7o_feed_recenze.xml",
+        "h7o_feed_rozhovor.xml",
+    ]
+
+    # Nový článek mění jen kategorii "recenze" a nového autora
+    items.append(article(3, "recenze", "Jakub Jetmar", 3))
+    second = facets.update(gen, items)
+    assert sorted(second) == ["h7o_feed_autor_jakub-jetmar.xml", "h7o_feed_recenze.xml"]
+
+    # Beze změny se nic nepřegeneruje, zaniklá faseta se smaže
+    assert facets.update(gen, items) == []
+    facets.update(gen, items[:1])
+    assert not (tmp_path / "h7o_feed_rozhovor.xml").exists()
+
+
+def test_kosmas_author_feeds(tmp_path):
+    facets = FacetFeeds(feeds_dir=str(tmp_path))
+    items = [{
+        "title": "Kniha", "url": "https://www.kosmas.cz/knihy/1/", "description": "",
+        "authors": ["Kevin J. Anderson", "Brian Herbert"], "date": "2026-08-22T06:52:00+00:00",
+    }]
+    written = facets.update(KosmasRSSGenerator(), items)
+    assert sorted(written) == [
+        "kosmas_feed_autor_brian-herbert.xml",
+        "kosmas_feed_autor_kevin-j-anderson.xml",
+    ]
+
+
+def test_run_uses_index_built_during_merge(tmp_path, monkeypatch):
+    gen = H7oRSSGenerator(max_age_months=1200)
+    facets = FacetFeeds(feeds_dir=str(tmp_path))
+    cached = [article(2, "rozhovor", "Jan Němec", 2), article(1, "recenze", "Jan Němec", 1)]
+    kept = gen.merge_items(cached, [article(3, "recenze", "Jakub Jetmar", 3)])
+
+    # Index vznikl při sloučení a projde s položkami přes output_sinks.publish -
+    # callback už položky znovu neprochází
+    monkeypatch.setattr("facet_feeds.build_facet_index", None)
+    gen.after_run = [facets.on_source_run]
+    gen.notify_after_run(kept)
+    assert gen.facet_index is None
+
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".xml")) == [
+        "h7o_feed_autor_jakub-jetmar.xml",
+        "h7o_feed_autor_jan-nemec.xml",
+        "h7o_feed_recenze.xml",
+        "h7o_feed_rozhovor.xml",
+    ]
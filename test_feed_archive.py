@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test archivních feedů podle RFC 5005 (bez přístupu na síť)
+"""
+
+from lxml import etree
+
+from feed_archive import ATOM_NS, HISTORY_NS, FeedArchive, is_sealed
+from rss_generator import H7oRSSGenerator
+
+
+def article(n):
+    return {
+        "title": f"Článek {n}",
+        "url": f"https://www.h7o.cz/clanky/{n}",
+        "description": "",
+        "date": f"2026-05-01T00:{n:02d}:00",
+    }
+
+
+def links(path):
+    channel = etree.parse(str(path)).getroot().find("channel")
+    return {link.get("rel"): link.get("href") for link in channel.findall(f"{{{ATOM_NS}}}link")}
+
+
+def guids(path):
+    return [guid.text for guid in etree.parse(str(path)).getroot().iter("guid")]
+
+
+def test_pages_are_immutable_and_linked(tmp_path):
+    gen = H7oRSSGenerator()
+    archive = FeedArchive(str(tmp_path), page_size=3, current_size=2)
+    directory = tmp_path / "h7o"
+
+    assert archive.update(gen, [article(n) for n in range(4)]) == []
+    assert len(guids(directory / "current.xml")) == 4
+
+    assert archive.update(gen, [article(n) for n in range(5)]) == ["page-0001.xml"]
+    page = directory / "page-0001.xml"
+    assert guids(page) == [article(n)["url"] for n in (2, 1, 0)]
+    # Nejnovější stránka nemá next-archive (další stránka ještě neexistuje)
+    assert links(page) == {"current": "current.xml", "self": "page-0001.xml"}
+    assert not is_sealed(str(page))
+    assert etree.parse(str(page)).getroot().find(f"channel/{{{HISTORY_NS}}}archive") is not None
+    assert links(directory / "current.xml")["prev-archive"] == "page-0001.xml"
+
+    # Staré položky vypadly z cache (retence) - historie v archivu zůstane
+    assert archive.update(gen, [article(n) for n in range(5, 8)]) == ["page-0002.xml"]
+    assert links(page)["next-archive"] == "page-0002.xml"
+    assert guids(page) == [article(n)["url"] for n in (2, 1, 0)]
+    assert is_sealed(str(page))
+    assert "next-archive" not in links(directory / "page-0002.xml")
+    assert links(directory / "page-0002.xml")["prev-archive"] == "page-0001.xml"
+    assert guids(directory / "current.xml") == [article(n)["url"] for n in (7, 6)]
+
+    # Uzavřená stránka se už nemění
+    content = page.read_bytes()
+    archive.update(gen, [article(n) for n in range(5, 11)])
+    assert page.read_bytes() == content
+
+
+def test_subscription_feed_is_current_window(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    archive = FeedArchive("archive", page_size=3, current_size=2)
+    gen = H7oRSSGenerator(rss_file="h7o_feed.xml", archive=archive)
+
+    gen.generate_rss([article(n) for n in range(7)])
+
+    # Odebíraný feed má jen položky mimo archivní stránky a odkaz na nejnovější stránku
+    assert guids(tmp_path / "h7o_feed.xml") == [article(n)["url"] for n in (6, 5, 4, 3)]
+    assert links(tmp_path / "h7o_feed.xml")["prev-archive"] == "archive/h7o/page-0001.xml"
+    assert guids(tmp_path / "archive" / "h7o" / "page-0001.xml") == [article(n)["url"] for n in (2, 1, 0)]
+
+
+def test_late_same_day_item_is_not_lost(tmp_path):
+    """Položka přidaná později téhož dne s menší URL než značka archivu se publikuje"""
+    gen = H7oRSSGenerator()
+    archive = FeedArchive(str(tmp_path), page_size=3, current_size=2)
+    directory = tmp_path / "h7o"
+
+    def same_day(slug):
+        return dict(article(0), title=slug, url=f"https://www.h7o.cz/clanky/{slug}")
+
+    items = [same_day(slug) for slug in "bcdef"]
+    assert archive.update(gen, items) == ["page-0001.xml"]
+    assert guids(directory / "current.xml") == [same_day(slug)["url"] for slug in "fe"]
+
+    # Archivované položky se znovu nepřidají, nová "a" ano (je menší než značka "d")
+    archive.update(gen, items + [same_day("a")])
+    assert same_day("a")["url"] in guids(directory / "current.xml")
+    assert not set(guids(directory / "page-0001.xml")) & set(guids(directory / "current.xml"))
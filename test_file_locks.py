@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test zámků a optimistického slučování při souběžných bězích (bez přístupu na síť)
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+from file_locks import LockTimeout, commit_cache, file_lock, file_version
+from log_utils import RSSLogger
+from seen_urls import SeenURLs
+
+
+def write_log_entries(log_file, source, count):
+    logger = RSSLogger(log_file)
+    for i in range(count):
+        logger.log_run(source_name=f"{source}-{i}", new_items_count=i)
+
+
+def add_seen_urls(path, prefix, count):
+    seen = SeenURLs(path)
+    seen.update(f"https://example.org/{prefix}/{i}" for i in range(count))
+    seen.save()
+
+
+def hold_lock(path, ready, release):
+    with file_lock(path):
+        ready.set()
+        release.wait(10)
+
+
+def run_processes(target, args_list):
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+
+def test_lock_is_exclusive_across_processes(tmp_path):
+    path = str(tmp_path / "cache.json")
+    ctx = multiprocessing.get_context("spawn")
+    ready, release = ctx.Event(), ctx.Event()
+    holder = ctx.Process(target=hold_lock, args=(path, ready, release))
+    holder.start()
+    try:
+        assert ready.wait(10)
+        with pytest.raises(LockTimeout):
+            with file_lock(path, timeout=0.1):
+                pass
+    finally:
+        release.set()
+        holder.join(10)
+    with file_lock(path, timeout=1):
+        pass
+
+
+def test_concurrent_log_writes_keep_all_entries(tmp_path):
+    log_file = str(tmp_path / "rss_update_log.md")
+    run_processes(write_log_entries, [(log_file, f"zdroj{p}", 5) for p in range(4)])
+
+    with open(log_file, encoding="utf-8") as f:
+        content = f.read()
+    for p in range(4):
+        for i in range(5):
+            assert f"**Zdroj:** zdroj{p}-{i}\n" in content
+
+
+def test_concurrent_seen_url_saves_are_merged(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    run_processes(add_seen_urls, [(path, f"p{p}", 200) for p in range(3)] + [(path, "p0", 200)])
+
+    seen = SeenURLs(path)
+    # Každý hash jen jednou, i když p0 uložily dva procesy
+    assert len(seen) == 600
+    assert "https://example.org/p2/199" in seen
+
+
+def test_commit_cache_merges_with_concurrent_writer(tmp_path):
+    # Generátory importujeme až zde - procesy ostatních testů tak startují rychle
+    from test_parse_pool import FakeKosmasGenerator
+
+    gen = FakeKosmasGenerator([], cache_file=str(tmp_path / "kosmas_cache.json"),
+                              rss_file=str(tmp_path / "kosmas_feed.xml"))
+    base = [{"title": "Stará", "description": "Stará", "url": "https://k/1", "date": "2024-01-01T00:00:00+00:00"}]
+    gen.save_cache(base)
+
+    # Tento běh načte cache...
+    version = file_version(gen.cache_file)
+    cached = gen.load_cache()
+
+    # ...a mezitím jiný proces uloží svou novou položku
+    other = {"title": "Cizí", "description": "Cizí", "url": "https://k/2", "date": "2024-01-02T00:00:00+00:00"}
+    gen.save_cache([other] + base)
+
+    mine = {"title": "Moje", "description": "Moje", "url": "https://k/3", "date": "2024-01-03T00:00:00+00:00"}
+    duplicate = dict(other)
+    kept, new_items, _ = commit_cache(gen, cached, version, [mine, duplicate], [], [])
+
+    assert [item["url"] for item in kept] == ["https://k/3", "https://k/2", "https://k/1"]
+    assert new_items == [mine]
+    with open(gen.cache_file, encoding="utf-8") as f:
+        assert [item["url"] for item in json.load(f)] == ["https://k/3", "https://k/2", "https://k/1"]
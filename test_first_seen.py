@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test indexu prvního výskytu a stabilního pořadí položek Kosmas (bez přístupu na síť)
+"""
+
+import json
+
+from first_seen import HEADER, RECORD_SIZE, FirstSeenIndex, iso_date
+from seen_urls import HASH_SIZE
+from test_parse_pool import FakeKosmasGenerator
+
+
+def kosmas_page(numbers):
+    """Stránka Kosmas s knihami v daném pořadí"""
+    parts = ['<html><body><div class="grid-items__pagenumber">']
+    for n in numbers:
+        parts.append(
+            f'<div class="grid-item">'
+            f'<h3 class="g-item__title"><a href="/knihy/{n}/kniha/">Kniha {n}</a></h3>'
+            f'</div>'
+        )
+    parts.append('</div></body></html>')
+    return "".join(parts).encode("utf-8")
+
+
+def test_assign_is_monotonic_and_persistent(tmp_path):
+    path = str(tmp_path / "first_seen.bin")
+    index = FirstSeenIndex(path)
+    items = [{"url": f"https://k/{n}"} for n in range(3)]
+    index.assign(items, now=1000)
+    assert [item["date"] for item in items] == [iso_date(1000), iso_date(999), iso_date(998)]
+    index.save()
+    index.close()
+
+    # Další běh ve stejné sekundě: nové položky jsou přesto novější než všechny předchozí
+    reopened = FirstSeenIndex(path)
+    assert reopened.last_assigned == 1000
+    items = [{"url": "https://k/new1"}, {"url": "https://k/new2"}, {"url": "https://k/1"}]
+    reopened.assign(items, now=1000)
+    assert [item["date"] for item in items] == [iso_date(1002), iso_date(1001), iso_date(999)]
+    assert reopened.get("https://k/new2") == (1001, 1)
+    reopened.save()
+    reopened.close()
+
+    data = (tmp_path / "first_seen.bin").read_bytes()
+    assert HEADER.unpack_from(data)[0] == 1002
+    keys = [data[i:i + HASH_SIZE] for i in range(HEADER.size, len(data), RECORD_SIZE)]
+    assert len(keys) == 5 and keys == sorted(keys)
+
+
+def test_floor_keeps_new_items_above_cache(tmp_path):
+    index = FirstSeenIndex(str(tmp_path / "first_seen.bin"))
+    items = [{"url": "https://k/a"}, {"url": "https://k/b"}]
+    index.assign(items, now=1000, floor=iso_date(5000))
+    assert [item["date"] for item in items] == [iso_date(5002), iso_date(5001)]
+
+
+def test_kosmas_order_is_stable_across_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    FakeKosmasGenerator([kosmas_page([1, 2, 3, 4])]).run()
+    first = json.loads((tmp_path / "kosmas_cache.json").read_text("utf-8"))
+
+    # Nové knihy na začátku stránky, ostatní posunuté (i na jiné pozice)
+    FakeKosmasGenerator([kosmas_page([6, 5, 2, 1, 4, 3])]).run()
+    second = json.loads((tmp_path / "kosmas_cache.json").read_text("utf-8"))
+
+    urls = [item["url"].split("/")[-3] for item in second]
+    assert urls == ["6", "5", "1", "2", "3", "4"]
+    # Dříve viděné položky si ponechají datum i pořadí
+    assert second[2:] == first
+    assert second[1]["date"] > first[0]["date"]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test prvního stahování H7O se sondováním dat stránek (bez přístupu na síť)
+"""
+
+from datetime import datetime, timedelta
+from test_parse_pool import FakeH7oGenerator, h7o_page_html
+
+
+def make_pages(count):
+    return [h7o_page_html(p, has_next=p < count) for p in range(1, count + 1)]
+
+
+def test_probe_matches_sequential_backfill():
+    """Sondování najde stejné články jako sekvenční průchod"""
+    pages = make_pages(60)
+
+    sequential = FakeH7oGenerator(pages, max_age_months=12).fetch_all_items(max_pages=60)
+    probing = FakeH7oGenerator(pages, max_age_months=12).fetch_all_items_probing(max_pages=60)
+
+    assert {a["url"] for a in probing} == {a["url"] for a in sequential}
+    assert len(probing) > 100
+
+
+def test_probe_needs_logarithmic_sequential_requests():
+    """Sekvenčních sond je O(log N), zbytek rozsahu se stahuje paralelně"""
+    gen = FakeH7oGenerator(make_pages(200), max_age_months=12)
+    probed = {}
+    cutoff = gen.find_cutoff_page(datetime.now() - timedelta(days=360), 200, probed)
+
+    # 5 článků po 3 dnech na stránku -> 360 dní je na stránce 24
+    assert cutoff == 24
+    assert len(probed) <= 12
+
+
+def test_probe_beyond_last_page():
+    """Když je relevantní celá historie, sondování skončí na poslední stránce"""
+    pages = make_pages(6)
+    gen = FakeH7oGenerator(pages, max_age_months=12)
+
+    articles = gen.fetch_all_items_probing(max_pages=50)
+
+    assert len(articles) == 30
+
+
+def test_probe_stops_like_sequential_when_most_items_are_old():
+    """Pravidlo „více než polovina starých“ platí i při sondování"""
+    pages = [
+        h7o_page_html(1),
+        # 1 nový a 4 staré články - sekvenční průchod tu končí
+        h7o_page_html(2, days_step=5),
+        # Další stránka by měla zase nové články (nesetříděné stránkování)
+        h7o_page_html(3, days_step=1, has_next=False),
+    ]
+
+    sequential = FakeH7oGenerator(pages, max_age_months=1).fetch_all_items(max_pages=3)
+    probing = FakeH7oGenerator(pages, max_age_months=1).fetch_all_items_probing(max_pages=3)
+
+    assert [a["url"] for a in probing] == [a["url"] for a in sequential]
+    assert not any("/clanky/10-" in a["url"] for a in probing)
+
+
+def test_probe_depth_defaults_to_configured_max_pages():
+    """Bez --backfill-pages sondování nepřekročí max_pages zdroje (h7o.json: 20)"""
+    pages = make_pages(60)
+
+    default = FakeH7oGenerator(pages, max_age_months=12)
+    deeper = FakeH7oGenerator(pages, max_age_months=12, backfill_pages=60)
+
+    assert len(default.fetch_all_items_probing()) == 20 * 5
+    assert max(default.fetched) <= 20
+    assert len(deeper.fetch_all_items_probing()) > 20 * 5
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test záznamu a přehrávání HTTP odpovědí (bez přístupu na síť)
+"""
+
+import time
+
+import pytest
+
+from http_transport import Cassette, RecordingTransport, ReplayTransport, Response, TransportError
+from rss_generator import H7oRSSGenerator
+from test_parse_pool import h7o_page_html
+
+
+class PagesTransport:
+    """Vnitřní transport pro nahrávání - odpovídá z pevného slovníku URL -> HTML"""
+
+    def __init__(self, pages, delay=0.0):
+        self.pages = pages
+        self.delay = delay
+
+    def get(self, url, timeout=10, headers=None):
+        if url not in self.pages:
+            raise TransportError(f"HTTP 404: {url}")
+        time.sleep(self.delay)
+        return Response(url, 200, self.pages[url], "utf-8", {"ETag": f'"{len(url)}"'})
+
+
+def record_site(directory, generator, pages):
+    """
+    Nahraje stránky zdroje do kazety tak, jako by je stáhl generátor
+
+    Args:
+        pages: HTML stránek od první (bytes)
+    """
+    recorder = RecordingTransport(directory, inner=PagesTransport(
+        {generator.page_url(n): content for n, content in enumerate(pages, 1)}
+    ))
+    for n in range(1, len(pages) + 1):
+        recorder.get(generator.page_url(n))
+    return directory
+
+
+def test_record_and_replay_roundtrip(tmp_path):
+    gen = H7oRSSGenerator(cache_file=str(tmp_path / "cache.json"))
+    pages = [h7o_page_html(1), h7o_page_html(2, has_next=False)]
+    record_site(tmp_path / "cassette", gen, pages)
+
+    assert sorted(Cassette(tmp_path / "cassette").urls()) == sorted([gen.page_url(1), gen.page_url(2)])
+
+    gen.transport = ReplayTransport(tmp_path / "cassette", latency=0)
+    assert gen.fetch_raw(2) == (pages[1], "utf-8")
+    assert gen.fetch_raw(1) == (pages[0], "utf-8")
+    # Validátory první stránky se přehrají z hlaviček
+    assert gen._page_validators[1] == f'"{len(gen.page_url(1))}"'
+
+
+def test_missing_url_counts_as_fetch_failure(tmp_path):
+    gen = H7oRSSGenerator(cache_file=str(tmp_path / "cache.json"))
+    gen.transport = ReplayTransport(tmp_path / "empty", latency=0)
+
+    assert gen.fetch_page(1) is None
+    assert gen.fetch_failures == 1
+    assert gen.pages_fetched == 0
+
+
+def test_replay_simulates_recorded_latency(tmp_path):
+    url = "https://example.org/"
+    Cassette(tmp_path).save(Response(url, 200, b"<html></html>", "utf-8"), elapsed=0.05)
+
+    start = time.perf_counter()
+    ReplayTransport(tmp_path).get(url)
+    assert time.perf_counter() - start >= 0.05
+
+    start = time.perf_counter()
+    ReplayTransport(tmp_path, latency=0).get(url)
+    assert time.perf_counter() - start < 0.05
+
+
+def test_replay_latency_over_timeout_fails(tmp_path):
+    url = "https://example.org/"
+    Cassette(tmp_path).save(Response(url, 200, b"<html></html>", "utf-8"), elapsed=5)
+
+    with pytest.raises(TransportError):
+        ReplayTransport(tmp_path).get(url, timeout=0.01)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test detekce upravených položek podle hashe obsahu (bez přístupu na síť)
+"""
+
+import json
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from lxml import etree
+
+from item_changes import ATOM_NS, apply_updates, content_hash
+from test_parse_pool import FakeH7oGenerator, h7o_page_html
+
+
+def test_apply_updates_only_changed_items():
+    cached = [
+        {"url": "a", "title": "A", "description": "", "date": "2026-05-01T00:00:00"},
+        {"url": "b", "title": "B", "description": "", "date": "2026-05-02T00:00:00"},
+    ]
+    cached[0]["hash"] = content_hash(cached[0])
+    page = [
+        {"url": "a", "title": "A", "description": "", "date": "2026-05-09T00:00:00"},
+        {"url": "b", "title": "B (opraveno)", "description": "", "date": "2026-05-09T00:00:00"},
+        {"url": "c", "title": "C", "description": "", "date": "2026-05-09T00:00:00"},
+    ]
+    now = datetime(2026, 5, 10, tzinfo=timezone.utc)
+
+    updated = apply_updates(cached, page, now=now)
+    assert updated == [cached[1]]
+    assert cached[1]["title"] == "B (opraveno)"
+    assert cached[1]["date"] == "2026-05-02T00:00:00"
+    assert cached[1]["updated"] == now.isoformat()
+    assert "updated" not in cached[0]
+    assert apply_updates(cached, page, now=now) == []
+
+
+def test_edited_perex_updates_cache_and_feed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    page = h7o_page_html(1, count=3, has_next=False)
+    gen = FakeH7oGenerator([page], cache_file="cache.json", rss_file="feed.xml")
+    gen.run()
+    first = json.loads((tmp_path / "cache.json").read_text("utf-8"))
+    assert all("hash" in item and "updated" not in item for item in first)
+
+    gen.pages = [page.replace("Perex 1".encode(), "Opravený perex".encode())]
+    gen.run()
+    cache = {item["url"]: item for item in json.loads((tmp_path / "cache.json").read_text("utf-8"))}
+    edited = cache["https://www.h7o.cz/clanky/1-clanek"]
+    assert edited["description"] == "Opravený perex"
+    assert "updated" in edited
+    assert sum("updated" in item for item in cache.values()) == 1
+    # V RSS nese upravená položka atom:updated, pubDate zůstává datem vydání
+    root = etree.parse(str(tmp_path / "feed.xml")).getroot()
+    entries = {entry.findtext("guid"): entry for entry in root.iter("item")}
+    edited_entry = entries["https://www.h7o.cz/clanky/1-clanek"]
+    assert edited_entry.findtext("description") == "Opravený perex"
+    assert edited_entry.findtext(f"{{{ATOM_NS}}}updated") == edited["updated"]
+    assert datetime.fromisoformat(edited["updated"]) > parsedate_to_datetime(edited_entry.findtext("pubDate"))
+    assert sum(entry.find(f"{{{ATOM_NS}}}updated") is not None for entry in entries.values()) == 1
+    assert "Upravené položky: 1" in (tmp_path / "rss_update_log.md").read_text("utf-8")
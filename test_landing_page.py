@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test statického přehledu novinek s přírůstkovým vykreslováním sekcí (bez přístupu na síť)
+"""
+
+import json
+from datetime import datetime, timezone
+
+from kosmas_generator import KosmasRSSGenerator
+from landing_page import LandingPage, compile_template
+from rss_generator import H7oRSSGenerator
+
+
+def item(name, date):
+    return {"title": name, "url": f"https://example.com/{name}", "description": "", "date": date}
+
+
+def make_page(tmp_path, h7o_items, kosmas_items):
+    h7o = H7oRSSGenerator(cache_file=str(tmp_path / "h7o.json"))
+    kosmas = KosmasRSSGenerator(cache_file=str(tmp_path / "kosmas.json"))
+    for gen, items in ((h7o, h7o_items), (kosmas, kosmas_items)):
+        with open(gen.cache_file, "w", encoding="utf-8") as f:
+            json.dump(items, f)
+    page = LandingPage(
+        [h7o, kosmas],
+        page_file=str(tmp_path / "preview.html"),
+        state_file=str(tmp_path / "preview_state.json"),
+        max_items=2,
+    )
+    return page, h7o, kosmas
+
+
+def test_compile_template():
+    render = compile_template("<a href=\"{{url}}\">{{title}}</a> { css }")
+    assert render({"url": "u", "title": "T"}) == '<a href="u">T</a> { css }'
+
+
+def test_page_lists_latest_items_per_source(tmp_path):
+    page, h7o, kosmas = make_page(
+        tmp_path,
+        [item("h3", "2026-05-03T00:00:00"), item("h2", "2026-05-02T00:00:00"),
+         item("h1", "2026-05-01T00:00:00")],
+        [item("k<1>", "2026-05-04T00:00:00+00:00")],
+    )
+
+    assert page.update(h7o, h7o.load_cache()) == ["h7o", "kosmas"]
+    html = (tmp_path / "preview.html").read_text(encoding="utf-8")
+
+    assert "Položek: 3" in html and "Položek: 1" in html
+    assert "h3" in html and "h2" in html and "h1<" not in html
+    assert "k&lt;1&gt;" in html
+    assert html.index('id="h7o"') < html.index('id="kosmas"')
+
+
+def test_only_changed_sections_are_rerendered(tmp_path):
+    page, h7o, kosmas = make_page(
+        tmp_path,
+        [item("h1", "2026-05-01T00:00:00")],
+        [item("k1", "2026-05-01T00:00:00+00:00")],
+    )
+    first = datetime(2026, 5, 1, 6, 0, tzinfo=timezone.utc)
+    page.update(h7o, h7o.load_cache(), now=first)
+
+    # Beze změny dat se nic nepřegeneruje
+    assert page.update(kosmas, kosmas.load_cache()) == []
+
+    fresh = [item("k2", "2026-05-02T00:00:00+00:00"), item("k1", "2026-05-01T00:00:00+00:00")]
+    later = datetime(2026, 5, 2, 6, 0, tzinfo=timezone.utc)
+    assert page.update(kosmas, fresh, now=later) == ["kosmas"]
+
+    state = json.loads((tmp_path / "preview_state.json").read_text(encoding="utf-8"))
+    assert state["h7o"]["updated"] == "2026-05-01 06:00"
+    assert state["kosmas"]["updated"] == "2026-05-02 06:00"
+    html = (tmp_path / "preview.html").read_text(encoding="utf-8")
+    assert "k2" in html and state["h7o"]["html"] in html
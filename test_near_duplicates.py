@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test detekce téměř duplicitních položek
+"""
+
+from near_duplicates import NearDuplicateIndex, NearDuplicateStore, collapse_new_items
+
+
+def book(n, title, authors):
+    return {"title": title, "url": f"https://www.kosmas.cz/knihy/{n}/", "authors": authors}
+
+
+def test_edition_variants_are_collapsed():
+    cached = [book(1, "Duna", ["Frank Herbert"])]
+    new = [
+        book(2, "Duna (kartonová obálka)", ["Frank Herbert"]),
+        book(3, "DUNA - 2. vydání", ["Frank  Herbert"]),
+        book(4, "Duna", ["Brian Herbert"]),
+    ]
+    kept, collapsed = collapse_new_items(cached, new, {})
+    assert [item["url"] for item in kept] == [new[2]["url"]]
+    assert [dup["url"] for _, dup in collapsed] == [cached[0]["url"]] * 2
+
+
+def test_similar_long_titles_use_simhash():
+    index = NearDuplicateIndex()
+    original = {
+        "title": "Rozhovor o nové české próze a jejích čtenářích",
+        "url": "https://www.h7o.cz/clanky/rozhovor",
+        "author": "Jan Němec",
+    }
+    index.add(original)
+    republished = dict(original, title="Rozhovor o nové české próze a jejích čtenářích!", url="x")
+    assert index.find(republished) is original
+    # Jiný díl série se liší slovem - není duplicita
+    other = dict(original, title="Rozhovor o nové slovenské próze a jejích čtenářích", url="y")
+    assert index.find(other) is None
+
+
+def test_collapse_rules():
+    cached = [book(1, "Postava (Personnage)", ["Matouš Erik Bezděk"])]
+    new = [book(2, "Postava (Personnage)", [])]
+    assert collapse_new_items(cached, new, {})[0] == []
+    assert collapse_new_items(cached, new, {"allow_missing_author": False})[0] == new
+    # Vypnuté slučování
+    assert collapse_new_items(cached, new, None) == (new, [])
+
+
+def test_store_keeps_history_outside_cache(tmp_path):
+    """Trvalý index porovnává i s položkami, které už v cache nejsou"""
+    path = str(tmp_path / "duplicates.sqlite")
+    essay = book(5, "Rozhovor o nové české próze a jejích čtenářích", ["Jan Němec"])
+    store = NearDuplicateStore(path, {})
+    kept, _ = collapse_new_items([book(1, "Duna", ["Frank Herbert"])], [essay], {}, store)
+    assert kept == [essay]
+    store.close()
+
+    # Cache je po retenci prázdná, index se z ní znovu nenačítá
+    store = NearDuplicateStore(path, {})
+    new = [
+        book(2, "Duna (vázaná)", ["Frank Herbert"]),
+        book(6, "Rozhovor o nové české próze a jejích čtenářích!", ["Jan Němec"]),
+        essay,
+    ]
+    kept, collapsed = collapse_new_items([], new, {}, store)
+    assert kept == [essay]
+    assert [dup["url"] for _, dup in collapsed] == [book(1, "", [])["url"], essay["url"]]
+    store.close()
+
+    # Jiná pravidla = nové klíče; index se vyprázdní a naplní z cache
+    store = NearDuplicateStore(path, {"max_distance": 0})
+    assert store.is_empty()
+    store.close()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test souběžných výstupů po běhu a výstupu do objektového úložiště (bez přístupu na síť)
+"""
+
+import json
+import threading
+import time
+
+from output_sinks import ObjectStoreSink, OutputSinks, RenderedItems, after_outputs
+from test_parse_pool import FakeKosmasGenerator, kosmas_page_html
+
+
+class Source:
+    def __init__(self, source_id):
+        self.source_id = source_id
+        self.rss_file = f"{source_id}.xml"
+
+
+def test_sinks_run_concurrently_and_shared_sink_keeps_order():
+    sinks = OutputSinks()
+    calls = []
+
+    def slow(generator, items):
+        time.sleep(0.2)
+
+    def shared(generator, items):
+        calls.append((generator.source_id, type(items)))
+
+    start = time.perf_counter()
+    first = sinks.publish(Source("a"), [{"url": "u"}], [slow, shared])
+    second = sinks.publish(Source("b"), [], [slow, shared])
+    first.wait()
+    second.wait()
+
+    # Dva běhy pomalého výstupu jdou po sobě, ostatní výstupy na ně nečekají
+    assert 0.4 <= time.perf_counter() - start < 0.6
+    assert [source for source, _ in calls] == ["a", "b"]
+    assert calls[0][1] is RenderedItems
+
+
+def test_after_outputs_sink_runs_after_other_sinks():
+    sinks = OutputSinks()
+    calls = []
+
+    def aggregate(generator, items):
+        time.sleep(0.1)
+        calls.append("aggregate")
+
+    def hub(generator, items):
+        calls.append("hub")
+
+    # Ping hubu je v seznamu dřív, ale čeká na zápis souhrnného feedu
+    sinks.publish(Source("a"), [], [after_outputs(hub), aggregate]).wait()
+    assert calls == ["aggregate", "hub"]
+
+
+def test_run_does_not_wait_for_sinks(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    release = threading.Event()
+    seen = []
+
+    def slow(generator, items):
+        release.wait(5)
+        seen.append(len(items))
+
+    def failing(generator, items):
+        raise RuntimeError("úložiště nedostupné")
+
+    generator = FakeKosmasGenerator([kosmas_page_html(1)])
+    generator.after_run.extend([slow, failing])
+    generator.run()
+
+    # Cache a feed jsou zapsané, výstup ještě běží
+    assert (tmp_path / "kosmas_cache.json").exists()
+    assert seen == []
+    release.set()
+    generator.publication.wait()
+    assert seen == [4]
+    assert "úložiště nedostupné" in capsys.readouterr().out
+
+
+def test_object_store_writes_objects_once(tmp_path):
+    store = ObjectStoreSink(str(tmp_path / "store"))
+    source = Source("h7o")
+    source.rss_file = str(tmp_path / "feed.xml")
+    (tmp_path / "feed.xml").write_text("<rss/>", encoding="utf-8")
+    items = RenderedItems([{"url": "u", "title": "Článek", "date_obj": object()}])
+
+    store.on_source_run(source, items)
+    meta_path = tmp_path / "store" / "h7o" / "items.json.meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+
+    assert json.loads((tmp_path / "store" / "h7o" / "items.json").read_bytes()) == [
+        {"url": "u", "title": "Článek"}
+    ]
+    assert (tmp_path / "store" / "h7o" / "feed.xml").read_text(encoding="utf-8") == "<rss/>"
+    assert meta["size"] == len(items.json)
+    # Stejný obsah se znovu nezapisuje
+    assert not store.put("h7o/items.json", items.json, "application/json")
+    assert store.put("h7o/items.json", b"[]", "application/json")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test paralelního parsování stránek v procesovém poolu (bez přístupu na síť)
+"""
+
+from datetime import datetime, timedelta
+from rss_generator import H7oRSSGenerator
+from kosmas_generator import KosmasRSSGenerator
+
+
+def h7o_page_html(page_num, count=5, days_step=3, has_next=True):
+    """Vytvoří HTML stránky H7O s články seřazenými od nejnovějšího"""
+    parts = ["<html><body>"]
+    for i in range(count):
+        n = (page_num - 1) * count + i
+        date = datetime.now() - timedelta(days=n * days_step)
+        parts.append(
+            f'<div class="article">'
+            f'<h3 class="article__heading">Článek {n}</h3>'
+            f'<a class="article__link" href="/clanky/{n}-clanek">více</a>'
+            f'<div class="article__date">{date.strftime("%d/%m/%Y")}</div>'
+            f'<p class="article__perex">Perex {n}</p>'
+            f'<div class="article__author">Autor {n % 3}</div>'
+            f'<div class="article__category">recenze</div>'
+            f'</div>'
+        )
+    if has_next:
+        parts.append('<a href="?next">Další</a>')
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def kosmas_page_html(page_num, count=4):
+    """Vytvoří HTML stránky Kosmas s novinkami"""
+    parts = ['<html><body><div class="grid-items__pagenumber">']
+    for i in range(count):
+        n = (page_num - 1) * count + i
+        parts.append(
+            f'<div class="grid-item">'
+            f'<h3 class="g-item__title"><a href="/knihy/{n}/kniha/">Kniha {n}</a></h3>'
+            f'<span class="titul-author"><a>Autor {n}</a></span>'
+            f'</div>'
+        )
+    parts.append('</div><a href="?page=2">Další</a></body></html>')
+    return "".join(parts).encode("utf-8")
+
+
+class FakeH7oGenerator(H7oRSSGenerator):
+    def __init__(self, pages, **kwargs):
+        super().__init__(base_url="https://www.h7o.cz/clanky", **kwargs)
+        self.pages = pages
+        self.fetched = []
+
+    def fetch_raw(self, page_num=1):
+        self.fetched.append(page_num)
+        if page_num > len(self.pages):
+            return None
+        return self.pages[page_num - 1], "utf-8"
+
+
+class FakeKosmasGenerator(KosmasRSSGenerator):
+    def __init__(self, pages, **kwargs):
+        super().__init__(base_url="https://www.kosmas.cz/novinky/", **kwargs)
+        self.pages = pages
+
+    def fetch_raw(self, page_num=1):
+        if page_num > len(self.pages):
+            return None
+        return self.pages[page_num - 1], "utf-8"
+
+
+def test_h7o_pool_matches_sequential():
+    """Pipeline s poolem vrací stejné články jako sekvenční průchod"""
+    pages = [h7o_page_html(p) for p in range(1, 5)]
+
+    sequential = FakeH7oGenerator(pages).fetch_all_items(max_pages=4)
+    pooled = FakeH7oGenerator(pages, workers=2).fetch_all_items(max_pages=4)
+
+    assert [a["url"] for a in pooled] == [a["url"] for a in sequential]
+    assert len(pooled) == 20
+
+
+def test_h7o_pool_early_stop_on_cached():
+    """Early stop funguje i při paralelním parsování"""
+    pages = [h7o_page_html(p) for p in range(1, 10)]
+    gen = FakeH7oGenerator(pages, workers=2)
+    cached_urls = {"https://www.h7o.cz/clanky/7-clanek"}
+
+    articles = gen.fetch_all_items(max_pages=9, cached_urls=cached_urls)
+
+    # Stránka 2 obsahuje článek z cache, starší stránky se nezpracují
+    assert [a["url"].rsplit("/", 1)[1] for a in articles] == [
+        f"{n}-clanek" for n in range(10) if n != 7
+    ]
+    # Stažené dopředu smí být nejvýše tolik stránek, kolik je procesů
+    assert max(gen.fetched) <= 4
+
+
+def test_kosmas_pool_matches_sequential():
+    """Kosmas pipeline zachová časové značky podle stránek"""
+    pages = [kosmas_page_html(p) for p in range(1, 4)]
+
+    sequential = FakeKosmasGenerator(pages).fetch_all_items(max_pages=3)
+    pooled = FakeKosmasGenerator(pages, workers=2).fetch_all_items(max_pages=3)
+
+    assert [i["url"] for i in pooled] == [i["url"] for i in sequential]
+    assert len(pooled) == 12
+    # Položky ze starší stránky mají starší datum
+    assert pooled[4]["date"] < pooled[3]["date"]
+
+
+if __name__ == "__main__":
+    test_h7o_pool_matches_sequential()
+    test_h7o_pool_early_stop_on_cached()
+    test_kosmas_pool_matches_sequential()
+    print("✅ Všechny testy prošly")
+
+
+def test_worker_reuses_compiled_parser():
+    """Proces poolu staví parser zdroje jednou, ne pro každou stránku"""
+    from source_engine import _parse_page_worker, _worker_parser
+
+    config = dict(H7oRSSGenerator().config)
+    parser = _worker_parser(config)
+    items, has_next = _parse_page_worker(h7o_page_html(1), "utf-8", 1, config, None)
+    assert len(items) == 5 and has_next
+    assert _worker_parser(dict(config)) is parser
+    # Změněná konfigurace zdroje se zkompiluje znovu
+    assert _worker_parser(dict(config, max_pages=3)) is not parser
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test proudového zpracování položek (bez přístupu na síť)
+"""
+
+import json
+from itertools import islice
+
+from pipeline import (
+    ensure_newest_first,
+    iter_json_array,
+    merge_newest_first,
+    unique_by_url,
+    write_json_stream,
+)
+from test_parse_pool import FakeH7oGenerator, h7o_page_html
+
+
+def test_json_stream_matches_json_dump(tmp_path):
+    items = [{"title": "Článek", "authors": ["A", "B"], "date_obj": object()}, {"title": "Druhý"}]
+    path = tmp_path / "cache.json"
+    assert write_json_stream(str(path), items, exclude=("date_obj",)) == 2
+    expected = [{k: v for k, v in item.items() if k != "date_obj"} for item in items]
+    assert path.read_text("utf-8") == json.dumps(expected, ensure_ascii=False, indent=2)
+
+    write_json_stream(str(path), iter([]))
+    assert json.loads(path.read_text("utf-8")) == []
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]
+
+
+def test_json_array_is_read_item_by_item(tmp_path):
+    items = [{"title": f"Článek {n}", "tags": ["a", "b"], "text": "x" * n} for n in range(20)]
+    path = tmp_path / "cache.json"
+    write_json_stream(str(path), items)
+    # Malé bloky - prvky přesahují hranice bloků
+    assert list(iter_json_array(str(path), chunk_size=7)) == items
+
+    path.write_text(json.dumps(items), encoding="utf-8")
+    assert list(iter_json_array(str(path), chunk_size=5)) == items
+    path.write_text("[]", encoding="utf-8")
+    assert list(iter_json_array(str(path))) == []
+
+
+def test_merge_and_dedupe():
+    cached = ensure_newest_first([{"url": "a", "date": "2026-05-01"}, {"url": "b", "date": "2026-05-03"}])
+    new = [{"url": "c", "date": "2026-05-02"}, {"url": "c", "date": "2026-05-02"}]
+    merged = merge_newest_first(cached, list(unique_by_url(new)))
+    assert [item["url"] for item in merged] == ["b", "c", "a"]
+
+
+def test_crawl_is_lazy():
+    """Stránky se stahují jen podle toho, kolik článků spotřebitel přečte"""
+    pages = [h7o_page_html(n, count=5, days_step=1) for n in range(1, 6)]
+    gen = FakeH7oGenerator(pages)
+    first = list(islice(gen.iter_new_items(max_pages=5), 3))
+    assert len(first) == 3 and gen.fetched == [1]
+    assert len(gen.fetch_all_items(max_pages=5)) == 25
+
+
+def test_retention_stops_at_first_old_article():
+    gen = FakeH7oGenerator([], max_age_months=1)
+    articles = [{"date": "2999-01-01T00:00:00"}, {"date": "2000-01-01T00:00:00"}]
+    # Třetí položka se už nečte (bez data by vyvolala chybu)
+    assert list(gen.iter_retained(iter(articles + [{}]))) == articles[:1]
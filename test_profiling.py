@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test profilovacího režimu (bez přístupu na síť)
+"""
+
+import pstats
+import time
+
+from profiling import profiled_run
+from test_parse_pool import FakeH7oGenerator, h7o_page_html
+
+
+def test_profiled_run_writes_pstats_and_phase_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gen = FakeH7oGenerator(
+        [h7o_page_html(1, count=5, has_next=False)], cache_file="cache.json", rss_file="feed.xml"
+    )
+    profiled_run(gen, "profiles")
+
+    pstats_files = list((tmp_path / "profiles").glob("h7o-*.pstats"))
+    assert len(pstats_files) == 1
+    assert pstats.Stats(str(pstats_files[0])).total_calls > 0
+
+    report = next((tmp_path / "profiles").glob("h7o-*.txt")).read_text("utf-8")
+    for phase in ("stahování", "parsování (BeautifulSoup)", "extrakce", "sloučení",
+                  "serializace feedu (feedgen)", "zápis logu"):
+        assert phase in report
+    assert "Největší alokace" in report
+    # Přírůstky paměti po řádcích pod názvem fáze (compare_to snímků kolem volání)
+    assert "Největší přírůstky paměti - sloučení:" in report
+    assert "Největší přírůstky paměti - stahování:" in report
+
+    # Obalení metod se po běhu zruší
+    assert "fetch_raw" not in vars(gen)
+    assert "make_logger" not in vars(gen)
+    assert (tmp_path / "feed.xml").exists()
+
+
+def test_profiled_run_waits_for_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    gen = FakeH7oGenerator(
+        [h7o_page_html(1, count=5, has_next=False)], cache_file="cache.json", rss_file="feed.xml"
+    )
+    done = []
+
+    def slow_output(generator, items):
+        time.sleep(0.2)
+        done.append(len(items))
+
+    gen.after_run.append(slow_output)
+    profiled_run(gen, "profiles")
+
+    # Výstup doběhl uvnitř profilovaného okna a čekání je v reportu
+    assert done == [5]
+    report = next((tmp_path / "profiles").glob("h7o-*.txt")).read_text("utf-8")
+    assert "navazující výstupy (čekání)" in report
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test push oznámení: WebSub hub se zkušebním odběratelem na localhostu
+"""
+
+import hashlib
+import hmac
+import http.server
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from push_hub import EventBroker, HubNotifier, PushHub
+from server import poll_response
+
+
+@pytest.fixture
+def stub(tmp_path):
+    """Lokální server se zkušebním odběratelem (/callback) a hubem (/hub)"""
+    received = []
+    state = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def reply(self, body, status=200):
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            # Ověření záměru: odběratel vrátí hub.challenge
+            params = parse_qs(urlsplit(self.path).query)
+            self.reply(params["hub.challenge"][0].encode("utf-8"))
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.path == "/hub":
+                status, message = state["hub"].handle_request(
+                    parse_qs(body.decode("utf-8")), background=False
+                )
+                self.reply(message.encode("utf-8"), status)
+            else:
+                received.append((dict(self.headers), body))
+                self.reply(b"")
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    state["hub"] = PushHub(tmp_path, f"{base}/hub")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base, state["hub"], received
+    server.shutdown()
+    server.server_close()
+
+
+class Generator:
+    source_id = "h7o"
+    rss_file = "h7o_feed.xml"
+    changed_items = []
+
+
+def test_subscribe_and_deliver(stub, tmp_path):
+    base, hub, received = stub
+    topic = f"{base}/h7o_feed.xml"
+    (tmp_path / "h7o_feed.xml").write_bytes(b"<rss>nova verze</rss>")
+
+    form = {
+        "hub.mode": ["subscribe"],
+        "hub.topic": [topic],
+        "hub.callback": [f"{base}/callback"],
+        "hub.secret": ["tajne"],
+    }
+    assert hub.handle_request(form, background=False)[0] == 202
+    assert list(hub.subscribers(topic)) == [f"{base}/callback"]
+    # Odběry přežijí restart hubu
+    assert list(PushHub(tmp_path, hub.hub_url).subscribers(topic)) == [f"{base}/callback"]
+
+    # Generátor bez změn hub neinformuje
+    notifier = HubNotifier(f"{base}/hub", extra_files=())
+    generator = Generator()
+    notifier.on_source_run(generator, [])
+    assert received == [] and hub.broker.last_id == 0
+
+    generator.changed_items = [{"url": "x"}]
+    notifier.on_source_run(generator, [])
+    assert hub.broker.last_id == 1
+    headers, body = received[0]
+    assert body == b"<rss>nova verze</rss>"
+    expected = hmac.new(b"tajne", body, hashlib.sha256).hexdigest()
+    assert headers["X-Hub-Signature"] == f"sha256={expected}"
+    assert 'rel="hub"' in headers["Link"]
+
+
+def test_rejects_unknown_topics(tmp_path):
+    hub = PushHub(tmp_path, "http://localhost/hub")
+    assert hub.handle_request({"hub.mode": ["publish"], "hub.url": ["http://x/../etc/passwd"]})[0] == 400
+    assert hub.handle_request({"hub.mode": ["nic"]})[0] == 400
+
+
+def test_long_poll():
+    broker = EventBroker()
+    status, _, body = poll_response(broker, "since=0&timeout=0.01")
+    assert status == 200 and json.loads(body) == {"last_id": 0, "events": []}
+
+    threading.Timer(0.05, broker.publish, args=("http://localhost/kosmas_feed.xml",)).start()
+    result = json.loads(poll_response(broker, "since=0&timeout=5")[2])
+    assert [event["topic"] for event in result["events"]] == ["http://localhost/kosmas_feed.xml"]
+    assert result["last_id"] == 1
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test rychlé kontroly a líného načítání závislostí (bez přístupu na síť)
+"""
+
+import hashlib
+import json
+import subprocess
+import sys
+from datetime import datetime
+from http_transport import Cassette, RecordingTransport, ReplayTransport, Response
+from quick_check import HTTPValidators, is_unchanged
+from rss_generator import H7oRSSGenerator
+
+
+class FirstPageTransport:
+    """Transport s pevnou odpovědí; pamatuje si hlavičky požadavků"""
+
+    def __init__(self, status, content=b"", headers=None):
+        self.status = status
+        self.content = content
+        self.headers = headers
+        self.requests = []
+
+    def get(self, url, timeout=10, headers=None):
+        self.requests.append(headers)
+        return Response(url, self.status, self.content, "utf-8", self.headers)
+
+
+def write_cache(path):
+    article = {
+        "title": "Článek",
+        "url": "https://www.h7o.cz/clanky/1-clanek",
+        "description": "",
+        "date": datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+        "author": "",
+        "category": "",
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([article], f)
+    return [article]
+
+
+def test_heavy_modules_not_imported_at_startup():
+    """Import generate_all nenačte requests, bs4 ani feedgen"""
+    code = (
+        "import sys, generate_all; "
+        "print(sorted(m for m in ('requests', 'bs4', 'feedgen', 'lxml') if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_startup_is_measured_from_process_start():
+    """Doba startu zahrnuje i čas před importem log_utils (start procesu z /proc)"""
+    code = (
+        "import time; time.sleep(0.3); "
+        "import log_utils; print(log_utils.startup_seconds() if log_utils.process_age() is not None else 1)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert 0.3 <= float(output) < 30
+
+
+def test_unchanged_page_skips_run(tmp_path, monkeypatch):
+    """Stejný obsah první stránky ukončí běh bez parsování a zápisu feedu"""
+    monkeypatch.chdir(tmp_path)
+    cached = write_cache("cache.json")
+    validators = HTTPValidators("validators.json")
+    gen = H7oRSSGenerator(
+        cache_file="cache.json", rss_file="feed.xml", quick_check=True, validators=validators,
+        transport=FirstPageTransport(200, b"<html>stejne</html>"),
+    )
+    validators.update(gen.page_url(1), None, None, b"<html>stejne</html>")
+
+    assert is_unchanged(gen, cached, validators)
+
+    gen.run()
+    assert not (tmp_path / "feed.xml").exists()
+    assert "Rychlá kontrola: beze změny" in (tmp_path / "rss_update_log.md").read_text("utf-8")
+
+
+def test_not_modified_response(tmp_path):
+    """Odpověď 304 znamená beze změny; validátory jdou v podmíněných hlavičkách"""
+    cached = write_cache(str(tmp_path / "cache.json"))
+    validators = HTTPValidators(str(tmp_path / "validators.json"))
+    transport = FirstPageTransport(304)
+    gen = H7oRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"), validators=validators, transport=transport
+    )
+    validators.update(gen.page_url(1), '"abc"', None, b"<html></html>")
+
+    assert is_unchanged(gen, cached, validators)
+    assert transport.requests == [{"If-None-Match": '"abc"'}]
+
+
+def test_changed_page_is_prefetched(tmp_path):
+    """Změněná stránka se předá generátoru a nestahuje se podruhé"""
+    cached = write_cache(str(tmp_path / "cache.json"))
+    validators = HTTPValidators(str(tmp_path / "validators.json"))
+    content = b"<html>nova</html>"
+    gen = H7oRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"), validators=validators,
+        transport=FirstPageTransport(200, content, {"ETag": '"abc"'}),
+    )
+
+    assert not is_unchanged(gen, cached, validators)
+    assert gen.fetch_raw(1) == (content, "utf-8")
+
+    gen.remember_validators()
+    saved = HTTPValidators(str(tmp_path / "validators.json")).get(gen.page_url(1))
+    assert saved["etag"] == '"abc"'
+    assert saved["sha256"] == hashlib.sha256(content).hexdigest()
+
+
+def test_quick_check_records_and_replays(tmp_path):
+    """Rychlá kontrola jde přes transport: nahraje se do kazety a přehraje se jako 304"""
+    cached = write_cache(str(tmp_path / "cache.json"))
+    validators = HTTPValidators(str(tmp_path / "validators.json"))
+    content = b"<html>nova</html>"
+    gen = H7oRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"), validators=validators,
+        transport=RecordingTransport(
+            str(tmp_path / "cassette"), inner=FirstPageTransport(200, content, {"ETag": '"abc"'})
+        ),
+    )
+
+    assert not is_unchanged(gen, cached, validators)
+    assert Cassette(str(tmp_path / "cassette")).urls() == [gen.page_url(1)]
+    gen.fetch_raw(1)
+    gen.remember_validators()
+
+    # Přehrání: uložený ETag sedí na záznam -> 304 bez obsahu
+    gen.transport = ReplayTransport(str(tmp_path / "cassette"), latency=0)
+    assert is_unchanged(gen, cached, validators)
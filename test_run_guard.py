@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test časových limitů a jističů zdrojů (bez přístupu na síť)
+"""
+
+import json
+from datetime import datetime
+
+from http_transport import TransportError
+from run_guard import CircuitBreakers, Deadline, guarded_run
+from rss_generator import H7oRSSGenerator
+
+
+class DownTransport:
+    """Transport nedostupného zdroje"""
+
+    def get(self, url, timeout=10, headers=None):
+        raise TransportError(f"Connection refused: {url}")
+
+
+def write_cache(path):
+    article = {
+        "title": "Článek",
+        "url": "https://www.h7o.cz/clanky/1-clanek",
+        "description": "",
+        "date": datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+        "author": "",
+        "category": "",
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([article], f)
+
+
+class FailingGenerator:
+    source_id = "pomaly"
+    source_name = "Pomalý zdroj"
+
+    def __init__(self):
+        self.runs = 0
+
+    def run(self):
+        self.runs += 1
+        raise RuntimeError("timeout")
+
+
+def test_deadline_respects_parent():
+    total = Deadline(5)
+    assert Deadline(60, parent=total).remaining() <= 5
+    assert Deadline(1, parent=total).timeout(10) <= 1
+    assert Deadline(0).expired()
+
+
+def test_expired_deadline_skips_fetch():
+    gen = H7oRSSGenerator()
+    gen.deadline = Deadline(0)
+    assert gen.fetch_raw(1) is None
+    assert gen.pages_fetched == 0 and gen.fetch_failures == 0
+
+
+def test_unreachable_source_logs_failure(tmp_path, monkeypatch):
+    """Nestažená první stránka je v logu chyba, stejně jako pro jistič; feed je z cache"""
+    monkeypatch.chdir(tmp_path)
+    write_cache("cache.json")
+    breakers = CircuitBreakers("breakers.json", failure_threshold=1)
+    gen = H7oRSSGenerator(cache_file="cache.json", rss_file="feed.xml", transport=DownTransport())
+
+    assert guarded_run(gen, breakers) == "failed"
+    log = (tmp_path / "rss_update_log.md").read_text("utf-8")
+    assert "❌ Chyba" in log and "✅" not in log
+    assert not breakers.allow(gen.source_id)
+    assert (tmp_path / "feed.xml").exists()
+
+
+def test_expired_deadline_logs_skip(tmp_path, monkeypatch):
+    """Vypršený časový limit před první stránkou je přeskočení, ne úspěch"""
+    monkeypatch.chdir(tmp_path)
+    write_cache("cache.json")
+    gen = H7oRSSGenerator(cache_file="cache.json", rss_file="feed.xml", transport=DownTransport())
+    gen.deadline = Deadline(0)
+
+    gen.run()
+    log = (tmp_path / "rss_update_log.md").read_text("utf-8")
+    assert "⏸ Přeskočeno" in log and "vypršel časový limit" in log
+    assert "✅" not in log
+
+
+def test_breaker_opens_and_persists(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    breakers = CircuitBreakers("breakers.json", failure_threshold=2, cooldown_seconds=100)
+    gen = FailingGenerator()
+
+    assert guarded_run(gen, breakers) == "failed"
+    assert guarded_run(gen, breakers) == "failed"
+    # Jistič je otevřený i po "restartu" (stav v souboru)
+    reloaded = CircuitBreakers("breakers.json", failure_threshold=2, cooldown_seconds=100)
+    assert guarded_run(gen, reloaded) == "skipped"
+    assert gen.runs == 2
+    assert "Přeskočeno: jistič otevřen" in (tmp_path / "rss_update_log.md").read_text("utf-8")
+
+    # Po vychladnutí jeden pokus; další selhání zdvojnásobí dobu vychladnutí
+    opened = reloaded.get("pomaly")["open_until"]
+    assert reloaded.allow("pomaly", now=opened + 1)
+    state = reloaded.record_failure("pomaly", now=opened + 1)
+    assert state["open_until"] == opened + 1 + 200
+    reloaded.record_success("pomaly")
+    assert reloaded.allow("pomaly")
+
+
+def test_failed_source_sets_exit_status():
+    """Selhaný zdroj ukončí generate_all nenulovým kódem (CI běh zčervená)"""
+    from generate_all import print_summary
+
+    assert print_summary({"H7O": "ok", "Kosmas": "skipped"}) == 0
+    assert print_summary({"H7O": "ok", "Kosmas": "failed"}) == 1
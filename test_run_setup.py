@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Test zapojení generátorů z CLI - volby, navazující výstupy a archiv (bez přístupu na síť)
+"""
+
+import argparse
+
+import generate_all
+from output_sinks import AfterOutputs
+from run_setup import add_run_arguments, run_options
+
+
+def parse(argv):
+    parser = argparse.ArgumentParser()
+    add_run_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_generate_all_shares_its_generators_with_sinks(monkeypatch):
+    """Souhrnný feed a přehled čtou generátory běhu - žádná druhá sada generátorů"""
+    def unexpected():
+        raise AssertionError("default_generators se nemá volat")
+
+    monkeypatch.setattr("run_setup.default_generators", unexpected)
+    args = parse(["--hub", "http://localhost:8000/hub", "--snapshots"])
+    generators = generate_all.build_generators(args, executor=None)
+
+    assert generators
+    aggregate, facets, search, landing, hub = generators[0].after_run
+    assert aggregate.__self__.generators is generators
+    assert landing.__self__.generators is generators
+    assert isinstance(hub, AfterOutputs)
+    # Archiv a úložiště snímků sdílí všechny zdroje
+    assert generators[0].archive is generators[-1].archive
+    assert generators[0].snapshot_store is generators[-1].snapshot_store
+
+
+def test_shared_executor_replaces_workers():
+    options = run_options(parse(["--workers", "4"]), sources=[], executor="pool")
+    assert options["executor"] == "pool"
+    assert options["workers"] is None
+    assert run_options(parse(["--workers", "4"]), sources=[])["workers"] == 4
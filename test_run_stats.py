@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test průběžných statistik běhů (bez přístupu na síť)
+"""
+
+import json
+
+from log_utils import RSSLogger
+from run_stats import RunStats, bucket_index, bucket_value, new_source_stats, quantile, record
+from server import stats_response
+
+
+def test_log_run_updates_stats_and_html(tmp_path):
+    logger = RSSLogger(str(tmp_path / "rss_update_log.md"))
+    logger.log_run("H7O", 3, ["a", "b", "c"], duration_seconds=2.0, pages_fetched=1)
+    logger.log_run("H7O", 0, error="timeout", duration_seconds=30.0, pages_fetched=0)
+    logger.log_run("Kosmas.cz", 5, duration_seconds=4.0, pages_fetched=2)
+
+    summary = RunStats(str(tmp_path / "run_stats.json")).summary()
+    assert summary["H7O"]["runs"] == 2
+    assert summary["H7O"]["failures"] == 1
+    assert summary["H7O"]["new_items_total"] == 3
+    assert summary["H7O"]["last_error"] == "timeout"
+    assert 0.49 < summary["H7O"]["failure_rate"] < 0.52
+    assert summary["Kosmas.cz"]["pages_total"] == 2
+
+    page = (tmp_path / "stats.html").read_text(encoding="utf-8")
+    assert "<td>H7O</td>" in page and "<td>Kosmas.cz</td>" in page
+
+
+def test_duration_quantiles_from_histogram():
+    stats = new_source_stats()
+    for i in range(100):
+        record(stats, duration_seconds=1.0 if i < 90 else 60.0)
+
+    # Koše mají šířku čtvrtiny binárního řádu - odhad je v rámci ~9 %
+    assert abs(quantile(stats["durations"], 0.5) - 1.0) < 0.1
+    assert abs(quantile(stats["durations"], 0.95) - 60.0) < 6.0
+    assert bucket_index(0.001) == 0
+    assert bucket_value(bucket_index(10.0)) < 10.0 * 1.1
+
+
+def test_rolling_values_favor_recent_runs():
+    stats = new_source_stats()
+    for _ in range(300):
+        record(stats, error="chyba")
+    for _ in range(300):
+        record(stats, new_items_count=2)
+
+    # Celkové počty zůstávají, klouzavý podíl selhání už starou sérii skoro zapomněl
+    assert stats["failures"] == 300
+    assert stats["weighted_failures"] / stats["weight"] < 0.06
+    assert 1.9 < stats["weighted_new_items"] / stats["weight"] <= 2.0
+
+
+def test_stats_response(tmp_path):
+    run_stats = RunStats(str(tmp_path / "run_stats.json"), html_file=None)
+    run_stats.update("H7O", 1, duration_seconds=1.5, pages_fetched=1)
+
+    status, content_type, body = stats_response(run_stats, "")
+    assert status == 200 and content_type.startswith("application/json")
+    assert json.loads(body)["sources"]["H7O"]["runs"] == 1
+
+    assert stats_response(run_stats, "source=H7O")[0] == 200
+    assert stats_response(run_stats, "source=nic")[0] == 404
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test fulltextového indexu a endpointu /search (bez přístupu na síť)
+"""
+
+import json
+
+from search_index import SearchIndex, build_match_query
+from server import search_response
+
+
+def article(n, title, day, author="Jan Němec", category="recenze"):
+    return {
+        "title": title,
+        "url": f"https://www.h7o.cz/clanky/{n}",
+        "description": f"Popis článku {n}",
+        "date": f"2026-05-{day:02d}T00:00:00",
+        "category": category,
+        "author": author,
+    }
+
+
+def test_match_query_is_sanitized():
+    assert build_match_query('Čapek AND "NEAR(') == '"Čapek"* "AND"* "NEAR"*'
+    assert build_match_query("  -*  ") == ""
+
+
+def test_incremental_sync_and_search(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.sqlite"))
+    items = [
+        article(1, "Recenze románu Válka s mloky", 1),
+        article(2, "Rozhovor s překladatelkou", 2, author="Eva Malá", category="rozhovor"),
+    ]
+    assert index.sync_source("h7o", items) == (2, 0, 0)
+    assert index.sync_source("h7o", items) == (0, 0, 0)
+
+    # Bez diakritiky, prefixem, přes autora i kategorii
+    assert [r["url"] for r in index.search("valka mlok")] == [items[0]["url"]]
+    assert [r["url"] for r in index.search("eva")] == [items[1]["url"]]
+    assert len(index.search("recenze")) == 1
+
+    # Kosmas - seznam autorů, filtr podle zdroje
+    book = {
+        "title": "Krakatit",
+        "url": "https://www.kosmas.cz/knihy/1/krakatit/",
+        "description": "",
+        "date": "2026-05-03T00:00:00",
+        "authors": ["Karel Čapek"],
+    }
+    index.sync_source("kosmas", [book])
+    assert [r["source"] for r in index.search("capek")] == ["kosmas"]
+    assert index.search("capek", source="h7o") == []
+
+    # Změna titulku a vypadnutí položky z cache
+    edited = dict(items[1], title="Rozhovor s básnířkou")
+    assert index.sync_source("h7o", [edited]) == (0, 1, 1)
+    assert index.search("valka") == []
+    assert index.search("prekladatelkou") == []
+    assert [r["title"] for r in index.search("basnirkou")] == ["Rozhovor s básnířkou"]
+    index.close()
+
+
+def test_search_response_formats(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.sqlite"))
+    index.sync_source("h7o", [article(1, "Jaro", 1), article(2, "Jarní recenze", 2)])
+
+    status, content_type, body = search_response(index, "q=jar&format=json")
+    assert status == 200 and content_type.startswith("application/json")
+    results = json.loads(body)["results"]
+    assert [r["title"] for r in results] == ["Jarní recenze", "Jaro"]
+
+    status, content_type, body = search_response(index, "q=jar")
+    assert status == 200 and b"<rss" in body and "Jarní recenze".encode("utf-8") in body
+
+    assert search_response(index, "q=")[0] == 400
+    assert search_response(index, "q=jar&format=csv")[0] == 400
+    assert search_response(index, "q=jar&limit=abc")[0] == 400
+    # Limit se drží v rozsahu 1-200 (záporný neznamená „bez omezení“)
+    assert len(json.loads(search_response(index, "q=jar&format=json&limit=-1")[2])["results"]) == 1
+    index.close()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test trvalé množiny viděných URL (bez přístupu na síť)
+"""
+
+import json
+
+from seen_urls import HASH_SIZE, SeenURLs
+from test_parse_pool import FakeH7oGenerator, FakeKosmasGenerator, h7o_page_html, kosmas_page_html
+
+
+def test_persisted_sorted_hashes(tmp_path):
+    path = str(tmp_path / "seen.bin")
+    seen = SeenURLs(path)
+    seen.update(f"https://example.cz/{n}" for n in range(100))
+    assert "https://example.cz/5" in seen
+    seen.save()
+    seen.update(f"https://example.cz/{n}" for n in range(50, 150))
+    seen.save()
+    seen.close()
+
+    reopened = SeenURLs(path)
+    assert len(reopened) == 150
+    assert all(f"https://example.cz/{n}" in reopened for n in range(150))
+    assert "https://example.cz/150" not in reopened
+    data = (tmp_path / "seen.bin").read_bytes()
+    keys = [data[i:i + HASH_SIZE] for i in range(0, len(data), HASH_SIZE)]
+    assert keys == sorted(keys)
+    reopened.close()
+
+
+def test_wiped_cache_is_rebuilt(tmp_path, monkeypatch):
+    """Po smazání cache se znovu stáhnou všechny články (viděné URL nezastaví procházení)"""
+    monkeypatch.chdir(tmp_path)
+    pages = [h7o_page_html(p, has_next=p < 3) for p in range(1, 4)]
+    FakeH7oGenerator(pages, cache_file="cache.json", rss_file="feed.xml").run()
+    assert len(json.loads((tmp_path / "cache.json").read_text("utf-8"))) == 15
+
+    (tmp_path / "cache.json").unlink()
+    gen = FakeH7oGenerator(pages, cache_file="cache.json", rss_file="feed.xml")
+    gen.run()
+    assert len(json.loads((tmp_path / "cache.json").read_text("utf-8"))) == 15
+    assert gen.fetched == [1, 2, 3]
+
+
+def test_recent_article_missing_from_cache_returns(tmp_path, monkeypatch):
+    """Novější článek, který v cache chybí (retence ho neodstranila), se vrátí"""
+    monkeypatch.chdir(tmp_path)
+    page = h7o_page_html(1, count=3, has_next=False)
+    FakeH7oGenerator([page], cache_file="cache.json", rss_file="feed.xml").run()
+
+    cache = json.loads((tmp_path / "cache.json").read_text("utf-8"))
+    missing = cache.pop()
+    (tmp_path / "cache.json").write_text(json.dumps(cache), "utf-8")
+
+    gen = FakeH7oGenerator([page], cache_file="cache.json", rss_file="feed.xml")
+    gen.run()
+    urls = [a["url"] for a in json.loads((tmp_path / "cache.json").read_text("utf-8"))]
+    assert missing["url"] in urls
+
+
+def test_pruned_item_is_not_republished(tmp_path, monkeypatch):
+    """Položka prořezaná retencí max_items se z první stránky znovu nepublikuje"""
+    monkeypatch.chdir(tmp_path)
+    page = kosmas_page_html(1, count=4)
+    options = dict(cache_file="cache.json", rss_file="feed.xml", max_items=3)
+    FakeKosmasGenerator([page], max_pages=1, **options).run()
+    cache = json.loads((tmp_path / "cache.json").read_text("utf-8"))
+    assert len(cache) == 3
+
+    gen = FakeKosmasGenerator([page], **options)
+    gen.run()
+    assert json.loads((tmp_path / "cache.json").read_text("utf-8")) == cache
+    assert gen.changed_items == []
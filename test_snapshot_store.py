@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test úložiště snímků stránek a offline replay (bez přístupu na síť)
+"""
+
+import json
+import os
+from feed_archive import FeedArchive
+from first_seen import iso_date
+from rss_generator import H7oRSSGenerator
+from kosmas_generator import KosmasRSSGenerator
+from snapshot_store import SnapshotStore
+from replay_snapshots import available_generators, replay_source
+from test_parse_pool import h7o_page_html, kosmas_page_html
+
+
+def count_objects(root):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(root, "objects")))
+
+
+def test_identical_pages_stored_once(tmp_path):
+    """Stejný obsah se uloží jen jednou, manifest má záznam pro každou stránku"""
+    store = SnapshotStore(str(tmp_path))
+    run = store.start_run("h7o")
+    page = h7o_page_html(1)
+
+    first = run.record(1, "https://www.h7o.cz/clanky", page, "utf-8")
+    second = run.record(2, "https://www.h7o.cz/clanky?p=2", page, "utf-8")
+    # Manifest se zapíše jednou na konci běhu
+    assert store.list_runs("h7o") == []
+    store.finish_run(run)
+
+    assert first == second
+    assert count_objects(str(tmp_path)) == 1
+    assert store.get(first) == page
+
+    manifest = store.load_manifest("h7o", run.run_id)
+    assert [p["page_num"] for p in manifest["pages"]] == [1, 2]
+
+
+def test_h7o_replay_rebuilds_cache_and_feed(tmp_path):
+    """Replay z uložených snímků vytvoří cache a RSS bez stahování"""
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    gen = H7oRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"),
+        rss_file=str(tmp_path / "feed.xml"),
+        snapshot_store=store,
+    )
+    for page_num in (1, 2):
+        gen.record_snapshot(page_num, gen.page_url(page_num), h7o_page_html(page_num), "utf-8")
+    gen.finish_snapshots()
+
+    items = replay_source(gen, store)
+
+    assert len(items) == 10
+    with open(gen.cache_file, encoding="utf-8") as f:
+        cache = json.load(f)
+    assert len(cache) == 10
+    assert "date_obj" not in cache[0]
+    assert os.path.exists(gen.rss_file)
+
+
+def test_replay_publishes_archive_window(tmp_path, monkeypatch):
+    """Replay zapíše odebíraný feed jako aktuální okno archivu a cache pod zámkem"""
+    monkeypatch.chdir(tmp_path)
+    store = SnapshotStore("snapshots")
+    archive = FeedArchive("archive", page_size=3, current_size=2)
+    gen = H7oRSSGenerator(
+        cache_file="cache.json", rss_file="feed.xml", snapshot_store=store, archive=archive
+    )
+    for page_num in (1, 2):
+        gen.record_snapshot(page_num, gen.page_url(page_num), h7o_page_html(page_num), "utf-8")
+    gen.finish_snapshots()
+
+    items = replay_source(gen, store)
+
+    assert len(items) == 10
+    with open("feed.xml", encoding="utf-8") as f:
+        feed = f.read()
+    assert "prev-archive" in feed
+    assert feed.count("<item>") < 10
+    assert (tmp_path / "archive" / "h7o" / "page-0001.xml").exists()
+    assert (tmp_path / "cache.json.lock").exists()
+
+
+def test_replay_generators_are_wired_like_a_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generators = available_generators()
+
+    assert generators["h7o"].archive is not None
+    assert generators["kosmas"].first_seen is not None
+    aggregate = generators["h7o"].after_run[0].__self__
+    assert {g.source_id for g in aggregate.generators} >= {"h7o", "kosmas"}
+
+
+def test_kosmas_replay_uses_first_seen_index(tmp_path):
+    """Položka známá z indexu prvního výskytu dostane jeho datum, ne čas snímku"""
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    gen = KosmasRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"),
+        rss_file=str(tmp_path / "feed.xml"),
+        snapshot_store=store,
+        first_seen_file=str(tmp_path / "first_seen.bin"),
+    )
+    known = {"url": "https://www.kosmas.cz/knihy/0/kniha/", "date": None}
+    gen.first_seen.assign([known], now=1_700_000_000)
+    gen.first_seen.save()
+    gen.record_snapshot(1, gen.page_url(1), kosmas_page_html(1), "utf-8")
+    gen.finish_snapshots()
+
+    items = replay_source(gen, store)
+
+    dates = {item["url"]: item["date"] for item in items}
+    assert dates[known["url"]] == iso_date(1_700_000_000)
+    assert items[-1]["url"] == known["url"]
+
+
+def test_kosmas_replay_keeps_first_seen_date(tmp_path):
+    """Položka z více běhů si ponechá datum z prvního výskytu"""
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    gen = KosmasRSSGenerator(
+        cache_file=str(tmp_path / "cache.json"),
+        rss_file=str(tmp_path / "feed.xml"),
+        snapshot_store=store,
+    )
+    gen.record_snapshot(1, gen.page_url(1), kosmas_page_html(1), "utf-8")
+    first_run = gen._snapshot_run.run_id
+    gen.finish_snapshots()
+    gen.record_snapshot(1, gen.page_url(1), kosmas_page_html(1), "utf-8")
+    gen.finish_snapshots()
+
+    items = replay_source(gen, store, dry_run=True)
+    first_only = replay_source(gen, store, run_ids=[first_run], dry_run=True)
+
+    assert len(items) == 4
+    assert [i["date"] for i in items] == [i["date"] for i in first_only]
+    assert count_objects(str(tmp_path / "snapshots")) == 1
+
+
+def test_old_runs_and_unreferenced_objects_are_pruned(tmp_path):
+    store = SnapshotStore(str(tmp_path), keep_runs=2)
+    shared = h7o_page_html(1)
+    run_ids = []
+    for n in range(4):
+        run = store.start_run("h7o")
+        run.run_id = f"run{n}"
+        run.record(1, "https://www.h7o.cz/clanky", shared, "utf-8")
+        run.record(2, "https://www.h7o.cz/clanky?p=2", h7o_page_html(n + 2), "utf-8")
+        store.finish_run(run)
+        run_ids.append(run.run_id)
+    kosmas = store.start_run("kosmas")
+    kosmas.record(1, "https://www.kosmas.cz/novinky/", kosmas_page_html(1), "utf-8")
+    store.finish_run(kosmas)
+
+    assert store.list_runs("h7o") == run_ids[2:]
+    # Sdílená stránka, dvě stránky ponechaných běhů a stránka Kosmasu
+    assert count_objects(str(tmp_path)) == 4
+    assert len(list(store.iter_pages("h7o", "run3"))) == 2
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test obecného generátoru řízeného konfigurací (bez přístupu na síť)
+"""
+
+from datetime import datetime
+
+import pytest
+from bs4 import BeautifulSoup
+from rss_generator import H7oRSSGenerator
+from kosmas_generator import KosmasRSSGenerator
+from source_engine import (
+    SelectorError,
+    SourceRSSGenerator,
+    compile_selector,
+    find_all_matching,
+    load_source_config,
+    load_source_configs,
+)
+from test_parse_pool import h7o_page_html, kosmas_page_html
+
+
+def soup_of(content):
+    return BeautifulSoup(content.decode("utf-8"), "html.parser")
+
+
+def test_compile_selector():
+    assert compile_selector("h3.g-item__title a[href]") == (
+        ("h3", frozenset({"g-item__title"}), ()),
+        ("a", frozenset(), ("href",)),
+    )
+    with pytest.raises(SelectorError):
+        compile_selector("div > a")
+
+
+def test_h7o_config_extraction():
+    """Konfigurace sources/h7o.json vytáhne z výpisu všechna pole článků"""
+    soup = soup_of(h7o_page_html(1))
+    articles = H7oRSSGenerator().extract_items_from_page(soup)
+
+    assert len(articles) == 5
+    first = articles[0]
+    assert first["title"] == "Článek 0"
+    assert first["url"] == "https://www.h7o.cz/clanky/0-clanek"
+    assert first["description"] == "Perex 0"
+    assert first["author"] == "Autor 0"
+    assert first["category"] == "recenze"
+    assert first["date"] == datetime.strptime(datetime.now().strftime("%d/%m/%Y"), "%d/%m/%Y").isoformat()
+
+
+def test_kosmas_config_extraction():
+    """Konfigurace sources/kosmas.json skládá popis z názvu a autorů"""
+    soup = soup_of(kosmas_page_html(1))
+    items = KosmasRSSGenerator().extract_items_from_page(soup)
+
+    assert [i["url"] for i in items] == [f"https://www.kosmas.cz/knihy/{n}/kniha/" for n in range(4)]
+    assert items[1]["authors"] == ["Autor 1"]
+    assert items[1]["description"] == "Kniha 1 - Autor 1"
+    assert [i["date"] for i in items] == sorted((i["date"] for i in items), reverse=True)
+
+
+def test_builtin_sources_are_configs():
+    """H7O a Kosmas jsou povolené konfigurace; třídy jen přepisují původní parametry"""
+    configs = {config["id"]: config for config in load_source_configs(enabled_only=True)}
+    assert {"h7o", "kosmas"} <= set(configs)
+
+    h7o = H7oRSSGenerator(max_age_months=2, cache_file="x.json")
+    assert (h7o.source_id, h7o.max_age_days, h7o.cache_file, h7o.rss_file) == ("h7o", 60, "x.json", "h7o_feed.xml")
+    kosmas = KosmasRSSGenerator(max_items=50)
+    assert (kosmas.max_items, kosmas.max_pages) == (50, 10)
+    assert kosmas.first_seen is not None and h7o.first_seen is None
+
+
+def test_missing_required_field_skips_item():
+    """Položka bez povinného pole (data) se přeskočí"""
+    html = (
+        b'<div class="article"><h3 class="article__heading">Bez data</h3>'
+        b'<a class="article__link" href="/a">x</a></div>'
+    )
+    engine = SourceRSSGenerator(load_source_config("sources/h7o.json"))
+    assert engine.extract_items_from_page(soup_of(html)) == []
+
+
+def test_fields_follow_document_order():
+    """Vnořená shoda má přednost před pozdějším sourozencem (jako BeautifulSoup find())"""
+    html = (
+        b'<div class="article"><div class="wrap"><h3 class="article__heading">X</h3></div>'
+        b'<h3 class="article__heading">Y</h3>'
+        b'<a class="article__link" href="/a">x</a><div class="article__date">01/05/2026</div></div>'
+    )
+    soup = soup_of(html)
+    engine = SourceRSSGenerator(load_source_config("sources/h7o.json"))
+
+    assert soup.find("h3", class_="article__heading").get_text() == "X"
+    assert [item["title"] for item in engine.extract_items_from_page(soup)] == ["X"]
+
+
+def test_find_all_matching_in_document_order():
+    html = b'<div><p class="a"><b class="a">1</b></p><p class="a">2</p></div><b class="a">3</b>'
+    soup = soup_of(html)
+    matches = find_all_matching(soup, compile_selector(".a"))
+    assert [tag.name for tag in matches] == [tag.name for tag in soup.select(".a")]
+    assert [tag.get_text() for tag in matches] == ["1", "1", "2", "3"]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test fronty úloh pro režim koordinátor/worker (bez přístupu na síť)
+"""
+
+import threading
+import time
+
+from generate_all import worker_argv
+from work_queue import WorkQueue, run_worker
+
+
+class FakeGenerator:
+    def __init__(self, source_id):
+        self.source_id = source_id
+        self.source_name = source_id
+
+
+def test_claim_complete_and_results(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    run_id = queue.enqueue(["h7o", "kosmas"])
+
+    first = queue.claim("w1")
+    second = queue.claim("w2")
+    assert (first["source_id"], second["source_id"]) == ("h7o", "kosmas")
+    assert queue.claim("w3") is None
+
+    # Cizí worker úlohu dokončit nemůže
+    assert not queue.complete(first["id"], "w2")
+    assert queue.complete(first["id"], "w1", "ok")
+    assert queue.complete(second["id"], "w2", "skipped")
+
+    assert queue.is_finished(run_id)
+    assert queue.results(run_id) == {
+        "h7o": ("done", "ok", 1, None),
+        "kosmas": ("done", "skipped", 1, None),
+    }
+
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), max_attempts=2)
+    run_id = queue.enqueue(["h7o"])
+
+    job = queue.claim("w1")
+    assert queue.fail(job["id"], "w1", "timeout")
+    job = queue.claim("w1")
+    assert job["attempts"] == 2
+    assert not queue.fail(job["id"], "w1", "timeout")
+
+    assert queue.results(run_id)["h7o"] == ("failed", "failed", 2, "timeout")
+
+
+def test_crashed_worker_job_is_reclaimed(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"), lease_seconds=0.05)
+    run_id = queue.enqueue(["h7o"])
+
+    # Worker si úlohu vezme a "spadne" (nedokončí ji ani neprodlužuje pronájem)
+    queue.claim("spadly")
+
+    ran = []
+    processed = run_worker(
+        WorkQueue(queue.path, lease_seconds=0.05),
+        {"h7o": FakeGenerator("h7o")},
+        lambda generator: ran.append(generator.source_id) or "ok",
+        worker_id="zivy",
+        poll_interval=0.01,
+    )
+
+    assert processed == 1 and ran == ["h7o"]
+    assert queue.results(run_id)["h7o"] == ("done", "ok", 2, None)
+
+
+def test_heartbeat_keeps_long_job_leased(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    WorkQueue(path).enqueue(["h7o", "kosmas"])
+    ran = []
+
+    def slow_run(generator):
+        ran.append(generator.source_id)
+        time.sleep(0.3)
+        return "ok"
+
+    generators = {source_id: FakeGenerator(source_id) for source_id in ("h7o", "kosmas")}
+    threads = [
+        threading.Thread(target=run_worker, args=(WorkQueue(path, lease_seconds=0.1), generators, slow_run),
+                         kwargs={"worker_id": f"w{i}", "poll_interval": 0.01})
+        for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    # Pronájem se prodlužoval, takže žádný zdroj neběžel dvakrát
+    assert sorted(ran) == ["h7o", "kosmas"]
+
+
+def test_worker_argv_replaces_coordinator_options():
+    argv = ["--spawn-workers", "4", "--snapshots", "--run-id=x", "--queue", "q.sqlite"]
+    assert worker_argv(argv, "run1") == ["--snapshots", "--queue", "q.sqlite", "--worker", "--run-id", "run1"]
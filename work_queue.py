@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Trvalá fronta úloh zdrojů pro režim koordinátor/worker (SQLite)
+- Koordinátor vloží do fronty jeden běh: úlohu pro každý zdroj
+- Libovolný počet workerů si úlohy bere s časově omezeným pronájmem (lease)
+- Běžící úloha pronájem průběžně prodlužuje; úloha spadlého workeru po vypršení
+  pronájmu vrátí do fronty a převezme ji jiný worker
+- Neúspěšná úloha se opakuje nejvýše max_attempts krát, výsledky zůstávají ve frontě
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+QUEUE_FILE = "work_queue.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    UNIQUE (run_id, source_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+def new_worker_id():
+    """Identifikátor workeru: stroj, proces a náhodná přípona"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """
+    Fronta úloh v SQLite
+
+    Stavy úlohy: pending -> leased -> done / failed (případně zpět do pending
+    při opakování nebo po vypršení pronájmu).
+    """
+
+    def __init__(self, path=QUEUE_FILE, lease_seconds=600, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            # Transakce řídíme sami (BEGIN IMMEDIATE), aby si dva workery nevzaly stejnou úlohu
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _transaction(self):
+        db = self.connection
+        db.execute("BEGIN IMMEDIATE")
+        return db
+
+    def enqueue(self, source_ids, run_id=None):
+        """
+        Vloží běh - úlohu pro každý zdroj
+
+        Returns:
+            Identifikátor běhu
+        """
+        run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        now = time.time()
+        db = self._transaction()
+        try:
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, source_id, created_at) VALUES (?, ?, ?)",
+                [(run_id, source_id, now) for source_id in source_ids],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return run_id
+
+    def _reclaim_expired(self, db, now):
+        """Úlohy s vypršelým pronájmem vrátí do fronty (nebo označí jako selhané)"""
+        db.execute(
+            "UPDATE jobs SET status = 'failed', worker = NULL, finished_at = ?, "
+            "error = 'Vypršel pronájem (worker neodpovídá)' "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        return db.execute(
+            "UPDATE jobs SET status = 'pending', worker = NULL "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now,),
+        ).rowcount
+
+    def claim(self, worker_id, run_id=None):
+        """
+        Pronajme si nejstarší čekající úlohu
+
+        Returns:
+            sqlite3.Row úlohy (id, run_id, source_id, attempts) nebo None
+        """
+        now = time.time()
+        db = self._transaction()
+        try:
+            reclaimed = self._reclaim_expired(db, now)
+            if reclaimed:
+                print(f"Fronta: {reclaimed} úloh s vypršelým pronájmem vráceno do fronty.")
+            query = "SELECT id FROM jobs WHERE status = 'pending'"
+            params = ()
+            if run_id is not None:
+                query += " AND run_id = ?"
+                params = (run_id,)
+            row = db.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            job = None
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, row["id"]),
+                )
+                job = db.execute(
+                    "SELECT id, run_id, source_id, attempts FROM jobs WHERE id = ?", (row["id"],)
+                ).fetchone()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return job
+
+    def heartbeat(self, job_id, worker_id):
+        """Prodlouží pronájem; False, pokud úlohu mezitím převzal jiný worker"""
+        cursor = self.connection.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result="ok"):
+        """Zapíše výsledek úspěšně doběhlé úlohy"""
+        return self.connection.execute(
+            "UPDATE jobs SET status = 'done', result = ?, finished_at = ?, lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'leased'",
+            (result, time.time(), job_id, worker_id),
+        ).rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Zapíše selhání; úloha se vrátí do fronty, dokud nevyčerpá pokusy
+
+        Returns:
+            True, pokud se úloha bude opakovat
+        """
+        db = self._transaction()
+        try:
+            row = db.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'leased'",
+                (job_id, worker_id),
+            ).fetchone()
+            retry = row is not None and row["attempts"] < self.max_attempts
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ?, "
+                    "result = ?, finished_at = ? WHERE id = ?",
+                    (
+                        "pending" if retry else "failed",
+                        error,
+                        None if retry else "failed",
+                        None if retry else time.time(),
+                        job_id,
+                    ),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return retry
+
+    def counts(self, run_id=None):
+        """Počty úloh podle stavu"""
+        query = "SELECT status, COUNT(*) AS n FROM jobs"
+        params = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        return {row["status"]: row["n"] for row in self.connection.execute(query + " GROUP BY status", params)}
+
+    def results(self, run_id):
+        """Výsledky úloh běhu: source_id -> (stav, výsledek, pokusy, chyba)"""
+        return {
+            row["source_id"]: (row["status"], row["result"], row["attempts"], row["error"])
+            for row in self.connection.execute(
+                "SELECT source_id, status, result, attempts, error FROM jobs WHERE run_id = ? ORDER BY id",
+                (run_id,),
+            )
+        }
+
+    def is_finished(self, run_id=None):
+        """Nezbývá žádná čekající ani pronajatá úloha?"""
+        counts = self.counts(run_id)
+        return not counts.get("pending") and not counts.get("leased")
+
+
+class _Heartbeat(threading.Thread):
+    """Prodlužuje pronájem běžící úlohy (vlastní připojení k frontě)"""
+
+    def __init__(self, queue, job_id, worker_id):
+        super().__init__(daemon=True)
+        self.queue = WorkQueue(queue.path, queue.lease_seconds, queue.max_attempts)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = max(queue.lease_seconds / 3, 0.01)
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    return
+        finally:
+            self.queue.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(queue, generators, run, worker_id=None, run_id=None, poll_interval=1.0):
+    """
+    Bere úlohy z fronty a spouští je, dokud fronta není hotová
+
+    Worker nekončí, dokud existují pronajaté úlohy jiných workerů - kdyby
+    některý spadl, jeho úlohy po vypršení pronájmu převezme.
+
+    Args:
+        generators: source_id -> generátor
+        run: Funkce run(generator) -> výsledek ("ok", "failed", "skipped")
+
+    Returns:
+        Počet zpracovaných úloh
+    """
+    worker_id = worker_id or new_worker_id()
+    processed = 0
+    while True:
+        job = queue.claim(worker_id, run_id)
+        if job is None:
+            if queue.is_finished(run_id):
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        generator = generators.get(job["source_id"])
+        if generator is None:
+            queue.fail(job["id"], worker_id, f"Neznámý zdroj {job['source_id']}")
+            continue
+
+        print(f"🔹 Worker {worker_id}: {generator.source_name} (pokus {job['attempts']})")
+        heartbeat = _Heartbeat(queue, job["id"], worker_id)
+        heartbeat.start()
+        try:
+            result = run(generator)
+        except Exception as e:
+            result, error = "failed", str(e)
+        else:
+            error = "Zdroj selhal"
+        finally:
+            heartbeat.stop()
+        processed += 1
+
+        if result == "failed":
+            if queue.fail(job["id"], worker_id, error):
+                print(f"Úloha {job['source_id']} selhala, vrácena do fronty.")
+        else:
+            queue.complete(job["id"], worker_id, result)